@@ -1,13 +1,7 @@
 import discord
 from discord.ext import commands, vbu
 
-
-def _t(b: str | discord.Locale, a: str) -> str:
-    """
-    Translate function for non-commands.
-    """
-
-    return vbu.translation(b, "profile").gettext(a)
+from cogs import utils
 
 
 if __debug__:
@@ -60,19 +54,15 @@ class AdvancedSettings(vbu.Cog[vbu.Bot]):
                 """,
                 guild_id, enabled
             )
+            await utils.notify_guild_settings(db, guild_id)
+        utils.invalidate_guild_settings(guild_id)
 
     @commands.group(
         application_command_meta=commands.ApplicationCommandMeta(
             guild_only=True,
             permissions=discord.Permissions(manage_guild=True),
-            name_localizations={
-                i: _t(i, "advanced").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "The group command for advanced settings.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("advanced", casefold=True),
+            description_localizations=utils.get_localizations("The group command for advanced settings."),
         ),
     )
     async def advanced(self, _):
@@ -86,14 +76,8 @@ class AdvancedSettings(vbu.Cog[vbu.Bot]):
         application_command_meta=commands.ApplicationCommandMeta(
             guild_only=True,
             permissions=discord.Permissions(manage_guild=True),
-            name_localizations={
-                i: _t(i, "enable").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "Enable advanced mode for this guild.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("enable", casefold=True),
+            description_localizations=utils.get_localizations("Enable advanced mode for this guild."),
         ),
     )
     @vbu.i18n("profile")
@@ -120,14 +104,8 @@ class AdvancedSettings(vbu.Cog[vbu.Bot]):
         application_command_meta=commands.ApplicationCommandMeta(
             guild_only=True,
             permissions=discord.Permissions(manage_guild=True),
-            name_localizations={
-                i: _t(i, "disable").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "Disable advanced mode for this guild.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("disable", casefold=True),
+            description_localizations=utils.get_localizations("Disable advanced mode for this guild."),
         ),
     )
     @vbu.i18n("profile")
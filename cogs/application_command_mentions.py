@@ -1,27 +1,80 @@
 import asyncio
+import json
+import os
 
 from discord.ext import vbu
 
+from cogs import utils
+
 
 class ApplicationCommandMentions(vbu.Cog[vbu.Bot]):
 
+    # Where the global command IDs are stored between restarts
+    COMMAND_ID_FILE = "config/application_command_ids.json"
+
     def cog_load(self) -> None:
+        self.load_stored_command_ids()
         asyncio.create_task(self.load_application_commands())
 
+    def load_stored_command_ids(self) -> None:
+        """
+        Load the command IDs that were saved the last time the bot ran, so
+        that mentions work before we've heard back from Discord.
+        """
+
+        try:
+            with open(self.COMMAND_ID_FILE) as a:
+                stored = json.load(a)
+        except (OSError, ValueError):
+            return
+        utils.application_command_ids.update({
+            str(name): int(command_id)
+            for name, command_id in stored.items()
+        })
+        self.apply_command_ids()
+
+    def save_command_ids(self) -> None:
+        """
+        Write the current command IDs to the command ID file.
+        """
+
+        temp_file = self.COMMAND_ID_FILE + ".tmp"
+        with open(temp_file, "w") as a:
+            json.dump(utils.application_command_ids, a, indent=4, sort_keys=True)
+        os.replace(temp_file, self.COMMAND_ID_FILE)
+
+    def apply_command_ids(self) -> None:
+        """
+        Set the stored command IDs onto the command instances themselves.
+        """
+
+        for name, command_id in utils.application_command_ids.items():
+            bot_command = self.bot.get_command(name)
+            if not bot_command:
+                continue
+            bot_command.id = command_id
+
     async def load_application_commands(self):
         """
         Load all of the bot's application commands so that we get their IDs in
-        the command instance itself.
+        the command instance itself. The stored IDs are only rewritten if
+        they've changed.
         """
 
         await self.bot.wait_until_ready()
-        await asyncio.sleep(10)  # Just to make sure the other cogs have loaded
+        self.apply_command_ids()  # All of the other cogs are loaded by now
         app_commands = await self.bot.fetch_global_application_commands()
-        for i in app_commands:
-            bot_command = self.bot.get_command(i.name)
-            if not bot_command:
-                continue
-            bot_command.id = i.id
+        fetched = {i.name: i.id for i in app_commands}
+        if fetched == utils.application_command_ids:
+            return
+        self.logger.info("Global application command IDs changed - updating")
+        utils.application_command_ids.clear()
+        utils.application_command_ids.update(fetched)
+        self.apply_command_ids()
+        try:
+            self.save_command_ids()
+        except OSError as e:
+            self.logger.warning("Failed to save application command IDs - %s", e)
 
 
 def setup(bot: vbu.Bot):
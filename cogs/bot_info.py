@@ -1,13 +1,7 @@
 import discord
 from discord.ext import commands, vbu
 
-
-def _t(b: str | discord.Locale, a: str) -> str:
-    """
-    Translate function for non-commands.
-    """
-
-    return vbu.translation(b, "profile").gettext(a)
+from cogs import utils
 
 
 _poeditor = lambda x: x
@@ -38,14 +32,8 @@ class BotInfo(vbu.Cog[vbu.Bot]):
 
     @commands.command(
         application_command_meta=commands.ApplicationCommandMeta(
-            name_localizations={
-                i: _t(i, "information").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "Get information and links for the bot.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("information", casefold=True),
+            description_localizations=utils.get_localizations("Get information and links for the bot."),
         ),
     )
     @vbu.i18n("profile")
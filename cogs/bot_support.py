@@ -55,18 +55,20 @@ class BotSupport(vbu.Cog):
 
         # Get the profile
         async with vbu.Database() as db:
-            profile = await utils.UserProfile.fetch_profile_by_id(db, id)
+            profile = await utils.UserProfile.fetch_hydrated(
+                db,
+                id,
+                allow_deleted_template=True,
+            )
             if profile is None:
                 return await ctx.interaction.response.send_message(
                     "That profile doesn't exist.",
                 )
-            template = await profile.fetch_template(db, allow_deleted=True)
+            template = profile.template
             if template is None:
                 return await ctx.interaction.response.send_message(
                     "That profile doesn't have a template.",
                 )
-            await template.fetch_fields(db)
-            await profile.fetch_filled_fields(db)
             profile = cast(utils.UserProfile[utils.Template], profile)
 
         # Get the guild and user associated
@@ -80,10 +82,7 @@ class BotSupport(vbu.Cog):
                 "That profile's guild doesn't exist.",
             )
         try:
-            member = (
-                guild.get_member(profile.user_id)
-                or await guild.fetch_member(profile.user_id)
-            )
+            member = await utils.resolve_member(guild, profile.user_id)
         except discord.NotFound:
             return await ctx.interaction.response.send_message(
                 "That profile's user doesn't exist.",
@@ -156,6 +155,42 @@ class BotSupport(vbu.Cog):
 
         await self.bot.get_cog("TemplateCommands").template_edit(ctx, id)
 
+    @commands.command(
+        application_command_meta=commands.ApplicationCommandMeta(
+            guild_ids=[
+                vbu.Constants.SUPPORT_GUILD_ID,
+            ],
+            permissions=discord.Permissions(
+                manage_guild=True,
+            ),
+        ),
+    )
+    async def cachestats(
+            self,
+            ctx: vbu.SlashContext):
+        """
+        Show the hit rates of the template caches.
+        """
+
+        caches = {
+            "templates": utils.Template.cache,
+            "template names": utils.Template.name_cache,
+            "unknown commands": utils.Template.unknown_command_cache,
+        }
+        lines = []
+        for name, cache in caches.items():
+            stats = cache.stats
+            lookups = stats["hits"] + stats["misses"]
+            hit_rate = stats["hits"] / lookups if lookups else 0
+            lines.append(
+                f"`{name}` - {stats['hits']} hits, {stats['misses']} misses "
+                f"({hit_rate:.1%}), {stats['size']}/{stats['max_size']} items"
+            )
+        await ctx.interaction.response.send_message(
+            "\n".join(lines),
+            ephemeral=True,
+        )
+
 
 def setup(bot: vbu.Bot):
     x = BotSupport(bot)
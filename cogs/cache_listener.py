@@ -0,0 +1,89 @@
+from typing import Callable, Dict
+import asyncio
+
+from discord.ext import vbu
+
+from cogs import utils
+
+
+class CacheListener(vbu.Cog[vbu.Bot]):
+    """
+    Listens for changes announced by other processes, so that values cached
+    in this process are dropped as soon as they change. This cog is loaded
+    by both the bot and the website, and covers guild subscriptions (changed
+    by the website) and guild settings (changed by the bot).
+    """
+
+    # How long to wait before listening again after losing the connection
+    RECONNECT_DELAY = 5
+
+    def cog_load(self) -> None:
+        self.listen_task = asyncio.create_task(self.listen_for_changes())
+
+    def cog_unload(self) -> None:
+        self.listen_task.cancel()
+        asyncio.create_task(utils.GuildPerks.subscriptions.close())
+
+    @staticmethod
+    def get_listeners() -> Dict[str, Callable]:
+        """
+        Get the asyncpg listener for each of the channels that we listen on.
+        """
+
+        subscriptions = utils.GuildPerks.subscriptions
+        return {
+            subscriptions.NOTIFY_CHANNEL: subscriptions.handle_notification,
+            utils.GUILD_SETTINGS_NOTIFY_CHANNEL: utils.handle_guild_settings_notification,
+        }
+
+    @staticmethod
+    def clear_caches() -> None:
+        """
+        Drop everything that's kept up to date by the listeners.
+        """
+
+        utils.GuildPerks.subscriptions.cache.clear()
+        utils.invalidate_guild_settings()
+
+    async def listen_for_changes(self):
+        """
+        Hold a database connection that listens on each of the channels,
+        opening a new one whenever it's lost.
+
+        The website's bot never connects to the gateway, so this doesn't wait
+        for the bot to be ready; the database pool is opened before any cogs
+        are loaded in both processes.
+        """
+
+        listeners = self.get_listeners()
+        while True:
+            db = None
+            try:
+                db = await vbu.Database.get_connection()
+                terminated = asyncio.Event()
+                db.conn.add_termination_listener(lambda _: terminated.set())
+                for channel, listener in listeners.items():
+                    await db.conn.add_listener(channel, listener)
+                self.logger.info("Listening for cache changes")
+
+                # Anything that changed while we weren't listening has been
+                # missed, so start again
+                self.clear_caches()
+                await terminated.wait()
+                self.logger.warning("Lost the cache listener connection")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning("Failed to listen for cache changes - %s", e)
+            finally:
+                if db is not None:
+                    if not db.conn.is_closed():
+                        for channel, listener in listeners.items():
+                            await db.conn.remove_listener(channel, listener)
+                    await db.disconnect()
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+
+def setup(bot: vbu.Bot):
+    x = CacheListener(bot)
+    bot.add_cog(x)
@@ -0,0 +1,244 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import inspect
+import time
+
+import discord
+from discord.ext import commands, vbu
+
+from cogs import utils
+
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+class HandlerTiming:
+    """
+    Dispatch timings for a single handler.
+    """
+
+    __slots__ = (
+        "calls",
+        "total",
+        "max",
+    )
+
+    def __init__(self):
+        self.calls: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    @property
+    def average(self) -> float:
+        if not self.calls:
+            return 0.0
+        return self.total / self.calls
+
+    def add(self, duration: float) -> None:
+        self.calls += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+
+class Route:
+    """
+    A handler registered against a custom ID head, alongside the number of
+    custom ID arguments that it accepts.
+    """
+
+    __slots__ = (
+        "name",
+        "handler",
+        "min_args",
+        "max_args",
+    )
+
+    def __init__(self, name: str, handler: Handler):
+        self.name = name
+        self.handler = handler
+        self.min_args = 0
+        self.max_args: Optional[int] = 0
+        parameters = list(inspect.signature(handler).parameters.values())[1:]
+        for p in parameters:
+            if p.kind == p.VAR_POSITIONAL:
+                self.max_args = None
+            elif p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD):
+                assert self.max_args is not None
+                self.max_args += 1
+                if p.default is p.empty:
+                    self.min_args += 1
+
+    def accepts(self, arg_count: int) -> bool:
+        if arg_count < self.min_args:
+            return False
+        return self.max_args is None or arg_count <= self.max_args
+
+
+class ComponentRouter(vbu.Cog[vbu.Bot]):
+    """
+    Dispatches component interactions and modal submissions to the handler
+    registered for their custom ID, so that each interaction is only parsed
+    once and only one handler is called.
+    """
+
+    def __init__(self, bot: vbu.Bot):
+        super().__init__(bot)
+        self.routes: Dict[str, Dict[str, Route]] = {
+            "component": dict(),
+            "modal": dict(),
+        }
+        self.timings: Dict[str, HandlerTiming] = dict()
+        self._routes_built_for: Tuple[int, ...] = ()
+
+    def build_routes(self) -> None:
+        """
+        Rebuild the route table from the handlers registered on the loaded
+        cogs.
+        """
+
+        routes: Dict[str, Dict[str, Route]] = {
+            "component": dict(),
+            "modal": dict(),
+        }
+        for cog in self.bot.cogs.values():
+            seen = set()
+            for cls in type(cog).__mro__:
+                for attr, value in vars(cls).items():
+                    if attr in seen:
+                        continue
+                    seen.add(attr)
+                    route: Optional[utils.ComponentRoute]
+                    route = getattr(value, "__component_route__", None)
+                    if route is None:
+                        continue
+                    name = f"{type(cog).__name__}.{attr}"
+                    if route.head in routes[route.kind]:
+                        self.logger.warning(
+                            "Duplicate %s route %s for %s and %s",
+                            route.kind, route.head,
+                            routes[route.kind][route.head].name, name,
+                        )
+                        continue
+                    routes[route.kind][route.head] = Route(
+                        name,
+                        getattr(cog, attr),
+                    )
+        self.routes = routes
+        self._routes_built_for = self._get_cog_key()
+        self.logger.info(
+            "Built %s component routes and %s modal routes",
+            len(routes["component"]), len(routes["modal"]),
+        )
+
+    def _get_cog_key(self) -> Tuple[int, ...]:
+        return tuple(id(i) for i in self.bot.cogs.values())
+
+    def get_route(
+            self,
+            kind: str,
+            custom_id: str) -> Optional[Tuple[Route, List[str]]]:
+        """
+        Get the route for a custom ID, preferring a two word head over a one
+        word head, alongside the arguments that should be given to it.
+        """
+
+        # Make sure our routes are up to date with the loaded cogs
+        if self._routes_built_for != self._get_cog_key():
+            self.build_routes()
+        routes = self.routes[kind]
+
+        # Match the custom ID
+        parts = custom_id.split(" ")
+        if len(parts) >= 2:
+            route = routes.get(f"{parts[0]} {parts[1]}")
+            if route is not None:
+                return route, parts[2:]
+        route = routes.get(parts[0])
+        if route is not None:
+            return route, parts[1:]
+        return None
+
+    async def dispatch(
+            self,
+            kind: str,
+            interaction: discord.Interaction) -> None:
+        """
+        Run the handler for an interaction, if there is one.
+        """
+
+        custom_id: str = getattr(interaction, "custom_id", None) or ""
+        found = self.get_route(kind, custom_id)
+        if found is None:
+            return
+        route, args = found
+        if not route.accepts(len(args)):
+            self.logger.warning(
+                "Ignoring custom ID %r with the wrong number of arguments for %s",
+                custom_id, route.name,
+            )
+            return
+        timing = self.timings.get(route.name)
+        if timing is None:
+            timing = self.timings[route.name] = HandlerTiming()
+        start = time.perf_counter()
+        try:
+            await route.handler(interaction, *args)
+        finally:
+            timing.add(time.perf_counter() - start)
+
+    @vbu.Cog.listener("on_component_interaction")
+    async def component_router(
+            self,
+            interaction: discord.ComponentInteraction):
+        await self.dispatch("component", interaction)
+
+    @vbu.Cog.listener("on_modal_submit")
+    async def modal_router(
+            self,
+            interaction: discord.ModalInteraction):
+        await self.dispatch("modal", interaction)
+
+    @commands.command(
+        application_command_meta=commands.ApplicationCommandMeta(
+            guild_ids=[
+                vbu.Constants.SUPPORT_GUILD_ID,
+            ],
+            permissions=discord.Permissions(
+                manage_guild=True,
+            ),
+        ),
+    )
+    async def routetimings(
+            self,
+            ctx: vbu.SlashContext):
+        """
+        Show how long each component handler takes to run.
+        """
+
+        if not self.timings:
+            return await ctx.interaction.response.send_message(
+                "No handlers have been run yet.",
+                ephemeral=True,
+            )
+        timings = sorted(
+            self.timings.items(),
+            key=lambda i: i[1].total,
+            reverse=True,
+        )
+        lines = [
+            (
+                f"`{name}` - {timing.calls} calls, "
+                f"{timing.average * 1_000:.1f}ms average, "
+                f"{timing.max * 1_000:.1f}ms max"
+            )
+            for name, timing in timings
+        ]
+        await ctx.interaction.response.send_message(
+            "\n".join(lines)[:2_000],
+            ephemeral=True,
+        )
+
+
+def setup(bot: vbu.Bot):
+    x = ComponentRouter(bot)
+    bot.add_cog(x)
@@ -4,14 +4,6 @@ from discord.ext import commands, vbu
 from cogs import utils
 
 
-def _t(b: str | discord.Locale, a: str) -> str:
-    """
-    Translate function for non-commands.
-    """
-
-    return vbu.translation(b, "profile").gettext(a)
-
-
 if __debug__:
     # For POEditor
     _poeditor = lambda x: x
@@ -38,14 +30,8 @@ class Export(vbu.Cog[vbu.Bot]):
         application_command_meta=commands.ApplicationCommandMeta(
             guild_only=True,
             permissions=discord.Permissions(administrator=True),
-            name_localizations={
-                i: _t(i, "export").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "Export all profiles for a given template.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("export", casefold=True),
+            description_localizations=utils.get_localizations("Export all profiles for a given template."),
             options=[
                 discord.ApplicationCommandOption(
                     name="template",
@@ -62,13 +48,30 @@ class Export(vbu.Cog[vbu.Bot]):
                             name="JSON",
                             value="JSON",
                         ),
+                        discord.ApplicationCommandOptionChoice(
+                            name="NDJSON",
+                            value="NDJSON",
+                        ),
+                        discord.ApplicationCommandOptionChoice(
+                            name="CSV",
+                            value="CSV",
+                        ),
+                        discord.ApplicationCommandOptionChoice(
+                            name="Columnar JSON",
+                            value="COLUMNAR",
+                        ),
                     ],
+                    required=False,
                 ),
             ],
         ),
     )
     @vbu.i18n("profile")
-    async def export(self, ctx: vbu.SlashContext, template: str, format: str):
+    async def export(
+            self,
+            ctx: vbu.SlashContext,
+            template: str,
+            format: str = "JSON"):
         """
         Export all profiles for a given template.
         """
@@ -115,6 +118,33 @@ class Export(vbu.Cog[vbu.Bot]):
             # Let's defer to do the complicated operations
             await ctx.interaction.response.defer(ephemeral=True)
 
+            # Export the profiles
+            exported = await utils.export_template(db, template_o, format)
+
+        # Send the export
+        with exported:
+            exported.seek(0, 2)
+            file_size = exported.tell()
+            exported.seek(0)
+            file_size_limit = (
+                ctx.interaction.guild.filesize_limit
+                if ctx.interaction.guild
+                else 8_388_608
+            )
+            if file_size > file_size_limit:
+                return await ctx.interaction.followup.send(
+                    _("The export for that template is too large to upload."),
+                    ephemeral=True,
+                )
+            extension = utils.EXPORT_WRITERS[format].extension
+            await ctx.interaction.followup.send(
+                file=discord.File(
+                    exported,
+                    filename=f"{template_o.name}.{extension}.gz",
+                ),
+                ephemeral=True,
+            )
+
 
 def setup(bot: vbu.Bot):
     bot.remove_command("export")
@@ -6,19 +6,16 @@ from cogs import utils
 
 class MessageUtils(vbu.Cog[utils.types.Bot]):
 
-    @vbu.Cog.listener("on_component_interaction")
+    @utils.component_listener("MESSAGE_EDIT RESEND")
     @vbu.i18n("profile", use_guild=True)
     async def message_edit_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            *to_remove: str):
         """
         A listener for the message edit component.
         """
 
-        # Make sure we're listening for something we care about
-        if not interaction.custom_id.startswith("MESSAGE_EDIT RESEND "):
-            return
-
         # Get the message items we want to resend
         kwargs = {
             "content": (
@@ -36,7 +33,6 @@ class MessageUtils(vbu.Cog[utils.types.Bot]):
                 send_kwargs.pop(key, None)
 
         # See what we want to remove via the custom ID
-        to_remove: list[str] = interaction.custom_id.split(" ")[2:]
         for key in to_remove:
             if key.startswith("-"):
                 send_kwargs.pop(key.lstrip("-"), None)
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any, Optional, Tuple, cast
+from typing import Any, Optional, Tuple, cast
 import asyncio
 from difflib import SequenceMatcher
 
@@ -7,9 +7,6 @@ from discord.ext import vbu
 
 from cogs import utils
 
-if TYPE_CHECKING:
-    from .profile_verification import ProfileVerification
-
 
 class ProfileCommands(vbu.Cog[vbu.Bot]):
     """
@@ -18,6 +15,23 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
 
     PROFILES_ARE_PRIVATE = True
 
+    def cog_load(self) -> None:
+        asyncio.create_task(self.load_command_index())
+
+    async def load_command_index(self):
+        """
+        Load the command IDs for all of the templates so that commands can be
+        resolved without going to the database.
+        """
+
+        await self.bot.wait_until_ready()
+        async with vbu.Database() as db:
+            await utils.Template.load_command_index(db)
+        self.logger.info(
+            "Loaded %s template command IDs",
+            len(utils.Template.command_index),
+        )
+
     @classmethod
     @vbu.i18n("profile")
     def get_make_public_button(
@@ -44,85 +58,56 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
 
     async def try_application_command(
             self,
-            db: vbu.Database,
             interaction: discord.CommandInteraction | discord.AutocompleteInteraction) -> Tuple[str, utils.Template] | None:
         """
-        Search all rows of the template table in the database to work out
-        which context command was called for which template.
+        Work out which template the called command belongs to, and which
+        action was run. The database is only used if the command or its
+        template isn't cached.
         """
 
-        # See if it's a normal slashie
-        template_rows = await db.call(
-            """
-            SELECT
-                id
-            FROM
-                templates
-            WHERE
-                application_command_id = $1
-            """,
-            discord.utils._get_as_snowflake(interaction.data, 'id'),
-        )
-        if template_rows:
-            template_id = template_rows[0]['id']
-            action = interaction.command_name.split(" ")[-1]
-            template = await utils.Template.fetch_template_by_id(
-                db,
-                template_id,
-            )
-            try:
-                assert template
-            except AssertionError:
-                self.logger.warning((
-                    f"Somehow failed to get template of id {template_id} via "
-                    f"application command ID {interaction.data['id']}"
-                ))
-                self.logger.warning(f"Deleting command ID {interaction.data['id']}")
-                command_id = discord.utils._get_as_snowflake(interaction.data, 'id')
-                assert command_id and isinstance(interaction.guild, discord.Guild)
-                await interaction.guild.delete_application_command(
-                    discord.Object(command_id),
+        # Work out which template the command belongs to
+        command_id = discord.utils._get_as_snowflake(interaction.data, 'id')
+        if command_id is None:
+            return None
+        if utils.Template.is_unknown_command(command_id):
+            return None
+        cached = utils.Template.get_cached_template_by_command_id(command_id)
+        if cached is not None:
+            template, is_context_command = cached
+        else:
+
+            # Go to the database
+            async with vbu.Database() as db:
+                indexed = await utils.Template.fetch_template_id_by_command_id(
+                    db,
+                    command_id,
                 )
-                return None
-            return action, template
-
-        # See if it's a context command
-        template_rows = await db.call(
-            """
-            SELECT
-                id
-            FROM
-                templates
-            WHERE
-                context_command_id = $1
-            """,
-            discord.utils._get_as_snowflake(interaction.data, 'id'),
-        )
-        if template_rows:
-            template_id = template_rows[0]['id']
-            action = interaction.command_name.split(" ")[-1]
-            template = await utils.Template.fetch_template_by_id(
-                db,
-                template_id,
-            )
-            try:
-                assert template
-            except AssertionError as e:
+                if indexed is None:
+                    return None
+                template_id, is_context_command = indexed
+
+                # Get the template
+                template = await utils.Template.fetch_template_by_id(
+                    db,
+                    template_id,
+                )
+            if template is None:
                 self.logger.warning((
                     f"Somehow failed to get template of id {template_id} via "
-                    f"context command ID {interaction.data['id']}"
+                    f"{'context' if is_context_command else 'application'} "
+                    f"command ID {command_id}"
                 ))
-                self.logger.warning(f"Deleting command ID {interaction.data['id']}")
-                command_id = discord.utils._get_as_snowflake(interaction.data, 'id')
-                assert command_id and isinstance(interaction.guild, discord.Guild)
+                self.logger.warning(f"Deleting command ID {command_id}")
+                assert isinstance(interaction.guild, discord.Guild)
                 await interaction.guild.delete_application_command(
                     discord.Object(command_id),
                 )
                 return None
-            return "get", template
 
-        # Oh well
-        return None
+        # See which action was run
+        if is_context_command:
+            return "get", template
+        return interaction.command_name.split(" ")[-1], template
 
     @vbu.Cog.listener()
     async def on_autocomplete_interaction(
@@ -138,16 +123,13 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
             return
 
         # Try and get the template
-        async with vbu.Database() as db:
-            ans = await self.try_application_command(
-                db,
-                interaction,
-            )
-            if ans is None:
-                return
-            _, template = ans
+        ans = await self.try_application_command(interaction)
+        if ans is None:
+            return
+        _, template = ans
 
-            # Get a list of profiles for the user in this template
+        # Get a list of profiles for the user in this template
+        async with vbu.Database() as db:
             profiles = await template.fetch_all_profiles_for_user(
                 db,
                 interaction.user.id,
@@ -197,11 +179,7 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
             return
 
         # Work out the associated template
-        async with vbu.Database() as db:
-            data = await self.try_application_command(
-                db,
-                interaction,
-            )
+        data = await self.try_application_command(interaction)
         if data is None:
             return
         action, template = data
@@ -323,7 +301,7 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
             ephemeral=True,
         )
 
-    @vbu.Cog.listener("on_component_interaction")
+    @utils.component_listener("PROFILE GET")
     async def profile_get_dropdown_listener(
             self,
             interaction: discord.ComponentInteraction):
@@ -331,28 +309,26 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
         Listens for a profile select dropdown to be interacted with.
         """
 
-        # Check it's a profile get dropdown
-        if not interaction.custom_id.startswith("PROFILE GET"):
-            return
-
         # Open a DB connection for fetching the profile and template
         async with vbu.Database() as db:
 
             # Get the profile
-            profile = await utils.UserProfile.fetch_profile_by_id(
+            profile = await utils.UserProfile.fetch_hydrated(
                 db,
                 interaction.values[0],
             )
             assert profile, "Profile does not exist."
-            await profile.fetch_template(db)
-            await profile.fetch_filled_fields(db)
 
         # Send the profile - defer so it doesn't stay as ephemeral
         await interaction.response.defer_update()
         await interaction.delete_original_message()
         assert profile.user_id
         assert isinstance(interaction.guild, discord.Guild)
-        profile_user = await interaction.guild.fetch_member(profile.user_id)
+        profile_user = await utils.resolve_member(
+            interaction.guild,
+            profile.user_id,
+            interaction,
+        )
         await interaction.followup.send(
             embeds=[
                 profile.build_embed(
@@ -384,7 +360,7 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
                     ephemeral=True,
                 )
             async with vbu.Database() as db:
-                profile = await utils.UserProfile.fetch_profile_by_id(
+                profile = await utils.UserProfile.fetch_hydrated(
                     db,
                     profile_name,
                 )
@@ -439,32 +415,31 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
             ephemeral=True,
         )
 
-    @vbu.Cog.listener("on_component_interaction")
+    @utils.component_listener("PROFILE CONFIRM_DELETE")
     @vbu.i18n("profile")
     async def profile_delete_button_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            short_profile_id: str):
         """
         Listens for a profile delete button to be interacted with.
         """
 
-        # Check it's a profile delete button
-        if not interaction.custom_id.startswith("PROFILE CONFIRM_DELETE "):
-            return
-
         # Get the profile name
-        short_profile_id = interaction.custom_id.split(" ")[2]
         profile_id = utils.uuid.decode(short_profile_id)
 
         # Open a DB connection for fetching the profile
         async with vbu.Database() as db:
 
             # Get the profile
-            profile = await utils.UserProfile.fetch_profile_by_id(
+            profile = await utils.UserProfile.fetch_hydrated(
                 db,
                 profile_id,
             )
             assert profile
+            template = profile.template
+            assert template
+            profile = cast(utils.UserProfile[utils.Template], profile)
 
             # Set the profile as deleted
             original_name = profile.name
@@ -473,12 +448,9 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
                 name=f"{profile.id} {profile.name}",
                 deleted=True,
             )
+            utils.end_edit_sessions(profile.id)
 
             # Get all remaining profiles for the user
-            template = await utils.Template.fetch_template_by_id(db, profile.template_id)
-            assert template
-            profile.template = template  # pyright: ignore
-            profile = cast(utils.UserProfile[utils.Template], profile)
             all_profiles = await template.fetch_all_profiles_for_user(db, profile.user_id)
 
         # Delete the archived message
@@ -500,7 +472,7 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
         guild: discord.Guild | None = interaction.guild  # pyright: ignore
         if guild is None:
             guild = await self.bot.fetch_guild(interaction.guild_id)  # pyright: ignore
-        member = await guild.fetch_member(profile.user_id)
+        member = await utils.resolve_member(guild, profile.user_id, interaction)
         role_id = template.get_role_id(member)
         if role_id in member.role_ids and not all_profiles:
             try:
@@ -508,6 +480,7 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
                     discord.Object(role_id),
                     reason="No remaining valid profiles.",
                 )
+                utils.invalidate_member(member.guild.id, member.id)
             except discord.HTTPException:
                 self.logger.info(
                     (
@@ -517,20 +490,16 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
                     role_id, member.guild.id, member.id,
                 )
 
-    @vbu.Cog.listener("on_component_interaction")
+    @utils.component_listener("PROFILE DELETE")
     async def profile_delete_dropdown_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            short_template_id: str):
         """
         Listens for a profile delete dropdown to be interacted with.
         """
 
-        # Check it's a profile delete dropdown
-        if not interaction.custom_id.startswith("PROFILE DELETE"):
-            return
-
         # Get the profile
-        short_template_id = interaction.custom_id.split(" ")[-1]
         template_id = utils.uuid.decode(short_template_id)
         async with vbu.Database() as db:
             template = await utils.Template.fetch_template_by_id(
@@ -579,29 +548,25 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
                     ephemeral=True,
                 )
 
-            # Get the profile
+            # Get the profile along with its fields
             async with vbu.Database() as db:
-                profile = await utils.UserProfile.fetch_profile_by_id(
+                profile = await utils.UserProfile.fetch_hydrated(
                     db,
                     profile_name,
                 )
 
-                # Make sure they have something
-                if not profile:
-                    message = _(
-                        "You have no profiles for the template "
-                        "**{template}** with that name."
-                    )
-                    # No need to do a management version - they literally
-                    # cannot get to this point without a valid profile
-                    return await interaction.response.send_message(
-                        message.format(template=template.name),
-                        ephemeral=True,
-                    )
-
-                # Get fields
-                profile.template = template
-                await profile.fetch_filled_fields(db)
+            # Make sure they have something
+            if not profile:
+                message = _(
+                    "You have no profiles for the template "
+                    "**{template}** with that name."
+                )
+                # No need to do a management version - they literally
+                # cannot get to this point without a valid profile
+                return await interaction.response.send_message(
+                    message.format(template=template.name),
+                    ephemeral=True,
+                )
 
         # Do some basic checks
         assert not profile.deleted
@@ -673,7 +638,10 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
                 # TRANSLATORS: This is the label for a button that submits
                 # a profile.
                 label=_("Submit"),
-                custom_id=f"PROFILE SUBMIT {short_profile_id}",
+                custom_id=(
+                    f"PROFILE SUBMIT "
+                    f"{utils.uuid.pack(profile.id, profile.content_version)}"
+                ),
                 style=discord.ButtonStyle.success,
                 disabled=unfilled_field_count > 0,
             ),
@@ -687,7 +655,11 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
         user = cast(discord.Member, interaction.user)
         if user.id != profile.user_id and profile.user_id:
             assert isinstance(interaction.guild, discord.Guild)
-            user = await interaction.guild.fetch_member(profile.user_id)
+            user = await utils.resolve_member(
+                interaction.guild,
+                profile.user_id,
+                interaction,
+            )
         embed = profile.build_embed(self.bot, interaction, user)
         if edit_original and interaction.response._responded:
             await interaction.edit_original_message(
@@ -730,33 +702,28 @@ class ProfileCommands(vbu.Cog[vbu.Bot]):
         profile.template = template  # pyright: ignore
         profile = cast(utils.UserProfile[utils.Template], profile)
 
-        # Create an ID for that user's profile
+        # Save the profile if they're able to have any more
         async with vbu.Database() as db:
-
-            # See if they're able to submit any more profiles
-            cog: Optional[ProfileVerification]
-            cog = self.bot.get_cog("ProfileVerification")  # type: ignore
-            assert cog, "Cog not loaded."
-            if await cog.check_if_max_profiles_hit(
-                    db, template, user.id if user else interaction.user.id):
-                return await interaction.response.send_message(
-                    content=(
-                        _(
-                            "You have already submitted the maximum number of "
-                            "profiles for this template."
-                        )
-                        if interaction.user.id == profile.user_id
-                        else
-                        _(
-                            "{user} has already submitted the maximum number "
-                            "of profiles for this template."
-                        ).format(user=f"<@{profile.user_id}>")
-                    ),
-                    ephemeral=True,
-                )
-
-            # If they can, save this one
-            await profile.update(db)
+            created = await profile.insert_if_under_quota(
+                db,
+                template.max_profile_count,
+            )
+        if not created:
+            return await interaction.response.send_message(
+                content=(
+                    _(
+                        "You have already submitted the maximum number of "
+                        "profiles for this template."
+                    )
+                    if interaction.user.id == profile.user_id
+                    else
+                    _(
+                        "{user} has already submitted the maximum number "
+                        "of profiles for this template."
+                    ).format(user=f"<@{profile.user_id}>")
+                ),
+                ephemeral=True,
+            )
 
         # And update the message
         return await self.profile_edit(interaction, template, profile)
@@ -5,7 +5,7 @@ import discord
 from discord.ext import vbu
 
 from . import utils
-from .utils import UserProfile, Template
+from .utils import UserProfile
 
 if TYPE_CHECKING:
     from .profile_commands import ProfileCommands
@@ -13,21 +13,40 @@ if TYPE_CHECKING:
 
 class ProfileEdit(vbu.Cog[vbu.Bot]):
 
-    @vbu.Cog.listener("on_component_interaction")
+    async def fetch_editing_profile(
+            self,
+            profile_id: str,
+            user_id: int) -> Optional[UserProfile]:
+        """
+        Get the hydrated profile for a user's edit session, fetching it and
+        opening a session if they don't have one already. Only draft profiles
+        with a template are kept in a session.
+        """
+
+        profile = utils.get_edit_session(profile_id, user_id)
+        if profile is not None:
+            return profile
+        async with vbu.Database() as db:
+            profile = await UserProfile.fetch_hydrated(db, profile_id)
+        if profile and profile.draft and profile.template:
+            utils.start_edit_session(
+                cast(utils.UserProfile[utils.Template], profile),
+                user_id,
+            )
+        return profile
+
+    @utils.component_listener("PROFILE CONFIRM_EDIT")
     @vbu.i18n("profile")
     async def profile_set_draft(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            short_profile_id: str,
+            ignore_user_managable: str):
         """
         Set a profile to a draft.
         """
 
-        # Make sure we're looking at the right component
-        if not interaction.custom_id.startswith("PROFILE CONFIRM_EDIT "):
-            return
-
         # Get the profile ID
-        short_profile_id, ignore_user_managable = interaction.custom_id.split(" ")[2:]
         profile_id = utils.uuid.decode(short_profile_id)
         self.logger.info("Setting profile %s to a draft", profile_id)
 
@@ -73,6 +92,7 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
                 posted_message_id=None,
                 posted_channel_id=None,
             )
+        utils.end_edit_sessions(profile_id)
 
         # Delete message if applicable
         if partial_message:
@@ -103,96 +123,91 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
             embeds=[],
         )
 
-    @vbu.Cog.listener("on_component_interaction")
+    @utils.component_listener("PROFILE EDIT")
     @vbu.i18n("profile")
     async def profile_edit_selector(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            short_profile_id: str,
+            short_field_id: Optional[str] = None):
         """
         The profile edit selector.
         """
 
-        # Check the interaction is from a profile edit selector
-        if not interaction.custom_id.startswith("PROFILE EDIT "):
-            return
-
         # Get the profile they're trying to edit
-        short_profile_id = interaction.custom_id.split(" ")[2]
         profile_id = utils.uuid.decode(short_profile_id)
-        try:
-            short_field_id = interaction.custom_id.split(" ")[3]
+        field_id = None
+        if short_field_id is not None:
             field_id = utils.uuid.decode(short_field_id)
-        except IndexError:
-            field_id = None
         self.logger.info(
             "Sending modal for profile %s, field %s",
             profile_id, field_id,
         )
 
         # Get the profile, template, and current field value
-        async with vbu.Database() as db:
+        profile = await self.fetch_editing_profile(
+            profile_id,
+            interaction.user.id,
+        )
+        assert profile, "Profile does not exist."
+
+        # Only allow editing of draft profiles
+        if not profile.draft:
+            return await interaction.response.edit_message(
+                content=_(
+                    "You can only edit draft profiles. "
+                    "Convert this profile to a draft to proceed."
+                ),
+                components=None,
+            )
 
-            # Get profile
-            profile = await UserProfile.fetch_profile_by_id(db, profile_id)
-            assert profile, "Profile does not exist."
+        # Get template
+        template = profile.template
+        assert template, "Template does not exist."
+        profile = cast(utils.UserProfile[utils.Template], profile)
+
+        # If we're not editing a field, we're done
+        filled_fields = profile.all_filled_fields
+        if field_id is None:
+            cog: Optional[ProfileCommands]
+            cog = self.bot.get_cog("ProfileCommands")  # pyright: ignore
+            assert cog, "Cog not loaded."
+            asyncio.create_task(cog.profile_edit(
+                interaction,
+                template,
+                profile,
+                edit_original=True,
+            ))
+            return
 
-            # Only allow editing of draft profiles
-            if not profile.draft:
-                return await interaction.response.edit_message(
-                    content=_(
-                        "You can only edit draft profiles. "
-                        "Convert this profile to a draft to proceed."
-                    ),
-                    components=None,
-                )
+        # Get field
+        field = profile.template.fields.get(field_id)
+        assert field, "Field does not exist."
 
-            # Get template
-            template = await Template.fetch_template_by_id(db, profile.template_id)
-            assert template, "Template does not exist."
-            profile.template = template
-            profile = cast(utils.UserProfile[utils.Template], profile)
-
-            # If we're not editing a field, we're done
-            filled_fields = await profile.fetch_filled_fields(db)
-            if field_id is None:
-                cog: Optional[ProfileCommands]
-                cog = self.bot.get_cog("ProfileCommands")  # pyright: ignore
-                assert cog, "Cog not loaded."
-                asyncio.create_task(cog.profile_edit(
-                    interaction,
-                    template,
-                    profile,
-                    edit_original=True,
-                ))
-                return
-
-            # Get field
-            field = profile.template.fields.get(field_id)
-            assert field, "Field does not exist."
-
-            # Only allow editing if a newly generated embed is the same as the
-            # one attached to the message they clicked on
-            past_embed = interaction.message.embeds[0]
-            assert isinstance(interaction.user, discord.Member)
-            new_embed = profile.build_embed(
-                self.bot,
+        # Only allow editing if a newly generated embed is the same as the
+        # one attached to the message they clicked on
+        past_embed = interaction.message.embeds[0]
+        assert isinstance(interaction.user, discord.Member)
+        new_embed = profile.build_embed(
+            self.bot,
+            interaction,
+            await utils.resolve_member(
+                interaction.guild,  # pyright: ignore
+                profile.user_id,
                 interaction,
-                (
-                    interaction.user
-                    if
-                        interaction.user.id == profile.user_id
-                    else
-                        await interaction.guild.fetch_member(profile.user_id)  # pyright: ignore
+            ),
+        )
+        if not utils.compare_embeds(past_embed, new_embed):
+
+            # Our session may be out of date, so drop it before telling them
+            utils.end_edit_sessions(profile_id)
+            return await interaction.response.edit_message(
+                content=_(
+                    "This is not the most recent version of your profile. "
+                    "Please re-run the edit command to continue."
                 ),
+                components=None,
             )
-            if not utils.compare_embeds(past_embed, new_embed):
-                return await interaction.response.edit_message(
-                    content=_(
-                        "This is not the most recent version of your profile. "
-                        "Please re-run the edit command to continue."
-                    ),
-                    components=None,
-                )
 
         # Work out what we want to fill the modal with
         try:
@@ -227,21 +242,17 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
         )
         await interaction.response.send_modal(modal)
 
-    @vbu.Cog.listener("on_component_interaction")
+    @utils.component_listener("PROFILE EDIT_NAME")
     @vbu.i18n("profile")
     async def profile_name_change(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            short_profile_id: str):
         """
         Allow people to change the name of their profiles.
         """
 
-        # Check the interaction is from a profile edit selector
-        if not interaction.custom_id.startswith("PROFILE EDIT_NAME"):
-            return
-
         # Get the profile they're trying to edit
-        short_profile_id = interaction.custom_id.split(" ")[2]
         profile_id = utils.uuid.decode(short_profile_id)
         self.logger.info("Sending modal for profile name %s", profile_id)
 
@@ -249,11 +260,11 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
         async with vbu.Database() as db:
 
             # Get profile
-            profile = await UserProfile.fetch_profile_by_id(db, profile_id)
+            profile = await UserProfile.fetch_hydrated(db, profile_id)
             assert profile, "Profile does not exist."
 
             # Get template
-            template = await profile.fetch_template(db)
+            template = profile.template
             assert template, "Template does not exist."
 
         # Ask the user to fill in the field
@@ -275,24 +286,20 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
         )
         await interaction.response.send_modal(modal)
 
-    @vbu.Cog.listener("on_modal_submit")
+    @utils.modal_listener("PROFILE SET")
     @vbu.i18n("profile")
     async def profile_edit_set(
             self,
-            interaction: discord.ModalInteraction):
+            interaction: discord.ModalInteraction,
+            short_profile_id: str,
+            short_field_id: str):
         """
         Set a profile field, saving in database and editing the original
         message to show an updated embed.
         """
 
-        # Check the interaction is from a profile edit selector
-        if not interaction.custom_id.startswith("PROFILE SET "):
-            return
-
         # Get the profile they're trying to edit
-        short_profile_id = interaction.custom_id.split(" ")[2]
         profile_id = utils.uuid.decode(short_profile_id)
-        short_field_id = interaction.custom_id.split(" ")[3]
         field_id = utils.uuid.decode(short_field_id)
         self.logger.info(
             "Setting profile value for profile %s, field %s",
@@ -300,24 +307,17 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
         )
 
         # Get the profile, template, and current field value
-        async with vbu.Database() as db:
-
-            # Get profile
-            profile = await UserProfile.fetch_profile_by_id(db, profile_id)
-            assert profile, "Profile has been deleted."
-
-            # Get template
-            template = await Template.fetch_template_by_id(db, profile.template_id)
-            assert template, "Template has been deleted."
-            profile.template = template
-
-            # Get all relevant fields
-            await template.fetch_fields(db)
-            await profile.fetch_filled_fields(db)
+        profile = await self.fetch_editing_profile(
+            profile_id,
+            interaction.user.id,
+        )
+        assert profile, "Profile has been deleted."
+        template = profile.template
+        assert template, "Template has been deleted."
 
-            # Get field
-            field = profile.template.fields.get(field_id)
-            assert field, "Field has been deleted."
+        # Get field
+        field = profile.template.fields.get(field_id)
+        assert field, "Field has been deleted."
 
         # Get the value
         given_value: str = "\n".join(
@@ -355,12 +355,13 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
 
         # Save the value
         async with vbu.Database() as db:
-            filled_field = await utils.FilledField.update_by_id(
+            filled_field, content_version = await utils.FilledField.update_by_id(
                 db,
                 profile_id,
                 field_id,
                 given_value or None,
             )
+        profile.content_version = content_version
         if filled_field:
             profile.all_filled_fields[field_id] = filled_field
             filled_field.field = field  # pyright: ignore - about to reassign
@@ -368,6 +369,9 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
         else:
             profile.all_filled_fields.pop(field_id, None)
 
+        # Anyone else editing this profile now has an outdated copy
+        utils.end_edit_sessions(profile_id, keep_user_id=interaction.user.id)
+
         # Edit the original message
         cog: Optional[ProfileCommands]
         cog = self.bot.get_cog("ProfileCommands")  # pyright: ignore
@@ -380,22 +384,18 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
             edit_original=True,
         )
 
-    @vbu.Cog.listener("on_modal_submit")
+    @utils.modal_listener("PROFILE SET_NAME")
     @vbu.i18n("profile")
     async def profile_name_set(
             self,
-            interaction: discord.ModalInteraction):
+            interaction: discord.ModalInteraction,
+            short_profile_id: str):
         """
         Set a profile field, saving in database and editing the original
         message to show an updated embed.
         """
 
-        # Check the interaction is from a profile edit selector
-        if not interaction.custom_id.startswith("PROFILE SET_NAME "):
-            return
-
         # Get the profile they're trying to edit
-        short_profile_id = interaction.custom_id.split(" ")[2]
         profile_id = utils.uuid.decode(short_profile_id)
         self.logger.info(
             "Setting profile name for profile %s",
@@ -405,12 +405,16 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
         # Get the profile, template, and current field value
         async with vbu.Database() as db:
 
-            # Get profile
-            profile = await UserProfile.fetch_profile_by_id(db, profile_id)
+            # Get profile, along with its filled fields so we can pass it
+            # straight back to edit
+            profile = (
+                utils.get_edit_session(profile_id, interaction.user.id)
+                or await UserProfile.fetch_hydrated(db, profile_id)
+            )
             assert profile, "Profile has been deleted."
 
             # Get template
-            template = await profile.fetch_template(db)
+            template = profile.template
             assert template, "Template does not exist."
 
             # Get all of user's profiles
@@ -418,6 +422,7 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
             all_profiles = await template.fetch_all_profiles_for_user(
                 db,
                 profile.user_id,
+                fetch_filled_fields=False,
             )
 
             # Get the value
@@ -447,9 +452,7 @@ class ProfileEdit(vbu.Cog[vbu.Bot]):
 
             # Edit the profile name
             await profile.update(db, name=given_value)
-
-            # Get filled fields so we can pass it straight back to edit
-            await profile.fetch_filled_fields(db)
+            utils.end_edit_sessions(profile_id, keep_user_id=interaction.user.id)
 
         # Edit the original message
         cog: Optional[ProfileCommands]
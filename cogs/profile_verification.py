@@ -1,4 +1,4 @@
-from typing import Optional, cast
+from typing import Optional, Tuple, cast
 
 import discord
 from discord.ext import vbu
@@ -8,6 +8,12 @@ from cogs import utils
 
 class ProfileVerification(vbu.Cog[vbu.Bot]):
 
+    # (Forum channel ID, owner ID) -> thread ID
+    archive_thread_cache: utils.TimedCache[Tuple[int, int], int] = utils.TimedCache(
+        max_size=10_000,
+        ttl=60 * 60,
+    )
+
     async def get_archive_channel(
             self,
             guild: discord.Guild,
@@ -25,13 +31,18 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
 
         # See if it's a forum
         if template.archive_is_forum:
-            threads = await guild.active_threads()
-            for thread in threads:
-                if thread.parent_id != archive_channel_id:
-                    continue
-                if thread.owner_id == member.id:
-                    return thread
-            return None
+            thread_id = await self.get_archive_thread_id(
+                guild,
+                archive_channel_id,
+                member.id,
+            )
+            if thread_id is None:
+                return None
+            return discord.PartialMessageable(
+                state=self.bot._connection,
+                id=thread_id,
+                type=discord.ChannelType.public_thread,
+            )
 
         # It's not
         return discord.PartialMessageable(
@@ -40,6 +51,221 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
             type=discord.ChannelType.text,
         )
 
+    async def get_archive_thread_id(
+            self,
+            guild: discord.Guild,
+            channel_id: int,
+            owner_id: int,
+            *,
+            use_index: bool = True) -> Optional[int]:
+        """
+        Get the ID of the thread that a user owns in a forum channel. The
+        thread index is used first (unless ``use_index`` is ``False``),
+        falling back to a scan of the guild's active threads (which is then
+        stored in the index).
+        """
+
+        # See if it's cached
+        key = (channel_id, owner_id)
+        if use_index:
+            thread_id = self.archive_thread_cache.get(key)
+            if thread_id is not None:
+                return thread_id
+
+            # See if it's in the database
+            async with vbu.Database() as db:
+                rows = await db.call(
+                    """
+                    SELECT
+                        thread_id
+                    FROM
+                        archive_threads
+                    WHERE
+                        channel_id = $1
+                    AND
+                        owner_id = $2
+                    """,
+                    channel_id, owner_id,
+                )
+            if rows:
+                thread_id = rows[0]["thread_id"]
+                self.archive_thread_cache.set(key, thread_id)
+                return thread_id
+
+        # Look through the active threads
+        threads = await guild.active_threads()
+        for thread in threads:
+            if thread.parent_id != channel_id:
+                continue
+            if thread.owner_id == owner_id:
+                await self.store_archive_thread(thread, replace=True)
+                return thread.id
+        return None
+
+    async def send_to_archive(
+            self,
+            channel: discord.abc.Messageable,
+            guild: discord.Guild,
+            member: discord.Member,
+            template: utils.Template,
+            **kwargs) -> discord.Message:
+        """
+        Send a message to an archive channel from :func:`get_archive_channel`.
+        If the channel is an indexed forum thread that no longer exists (eg
+        it was deleted while the bot was offline), it's removed from the
+        index and the guild's active threads are scanned for another.
+
+        Raises
+        -------
+        discord.HTTPException
+            The message couldn't be sent.
+        """
+
+        try:
+            return await channel.send(**kwargs)
+        except discord.NotFound:
+            if not template.archive_is_forum:
+                raise
+            assert isinstance(channel, discord.PartialMessageable)
+            await self.remove_archive_thread(channel.id)
+            archive_channel_id = template.get_archive_channel_id(member)
+            assert archive_channel_id
+            thread_id = await self.get_archive_thread_id(
+                guild,
+                archive_channel_id,
+                member.id,
+                use_index=False,
+            )
+            if thread_id is None or thread_id == channel.id:
+                raise
+        thread = discord.PartialMessageable(
+            state=self.bot._connection,
+            id=thread_id,
+            type=discord.ChannelType.public_thread,
+        )
+        return await thread.send(**kwargs)
+
+    async def store_archive_thread(
+            self,
+            thread: discord.Thread,
+            *,
+            replace: bool = False) -> None:
+        """
+        Add a thread to the thread index. If its owner already has a thread
+        indexed for that channel then it's only replaced if ``replace`` is
+        ``True``.
+        """
+
+        assert thread.parent_id and thread.owner_id
+        async with vbu.Database() as db:
+            rows = await db.call(
+                """
+                INSERT INTO
+                    archive_threads
+                    (
+                        guild_id,
+                        channel_id,
+                        owner_id,
+                        thread_id
+                    )
+                VALUES
+                    (
+                        $1,
+                        $2,
+                        $3,
+                        $4
+                    )
+                ON CONFLICT
+                    (channel_id, owner_id)
+                DO UPDATE
+                SET
+                    thread_id = CASE
+                        WHEN $5 THEN excluded.thread_id
+                        ELSE archive_threads.thread_id
+                    END
+                RETURNING
+                    thread_id
+                """,
+                thread.guild.id, thread.parent_id, thread.owner_id, thread.id,
+                replace,
+            )
+        self.archive_thread_cache.set(
+            (thread.parent_id, thread.owner_id),
+            rows[0]["thread_id"],
+        )
+
+    async def remove_archive_thread(self, thread_id: int) -> None:
+        """
+        Remove a thread from the thread index.
+        """
+
+        async with vbu.Database() as db:
+            rows = await db.call(
+                """
+                DELETE FROM
+                    archive_threads
+                WHERE
+                    thread_id = $1
+                RETURNING
+                    channel_id,
+                    owner_id
+                """,
+                thread_id,
+            )
+        for r in rows:
+            self.archive_thread_cache.pop((r["channel_id"], r["owner_id"]))
+
+    @staticmethod
+    def is_forum_thread(thread: discord.Thread) -> bool:
+        """
+        Whether or not the given thread is a (user-owned) forum post.
+        """
+
+        return (
+            thread.parent is not None
+            and thread.parent.type == discord.ChannelType.forum
+            and thread.owner_id is not None
+        )
+
+    @vbu.Cog.listener("on_thread_create")
+    async def archive_thread_create(self, thread: discord.Thread):
+        """
+        Index newly created forum posts. A user's newest post replaces any
+        that they already had indexed.
+        """
+
+        if not self.is_forum_thread(thread):
+            return
+        await self.store_archive_thread(thread, replace=True)
+
+    @vbu.Cog.listener("on_thread_update")
+    async def archive_thread_update(
+            self,
+            before: discord.Thread,
+            after: discord.Thread):
+        """
+        Keep the thread index up to date when forum posts are archived or
+        locked. Archived posts stay indexed, as sending to them unarchives
+        them; locked posts can't be sent to, so they're removed.
+        """
+
+        if not self.is_forum_thread(after):
+            return
+        if after.locked:
+            await self.remove_archive_thread(after.id)
+        elif after.archived != before.archived or after.locked != before.locked:
+            await self.store_archive_thread(after)
+
+    @vbu.Cog.listener("on_thread_delete")
+    async def archive_thread_delete(self, thread: discord.Thread):
+        """
+        Remove deleted forum posts from the thread index.
+        """
+
+        if thread.parent is not None and thread.parent.type != discord.ChannelType.forum:
+            return
+        await self.remove_archive_thread(thread.id)
+
     async def check_if_max_profiles_hit(
             self,
             db: vbu.Database,
@@ -53,33 +279,37 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
         """
 
         # See if they're able to submit any more profiles
-        all_profiles = await template.fetch_all_profiles_for_user(
+        total, submitted_count = await template.fetch_profile_count_for_user(
             db,
             user_id,
         )
         if submitted:
-            return (
-                len([i for i in all_profiles if not i.draft])
-                >= template.max_profile_count
-            )
-        return len(all_profiles) >= template.max_profile_count
+            return submitted_count >= template.max_profile_count
+        return total >= template.max_profile_count
 
-    @vbu.Cog.listener("on_component_interaction")
+    @utils.component_listener("PROFILE SUBMIT")
     @vbu.i18n("profile")
     async def submit_button_press(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            packed_profile_id: str,
+            shown_content_version_text: Optional[str] = None):
         """
         Submit a profile for verification.
         """
 
-        # Make sure we're looking at the right component
-        if not interaction.custom_id.startswith("PROFILE SUBMIT "):
-            return
-
-        # Get the profile ID
-        short_profile_id = interaction.custom_id.split(" ")[2]
-        profile_id = utils.uuid.decode(short_profile_id)
+        # Get the profile ID and the version of the profile that was shown;
+        # older buttons have them as separate words in the custom ID
+        shown_content_version: Optional[int] = None
+        if len(packed_profile_id) > utils.uuid.WIDTH:
+            unpacked = utils.uuid.unpack(packed_profile_id, "ui")
+            profile_id = cast(str, unpacked[0])
+            shown_content_version = cast(int, unpacked[1])
+        else:
+            profile_id = utils.uuid.decode(packed_profile_id)
+            if shown_content_version_text is not None:
+                shown_content_version = int(shown_content_version_text)
+        short_profile_id = utils.uuid.encode(profile_id)
         user = cast(discord.Member, interaction.user)  # May be wrong user, checked later
         self.logger.info(
             "Processing profile submission for %s, profile %s",
@@ -88,14 +318,13 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
 
         # Get the profile object
         async with vbu.Database() as db:
-            profile = await utils.UserProfile.fetch_profile_by_id(
+            profile = await utils.UserProfile.fetch_hydrated(
                 db,
                 profile_id,
             )
             assert profile, "That profile does not exist."
-            template = await profile.fetch_template(db)
+            template = profile.template
             assert template, "That template does not exist."
-            await profile.fetch_filled_fields(db)
 
             # See if the profile has already been submitted
             if not profile.draft:
@@ -108,7 +337,11 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
             # Make sure we have the right user
             assert isinstance(interaction.guild, discord.Guild)
             assert profile.user_id
-            user = await interaction.guild.fetch_member(profile.user_id)
+            user = await utils.resolve_member(
+                interaction.guild,
+                profile.user_id,
+                interaction,
+            )
 
             # See if they're able to submit any more profiles
             if await self.check_if_max_profiles_hit(
@@ -122,17 +355,9 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
                     components=None,
                 )
 
-        # Make sure the embed attached to the message is the same as a
-        # newly-made embed (minus the colour)
-        embed = profile.build_embed(
-            self.bot,
-            interaction,
-            user,
-        )
-        current_embed = None
-        if interaction.message:
-            current_embed = interaction.message.embeds[0]
-        if not utils.compare_embeds(embed, current_embed):
+        # Make sure the message they clicked on shows the most recent
+        # version of the profile
+        if shown_content_version != profile.content_version:
             return await interaction.response.edit_message(
                 content=_(
                     "This is not the most recent version of the profile. "
@@ -231,7 +456,11 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
                     user,
                 )
                 try:
-                    sent_message = await channel.send(
+                    sent_message = await self.send_to_archive(
+                        channel,
+                        interaction.guild,
+                        user,
+                        template,
                         content=f"<@{profile.user_id}>",
                         embed=embed,
                     )
@@ -277,6 +506,7 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
                 draft=False,
                 verified=verified,
             )
+        utils.end_edit_sessions(profile.id)
 
         # If they've been verified, add the relevant role to them
         if verified:
@@ -287,6 +517,7 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
                         discord.Object(role_id_to_add),
                         reason="Profile has been verified.",
                     )
+                    utils.invalidate_member(user.guild.id, user.id)
                 except discord.HTTPException:
                     await interaction.followup.send(
                         _(
@@ -297,42 +528,38 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
                         ephemeral=True,
                     )
 
-    @vbu.Cog.listener("on_component_interaction")
+    @utils.component_listener("PROFILE APPROVE")
     @vbu.i18n("profile")
     async def approve_button_clicked(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            short_profile_id: str):
         """
         Run when the approve button is pressed for a profile.
         """
 
-        # Make sure we're looking at the right interaction
-        if not interaction.custom_id.startswith("PROFILE APPROVE "):
-            return
         await interaction.response.defer_update()
 
         # Get the profile ID
-        short_profile_id = interaction.custom_id.split(" ")[2]
         profile_id = utils.uuid.decode(short_profile_id)
         self.logger.info(f"Approving profile {profile_id}")
 
         # Get the profile object
         async with vbu.Database() as db:
-            profile = await utils.UserProfile.fetch_profile_by_id(
+            profile = await utils.UserProfile.fetch_hydrated(
                 db,
                 profile_id,
             )
             assert profile, "That profile does not exist."
-            template = await profile.fetch_template(db)
+            template = profile.template
             assert template, "That template does not exist."
-            await profile.fetch_filled_fields(db)
 
         # Get the user so we can build their embed properly
         user: discord.Member
         try:
             guild = cast(discord.Guild, interaction.guild)
             assert profile.user_id is not None
-            user = await guild.fetch_member(profile.user_id)
+            user = await utils.resolve_member(guild, profile.user_id, interaction)
         except (discord.HTTPException):
 
             # The user left the guild - convert their profile back to a draft
@@ -375,7 +602,11 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
                     user,
                 )
                 try:
-                    sent_message = await channel.send(
+                    sent_message = await self.send_to_archive(
+                        channel,
+                        guild,
+                        user,
+                        template,
                         content=f"<@{profile.user_id}>",
                         embed=embed,
                         # allowed_mentions=discord.AllowedMentions.none(),
@@ -402,6 +633,7 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
                     sent_message.channel.id if sent_message else None
                 ),
             )
+        utils.end_edit_sessions(profile.id)
 
         # Try and tell the user it's been approved
         try:
@@ -429,6 +661,7 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
                     discord.Object(role_id_to_add),
                     reason="Profile has been verified.",
                 )
+                utils.invalidate_member(user.guild.id, user.id)
             except discord.HTTPException:
                 await interaction.followup.send(
                     _(
@@ -438,42 +671,38 @@ class ProfileVerification(vbu.Cog[vbu.Bot]):
                     ephemeral=True,
                 )
 
-    @vbu.Cog.listener("on_component_interaction")
+    @utils.component_listener("PROFILE DENY")
     @vbu.i18n("profile")
     async def deny_button_clicked(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            short_profile_id: str):
         """
         Run when the deny button is pressed for a profile.
         """
 
-        # Make sure we're looking at the right interaction
-        if not interaction.custom_id.startswith("PROFILE DENY "):
-            return
         await interaction.response.defer_update()
 
         # Get the profile ID
-        short_profile_id = interaction.custom_id.split(" ")[2]
         profile_id = utils.uuid.decode(short_profile_id)
         self.logger.info(f"Denying profile {profile_id}")
 
         # Get the profile object
         async with vbu.Database() as db:
-            profile = await utils.UserProfile.fetch_profile_by_id(
+            profile = await utils.UserProfile.fetch_hydrated(
                 db,
                 profile_id,
             )
             assert profile, "That profile does not exist."
-            template = await profile.fetch_template(db)
+            template = profile.template
             assert template, "That template does not exist."
-            await profile.fetch_filled_fields(db)
 
         # Get the user so we can build their embed properly
         user: discord.Member
         try:
             guild = cast(discord.Guild, interaction.guild)
             assert profile.user_id is not None
-            user = await guild.fetch_member(profile.user_id)
+            user = await utils.resolve_member(guild, profile.user_id, interaction)
         except (discord.HTTPException):
 
             # The user left the guild - convert their profile back to a draft
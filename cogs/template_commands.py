@@ -16,14 +16,6 @@ if TYPE_CHECKING:
 GC = utils.types.GuildContext
 
 
-def _t(b: str | discord.Locale, a: str) -> str:
-    """
-    Translate function for non-commands.
-    """
-
-    return vbu.translation(b, "profile").gettext(a)
-
-
 if __debug__:
     # For POEditor
     _poeditor = lambda x: x
@@ -128,10 +120,7 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
 
     @commands.group(
         application_command_meta=commands.ApplicationCommandMeta(
-            name_localizations={
-                i: _t(i, "template").casefold()
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("template", casefold=True),
             permissions=discord.Permissions(manage_guild=True),
             guild_only=True,
         ),
@@ -148,14 +137,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
     @template.command(
         name="list",
         application_command_meta=commands.ApplicationCommandMeta(
-            name_localizations={
-                i: _t(i, "list").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "A list of all the templates created on your guild.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("list", casefold=True),
+            description_localizations=utils.get_localizations("A list of all the templates created on your guild."),
             guild_only=True,
         ),
     )
@@ -188,30 +171,25 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
 
         # Get all of the templates
         async with vbu.Database() as db:
-            templates = await utils.Template.fetch_all_templates_for_guild(
+            template_counts = await utils.Template.fetch_profile_counts(
                 db,
                 ctx.guild.id,
             )
 
-            # Format them into a list
-            for t in templates:
-                user_profiles = await t.fetch_all_profiles(
-                    db,
-                    fetch_filled_fields=False,
-                )
-                profile_count = len(user_profiles)
-                ts: str
-                match profile_count:
-                    case 0:
-                        ts = template_format_zero
-                    case 1:
-                        ts = template_format_single
-                    case _:
-                        ts = template_format_plural
-                template_strings.append(ts.format(
-                    template_name=t.name,
-                    profile_count=profile_count,
-                ))
+        # Format them into a list
+        for t in template_counts:
+            ts: str
+            match t.total:
+                case 0:
+                    ts = template_format_zero
+                case 1:
+                    ts = template_format_single
+                case _:
+                    ts = template_format_plural
+            template_strings.append(ts.format(
+                template_name=t.template.name,
+                profile_count=t.total,
+            ))
 
         # Output
         if template_strings:
@@ -228,14 +206,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
     @template.command(
         name="delete",
         application_command_meta=commands.ApplicationCommandMeta(
-            name_localizations={
-                i: _t(i, "delete").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "Delete one of your templates.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("delete", casefold=True),
+            description_localizations=utils.get_localizations("Delete one of your templates."),
             options=[
                 discord.ApplicationCommandOption(
                     name="name",
@@ -349,14 +321,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
     @template.command(
         name="create",
         application_command_meta=commands.ApplicationCommandMeta(
-            name_localizations={
-                i: _t(i, "create").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "Create a new template for your guild.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("create", casefold=True),
+            description_localizations=utils.get_localizations("Create a new template for your guild."),
             options=[
                 discord.ApplicationCommandOption(
                     name="name",
@@ -474,14 +440,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
     @template.command(
         name="edit",
         application_command_meta=commands.ApplicationCommandMeta(
-            name_localizations={
-                i: _t(i, "edit").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "Edit an already existing template.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("edit", casefold=True),
+            description_localizations=utils.get_localizations("Edit an already existing template."),
             options=[
                 discord.ApplicationCommandOption(
                     name="name",
@@ -561,10 +521,7 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
     @template.group(
         name="manage",
         application_command_meta=commands.ApplicationCommandMeta(
-            name_localizations={
-                i: _t(i, "manage").casefold()
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("manage", casefold=True),
             guild_only=True,
         ),
     )
@@ -580,14 +537,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
     @template_manage.command(
         name="create",
         application_command_meta=commands.ApplicationCommandMeta(
-            name_localizations={
-                i: _t(i, "create").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "Create a command for another person.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("create", casefold=True),
+            description_localizations=utils.get_localizations("Create a command for another person."),
             options=[
                 discord.ApplicationCommandOption(
                     name="template",
@@ -597,14 +548,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
                     type=discord.ApplicationCommandOptionType.string,
                     required=True,
                     autocomplete=True,
-                    name_localizations={
-                        i: _t(i, "template").casefold()
-                        for i in discord.Locale
-                    },
-                    description_localizations={
-                        i: _t(i, "The template you want to create a profile in.")
-                        for i in discord.Locale
-                    },
+                    name_localizations=utils.get_localizations("template", casefold=True),
+                    description_localizations=utils.get_localizations("The template you want to create a profile in."),
                 ),
                 discord.ApplicationCommandOption(
                     name="user",
@@ -613,14 +558,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
                     ),
                     type=discord.ApplicationCommandOptionType.user,
                     required=True,
-                    name_localizations={
-                        i: _t(i, "user").casefold()
-                        for i in discord.Locale
-                    },
-                    description_localizations={
-                        i: _t(i, "The user that you want to create a profile for.")
-                        for i in discord.Locale
-                    },
+                    name_localizations=utils.get_localizations("user", casefold=True),
+                    description_localizations=utils.get_localizations("The user that you want to create a profile for."),
                 ),
             ],
             guild_only=True,
@@ -664,14 +603,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
     @template_manage.command(
         name="delete",
         application_command_meta=commands.ApplicationCommandMeta(
-            name_localizations={
-                i: _t(i, "delete").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "Delete a command for another person.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("delete", casefold=True),
+            description_localizations=utils.get_localizations("Delete a command for another person."),
             options=[
                 discord.ApplicationCommandOption(
                     name="template",
@@ -681,14 +614,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
                     type=discord.ApplicationCommandOptionType.string,
                     required=True,
                     autocomplete=True,
-                    name_localizations={
-                        i: _t(i, "template").casefold()
-                        for i in discord.Locale
-                    },
-                    description_localizations={
-                        i: _t(i, "The template you want to delete a profile in.")
-                        for i in discord.Locale
-                    },
+                    name_localizations=utils.get_localizations("template", casefold=True),
+                    description_localizations=utils.get_localizations("The template you want to delete a profile in."),
                 ),
                 discord.ApplicationCommandOption(
                     name="user",
@@ -697,14 +624,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
                     ),
                     type=discord.ApplicationCommandOptionType.user,
                     required=True,
-                    name_localizations={
-                        i: _t(i, "user").casefold()
-                        for i in discord.Locale
-                    },
-                    description_localizations={
-                        i: _t(i, "The user that you want to create a profile for.")
-                        for i in discord.Locale
-                    },
+                    name_localizations=utils.get_localizations("user", casefold=True),
+                    description_localizations=utils.get_localizations("The user that you want to create a profile for."),
                 ),
                 discord.ApplicationCommandOption(
                     name="profile",
@@ -714,14 +635,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
                     type=discord.ApplicationCommandOptionType.string,
                     required=True,
                     autocomplete=True,
-                    name_localizations={
-                        i: _t(i, "profile").casefold()
-                        for i in discord.Locale
-                    },
-                    description_localizations={
-                        i: _t(i, "The profile that you want to delete.")
-                        for i in discord.Locale
-                    },
+                    name_localizations=utils.get_localizations("profile", casefold=True),
+                    description_localizations=utils.get_localizations("The profile that you want to delete."),
                 ),
             ],
             guild_only=True,
@@ -785,14 +700,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
     @template_manage.command(
         name="edit",
         application_command_meta=commands.ApplicationCommandMeta(
-            name_localizations={
-                i: _t(i, "edit").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                i: _t(i, "Edit a command for another person.")
-                for i in discord.Locale
-            },
+            name_localizations=utils.get_localizations("edit", casefold=True),
+            description_localizations=utils.get_localizations("Edit a command for another person."),
             options=[
                 discord.ApplicationCommandOption(
                     name="template",
@@ -802,14 +711,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
                     type=discord.ApplicationCommandOptionType.string,
                     required=True,
                     autocomplete=True,
-                    name_localizations={
-                        i: _t(i, "template").casefold()
-                        for i in discord.Locale
-                    },
-                    description_localizations={
-                        i: _t(i, "The template you want to edit a profile in.")
-                        for i in discord.Locale
-                    },
+                    name_localizations=utils.get_localizations("template", casefold=True),
+                    description_localizations=utils.get_localizations("The template you want to edit a profile in."),
                 ),
                 discord.ApplicationCommandOption(
                     name="user",
@@ -818,14 +721,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
                     ),
                     type=discord.ApplicationCommandOptionType.user,
                     required=True,
-                    name_localizations={
-                        i: _t(i, "user").casefold()
-                        for i in discord.Locale
-                    },
-                    description_localizations={
-                        i: _t(i, "The user that you want to edit a profile for.")
-                        for i in discord.Locale
-                    },
+                    name_localizations=utils.get_localizations("user", casefold=True),
+                    description_localizations=utils.get_localizations("The user that you want to edit a profile for."),
                 ),
                 discord.ApplicationCommandOption(
                     name="profile",
@@ -835,14 +732,8 @@ class TemplateCommands(vbu.Cog[vbu.Bot]):
                     type=discord.ApplicationCommandOptionType.string,
                     required=True,
                     autocomplete=True,
-                    name_localizations={
-                        i: _t(i, "profile").casefold()
-                        for i in discord.Locale
-                    },
-                    description_localizations={
-                        i: _t(i, "The profile that you want to edit.")
-                        for i in discord.Locale
-                    },
+                    name_localizations=utils.get_localizations("profile", casefold=True),
+                    description_localizations=utils.get_localizations("The profile that you want to edit."),
                 ),
             ],
             guild_only=True,
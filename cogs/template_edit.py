@@ -1,4 +1,5 @@
-from typing import cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
+import asyncio
 
 import discord
 from discord.ext import vbu
@@ -8,14 +9,6 @@ import regex as re
 from cogs import utils
 
 
-def _t(b: str | discord.Locale, a: str) -> str:
-    """
-    Translate function for non-commands.
-    """
-
-    return vbu.translation(b, "profile").gettext(a)
-
-
 if __debug__:
     # For POEditor
     _poeditor = lambda x: x
@@ -47,6 +40,15 @@ if __debug__:
 
 class TemplateEdit(vbu.Cog[vbu.Bot]):
 
+    # Guild ID -> command ID -> command
+    command_registry: utils.TimedCache[int, Dict[int, discord.ApplicationCommand]] = utils.TimedCache(
+        max_size=5_000,
+        ttl=60 * 30,
+    )
+
+    def cog_load(self) -> None:
+        asyncio.create_task(self.reconcile_guild_commands())
+
     @staticmethod
     def get_profile_application_command(
             name: str,
@@ -76,18 +78,12 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             description="The name of the profile.",
             type=discord.ApplicationCommandOptionType.string,
             autocomplete=True,
-            name_localizations={
-                # TRANSLATORS: name for an option in a command;
-                # eg "character get [name]"
-                i: _t(i, "name").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                # TRANSLATORS: description for an option in a
-                # command; eg "character get [name]"
-                i: _t(i, "The name of the profile.")
-                for i in discord.Locale
-            },
+            # TRANSLATORS: name for an option in a command;
+            # eg "character get [name]"
+            name_localizations=utils.get_localizations("name", casefold=True),
+            # TRANSLATORS: description for an option in a
+            # command; eg "character get [name]"
+            description_localizations=utils.get_localizations("The name of the profile."),
         )
 
         # Get subcommand
@@ -95,16 +91,10 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             name="get",
             description="Display a created profile.",
             type=discord.ApplicationCommandOptionType.subcommand,
-            name_localizations={
-                # TRANSLATORS: subcommand name, eg "profile get"
-                i: _t(i, "get").casefold()
-                for i in discord.Locale
-            },
-            description_localizations={
-                # TRANSLATORS: description of a command
-                i: _t(i, "Display a created profile")
-                for i in discord.Locale
-            },
+            # TRANSLATORS: subcommand name, eg "profile get"
+            name_localizations=utils.get_localizations("get", casefold=True),
+            # TRANSLATORS: description of a command
+            description_localizations=utils.get_localizations("Display a created profile"),
             options=[
                 discord.ApplicationCommandOption(
                     name="user",
@@ -113,21 +103,12 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
                     ),
                     type=discord.ApplicationCommandOptionType.user,
                     required=False,
-                    name_localizations={
-                        # TRANSLATORS: parameter name in "profile get
-                        # [user]"
-                        i: _t(i, "user").casefold()
-                        for i in discord.Locale
-                    },
-                    description_localizations={
-                        # TRANSLATORS: parameter name descrtiption for
-                        # user in "profile get [user]"
-                        i: _t(
-                            i,
-                            "The person whose profile you want to get.",
-                        )
-                        for i in discord.Locale
-                    },
+                    # TRANSLATORS: parameter name in "profile get
+                    # [user]"
+                    name_localizations=utils.get_localizations("user", casefold=True),
+                    # TRANSLATORS: parameter name descrtiption for
+                    # user in "profile get [user]"
+                    description_localizations=utils.get_localizations("The person whose profile you want to get."),
                 ),
             ],
         )
@@ -137,16 +118,10 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
                 name="create",
                 description="Create a new profile.",
                 type=discord.ApplicationCommandOptionType.subcommand,
-                name_localizations={
-                    # TRANSLATORS: subcommand name, eg "profile create"
-                    i: _t(i, "create").casefold()
-                    for i in discord.Locale
-                },
-                description_localizations={
-                    # TRANSLATORS: description of a command
-                    i: _t(i, "Create a new profile.")
-                    for i in discord.Locale
-                },
+                # TRANSLATORS: subcommand name, eg "profile create"
+                name_localizations=utils.get_localizations("create", casefold=True),
+                # TRANSLATORS: description of a command
+                description_localizations=utils.get_localizations("Create a new profile."),
             ),
 
             # Delete
@@ -154,16 +129,10 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
                 name="delete",
                 description="Delete one of your profiles.",
                 type=discord.ApplicationCommandOptionType.subcommand,
-                name_localizations={
-                    # TRANSLATORS: subcommand name, eg "profile delete"
-                    i: _t(i, "delete").casefold()
-                    for i in discord.Locale
-                },
-                description_localizations={
-                    # TRANSLATORS: description of a command
-                    i: _t(i, "Delete one of your profiles.")
-                    for i in discord.Locale
-                },
+                # TRANSLATORS: subcommand name, eg "profile delete"
+                name_localizations=utils.get_localizations("delete", casefold=True),
+                # TRANSLATORS: description of a command
+                description_localizations=utils.get_localizations("Delete one of your profiles."),
                 options=[
                     NAME_OPTION,
                 ],
@@ -174,16 +143,10 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
                 name="edit",
                 description="Edit one of your profiles.",
                 type=discord.ApplicationCommandOptionType.subcommand,
-                name_localizations={
-                    # TRANSLATORS: subcommand name, eg "profile edit"
-                    i: _t(i, "edit").casefold()
-                    for i in discord.Locale
-                },
-                description_localizations={
-                    # TRANSLATORS: description of a command
-                    i: _t(i, "Edit one of your profiles.")
-                    for i in discord.Locale
-                },
+                # TRANSLATORS: subcommand name, eg "profile edit"
+                name_localizations=utils.get_localizations("edit", casefold=True),
+                # TRANSLATORS: description of a command
+                description_localizations=utils.get_localizations("Edit one of your profiles."),
                 options=[
                     NAME_OPTION,
                 ],
@@ -251,6 +214,299 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             name not in current_commands,
         ))
 
+    async def fetch_guild_commands(
+            self,
+            guild: discord.Guild) -> Dict[int, discord.ApplicationCommand]:
+        """
+        Get the application commands for a guild, keyed by ID. These are
+        served from the registry if they've been fetched recently.
+        """
+
+        commands = self.command_registry.get(guild.id)
+        if commands is not None:
+            return commands
+        # Fetched with their localizations so that they can be compared
+        # with the commands that we'd register
+        route = discord.http.Route(
+            "GET",
+            "/applications/{application_id}/guilds/{guild_id}/commands?with_localizations=true",
+            application_id=self.bot.application_id,
+            guild_id=guild.id,
+        )
+        fetched = await self.bot.http.request(route)
+        commands = {
+            i.id: i
+            for i in map(discord.ApplicationCommand.from_data, fetched)
+        }
+        self.command_registry.set(guild.id, commands)
+        return commands
+
+    def cache_guild_command(
+            self,
+            guild_id: int,
+            command_id: int,
+            command: Optional[discord.ApplicationCommand]) -> None:
+        """
+        Update a single command in a guild's registry entry, if the guild
+        is cached. Passing ``None`` as the command removes it.
+        """
+
+        commands = self.command_registry.get(guild_id)
+        if commands is None:
+            return
+        if command is None:
+            commands.pop(command_id, None)
+        else:
+            command.id = command_id
+            commands[command_id] = command
+
+    def get_static_guild_commands(
+            self,
+            guild_id: int) -> List[discord.ApplicationCommand]:
+        """
+        Get the bot's own (non-template) application commands that are
+        registered to the given guild, such as the support guild commands.
+        """
+
+        static: List[discord.ApplicationCommand] = []
+        for command in self.bot.commands:
+            meta = command.application_command_meta
+            if meta is None or not meta.guild_ids:
+                continue
+            if guild_id in meta.guild_ids:
+                static.append(command.to_application_command())
+        return static
+
+    @staticmethod
+    def command_payload(command: discord.ApplicationCommand) -> Dict[str, Any]:
+        """
+        Get the parts of a command that are stored by Discord, as they'd be
+        sent to Discord; this includes nested options, descriptions, and
+        localizations, but not IDs.
+        """
+
+        payload = dict(command.to_json())
+        payload.pop("dm_permissions", None)  # Doesn't apply to guild commands
+        return payload
+
+    @classmethod
+    def command_matches(
+            cls,
+            current: Optional[discord.ApplicationCommand],
+            command: discord.ApplicationCommand) -> bool:
+        """
+        Whether or not a registered command is the same as the one that
+        we'd register.
+        """
+
+        if current is None:
+            return False
+        return cls.command_payload(current) == cls.command_payload(command)
+
+    async def sync_guild_commands(
+            self,
+            guild: discord.Guild,
+            *,
+            force: bool = False) -> bool:
+        """
+        Make sure that the guild's application commands match its templates.
+        If every command in the guild is one that the bot manages (a template
+        command or one of the bot's own guild commands) then they're all
+        overwritten in a single request; otherwise only the template commands
+        that have drifted are created or edited, one at a time, so that
+        commands the bot doesn't know about are left alone. Templates whose
+        command IDs change are updated in the database.
+
+        Parameters
+        -----------
+        guild: :class:`discord.Guild`
+            The guild whose commands should be synced.
+        force: :class:`bool`
+            Whether or not to sync the commands even if they look to be in
+            sync already.
+
+        Returns
+        --------
+        :class:`bool`
+            Whether or not any commands were changed.
+        """
+
+        # Get the templates and the current commands
+        async with vbu.Database() as db:
+            templates = await utils.Template.fetch_all_templates_for_guild(
+                db,
+                guild.id,
+                fetch_fields=False,
+            )
+        existing = await self.fetch_guild_commands(guild)
+
+        # Work out what commands should exist
+        # (template, attribute name, current ID, command)
+        wanted: List[Tuple[utils.Template, str, Optional[int], discord.ApplicationCommand]] = []
+        seen: Set[Tuple[discord.ApplicationCommandType, str]] = set()
+        for template in templates:
+            if template.application_command_id:
+                command = self.get_profile_application_command(
+                    template.name,
+                    include_edit=template.user_manageable,
+                )
+                wanted.append((
+                    template,
+                    "application_command_id",
+                    template.application_command_id,
+                    command,
+                ))
+            if template.context_command_id:
+                current = existing.get(template.context_command_id)
+                if current is not None:
+                    command = current  # Keep its localized name
+                else:
+                    command = self.get_profile_context_command(template.name)
+                wanted.append((
+                    template,
+                    "context_command_id",
+                    template.context_command_id,
+                    command,
+                ))
+        deduplicated = []
+        for i in wanted:
+            key = (i[3].type, i[3].name)
+            if key in seen:
+                continue
+            seen.add(key)
+            deduplicated.append(i)
+
+        # Work out which commands we manage
+        static = self.get_static_guild_commands(guild.id)
+        static_keys = {(i.type, i.name) for i in static}
+        template_command_ids = {i[2] for i in deduplicated}
+        unmanaged = [
+            i for i in existing.values()
+            if i.id not in template_command_ids
+            and (i.type, i.name) not in static_keys
+            and (i.type, i.name) not in seen
+        ]
+
+        # See if anything has drifted
+        drifted = [
+            i for i in deduplicated
+            if force or not self.command_matches(existing.get(cast(int, i[2])), i[3])
+        ]
+        existing_by_key = {(i.type, i.name): i for i in existing.values()}
+        static_matches = all(
+            self.command_matches(existing_by_key.get((i.type, i.name)), i)
+            for i in static
+        )
+        if (
+                not drifted
+                and len(wanted) == len(deduplicated)
+                and (unmanaged or (
+                    static_matches
+                    and len(existing) == len(deduplicated) + len(static)))):
+            return False
+
+        # Work out the new command IDs
+        new_command_ids: Dict[int, Optional[int]] = {
+            id(i): i[2]
+            for i in deduplicated
+        }
+        if unmanaged:
+
+            # There are commands here that we don't know about, so only touch
+            # our own
+            self.logger.info(
+                "Syncing %s of %s application commands for guild %s one at a time",
+                len(drifted), len(deduplicated), guild.id,
+            )
+            for i in drifted:
+                _template, _attr, command_id, command = i
+                if command_id in existing:
+                    payload = self.command_payload(command)
+                    del payload["type"]
+                    payload.pop("options", None)
+                    await guild.edit_application_command(
+                        discord.Object(cast(int, command_id)),
+                        options=command.options,
+                        **payload,
+                    )
+                    new_command_id = cast(int, command_id)
+                else:
+                    new_command_id = (await guild.create_application_command(command)).id
+                new_command_ids[id(i)] = new_command_id
+            self.command_registry.pop(guild.id)
+
+        else:
+
+            # Overwrite the guild's commands, keeping the bot's own
+            self.logger.info(
+                "Syncing %s application commands for guild %s",
+                len(deduplicated) + len(static), guild.id,
+            )
+            registered = await self.bot.register_application_commands(
+                [i[3] for i in deduplicated] + static,
+                guild=guild,
+            )
+            registered_by_key = {
+                (i.type, i.name): i
+                for i in registered
+            }
+            self.command_registry.set(guild.id, {i.id: i for i in registered})
+            for i in deduplicated:
+                new_command = registered_by_key.get((i[3].type, i[3].name))
+                new_command_ids[id(i)] = new_command.id if new_command else None
+
+        # Store the new IDs; templates whose commands were duplicates of
+        # another's lose theirs
+        async with vbu.Database() as db:
+            for i in wanted:
+                template, attr, command_id, _command = i
+                new_command_id = new_command_ids.get(id(i))
+                if new_command_id != command_id:
+                    await template.update(db, **{attr: new_command_id})
+        return True
+
+    async def reconcile_guild_commands(self):
+        """
+        Sync the application commands for every guild that has templates
+        with commands, repairing any drift since the bot was last running.
+        """
+
+        await self.bot.wait_until_ready()
+        async with vbu.Database() as db:
+            rows = await db.call(
+                """
+                SELECT DISTINCT
+                    guild_id
+                FROM
+                    templates
+                WHERE
+                    deleted = false
+                AND
+                    (
+                        application_command_id IS NOT NULL
+                        OR context_command_id IS NOT NULL
+                    )
+                """,
+            )
+        synced = 0
+        for r in rows:
+            guild = self.bot.get_guild(r["guild_id"])
+            if guild is None:
+                continue
+            try:
+                if await self.sync_guild_commands(guild):
+                    synced += 1
+            except discord.HTTPException as e:
+                self.logger.warning(
+                    "Failed to sync application commands for guild %s - %s",
+                    guild.id, e,
+                )
+            await asyncio.sleep(1)  # Stay well clear of the rate limits
+        self.logger.info(
+            "Reconciled application commands for %s guilds (%s changed)",
+            len(rows), synced,
+        )
+
     async def update_template(
             self,
             interaction: discord.Interaction,
@@ -448,20 +704,18 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
         }
         return kwargs
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_DELETE [action] [TID]
+    @utils.component_listener("TEMPLATE_DELETE")
     @vbu.i18n("profile")
     async def template_delete_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            action: str,
+            encoded_template_id: str):
         """
         Listens for components being interacted with, and deals with the ones
         relating to deleting templates.
         """
 
-        # Make sure we should deal with it
-        if not interaction.custom_id.startswith("TEMPLATE_DELETE"):
-            return
-
         # Check they still have permissions to press these buttons
         if not self.check_template_edit_permissions(interaction):
             return await interaction.response.edit_message(
@@ -474,7 +728,6 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             )
 
         # See if they said to delete or not
-        action, encoded_template_id = interaction.custom_id.split(" ")[1:]
         if action == "CANCEL":
             return await interaction.response.edit_message(
                 content=_("Cancelled template deletion :)"),
@@ -516,35 +769,29 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
 
         # Delete the application command
         assert isinstance(interaction.guild, discord.Guild)
-        if template.application_command_id:
-            try:
-                await interaction.guild.delete_application_command(
-                    discord.Object(template.application_command_id),
-                )
-            except discord.HTTPException:
-                pass
-        if template.context_command_id:
+        for command_id in (template.application_command_id, template.context_command_id):
+            if not command_id:
+                continue
             try:
                 await interaction.guild.delete_application_command(
-                    discord.Object(template.context_command_id),
+                    discord.Object(command_id),
                 )
             except discord.HTTPException:
                 pass
+            self.cache_guild_command(interaction.guild.id, command_id, None)
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_EDIT NAME [TID] [CV]
+    @utils.component_listener("TEMPLATE_EDIT NAME")
     @vbu.i18n("profile")
     async def template_edit_name_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str,
+            current_name: str):
         """
         Listens for edit template name button to be pressed.
         Sends modal.
         """
 
-        # Get current name and template ID
-        if not interaction.custom_id.startswith("TEMPLATE_EDIT NAME"):
-            return
-        encoded_template_id, current_name = interaction.custom_id.split(" ")[2:]
         self.logger.info(
             "Sending template name change modal for template %s",
             utils.uuid.decode(encoded_template_id),
@@ -571,20 +818,18 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
         )
         await interaction.response.send_modal(modal)
 
-    @vbu.Cog.listener("on_modal_submit")  # TEMPLATE_SET NAME [TID]
+    @utils.modal_listener("TEMPLATE_SET NAME")
     @vbu.i18n("profile")
     async def template_edit_name_modal_listener(
             self,
-            interaction: discord.ModalInteraction):
+            interaction: discord.ModalInteraction,
+            encoded_template_id: str):
         """
         Listens for edit template name modal to be submitted.
         Sets template name.
         """
 
         # Get the ID of the template
-        if not interaction.custom_id.startswith("TEMPLATE_SET NAME"):
-            return
-        encoded_template_id = interaction.custom_id.split(" ")[2]
         template_id = utils.uuid.decode(encoded_template_id)
         self.logger.info("Changing name for template %s", template_id)
 
@@ -646,21 +891,26 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             discord.Object(template.application_command_id),
             name=template.name.casefold(),
         )
+        self.cache_guild_command(
+            interaction.guild.id,
+            template.application_command_id,
+            self.get_profile_application_command(
+                template.name,
+                include_edit=template.user_manageable,
+            ),
+        )
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_EDIT ARCHIVE [TID] [CV]
+    @utils.component_listener("TEMPLATE_EDIT ARCHIVE")
     @vbu.i18n("profile")
     async def template_edit_archive_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str):
         """
         Listens for edit template archive channel button to be pressed.
         Sends dropdown.
         """
 
-        # Get current name and template ID
-        if not interaction.custom_id.startswith("TEMPLATE_EDIT ARCHIVE"):
-            return
-        encoded_template_id = interaction.custom_id.split(" ")[2]
         self.logger.info(
             "Sending dropdown for archive channel for template %s",
             utils.uuid.decode(encoded_template_id),
@@ -699,28 +949,20 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             components=components,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_SET ARCHIVE [TID]
+    @utils.component_listener("TEMPLATE_SET ARCHIVE")
     @vbu.i18n("profile")
     async def template_edit_archive_dropdown_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str,
+            action: Optional[str] = None):
         """
         Listens for edit template archive dropdown to be pressed.
         Changes archive channel.
         """
 
-        # See if we should be here
-        if not interaction.custom_id.startswith("TEMPLATE_SET ARCHIVE"):
-            return
-
         # See if we should be clearing the value
-        clear: bool
-        try:
-            encoded_template_id, d = interaction.custom_id.split(" ")[2:]  # pyright: ignore
-            clear = True
-        except ValueError:
-            encoded_template_id = interaction.custom_id.split(" ")[2]
-            clear = False
+        clear: bool = action is not None
 
         # Get the template ID
         template_id = utils.uuid.decode(encoded_template_id)
@@ -758,20 +1000,17 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             ),
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_EDIT VERIFICATION [TID] [CV]
+    @utils.component_listener("TEMPLATE_EDIT VERIFICATION")
     @vbu.i18n("profile")
     async def template_edit_verification_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str):
         """
         Listens for edit template verification channel button to be pressed.
         Sends dropdown.
         """
 
-        # Get current name and template ID
-        if not interaction.custom_id.startswith("TEMPLATE_EDIT VERIFICATION"):
-            return
-        encoded_template_id = interaction.custom_id.split(" ")[2]
         self.logger.info(
             "Sending dropdown for verification channel for template %s",
             utils.uuid.decode(encoded_template_id),
@@ -807,28 +1046,20 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             components=components,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_SET VERIFICATION [TID]
+    @utils.component_listener("TEMPLATE_SET VERIFICATION")
     @vbu.i18n("profile")
     async def template_edit_verification_dropdown_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str,
+            action: Optional[str] = None):
         """
         Listens for edit template verification dropdown to be pressed.
         Changes verification channel.
         """
 
-        # See if we should be here
-        if not interaction.custom_id.startswith("TEMPLATE_SET VERIFICATION"):
-            return
-
         # See if we should be clearing the value
-        clear: bool
-        try:
-            encoded_template_id, d = interaction.custom_id.split(" ")[2:]  # pyright: ignore
-            clear = True
-        except ValueError:
-            encoded_template_id = interaction.custom_id.split(" ")[2]
-            clear = False
+        clear: bool = action is not None
 
         # Get the template ID
         template_id = utils.uuid.decode(encoded_template_id)
@@ -855,20 +1086,17 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             verification_channel_id=new_verification_channel_id,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_EDIT ROLE [TID] [CV]
+    @utils.component_listener("TEMPLATE_EDIT ROLE")
     @vbu.i18n("profile")
     async def template_edit_role_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str):
         """
         Listens for edit template role channel button to be pressed.
         Sends dropdown.
         """
 
-        # Get current name and template ID
-        if not interaction.custom_id.startswith("TEMPLATE_EDIT ROLE"):
-            return
-        encoded_template_id = interaction.custom_id.split(" ")[2]
         self.logger.info(
             "Sending dropdown for role for template %s",
             utils.uuid.decode(encoded_template_id),
@@ -902,28 +1130,20 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             components=components,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_SET ROLE [TID]
+    @utils.component_listener("TEMPLATE_SET ROLE")
     @vbu.i18n("profile")
     async def template_edit_role_dropdown_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str,
+            action: Optional[str] = None):
         """
         Listens for edit template role dropdown to be pressed.
         Changes role.
         """
 
-        # See if we should be here
-        if not interaction.custom_id.startswith("TEMPLATE_SET ROLE"):
-            return
-
         # See if we should be clearing the value
-        clear: bool
-        try:
-            encoded_template_id, d = interaction.custom_id.split(" ")[2:]  # pyright: ignore
-            clear = True
-        except ValueError:
-            encoded_template_id = interaction.custom_id.split(" ")[2]
-            clear = False
+        clear: bool = action is not None
 
         # Get the template ID
         template_id = utils.uuid.decode(encoded_template_id)
@@ -950,20 +1170,18 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             role_id=new_role_id,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_EDIT MAX_PROFILES [TID] [CV]
+    @utils.component_listener("TEMPLATE_EDIT MAX_PROFILES")
     @vbu.i18n("profile")
     async def template_edit_max_profiles_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str,
+            current_limit: str):
         """
         Listens for edit template max profiles button to be pressed.
         Sends modal.
         """
 
-        # Get current name and template ID
-        if not interaction.custom_id.startswith("TEMPLATE_EDIT MAX_PROFILES"):
-            return
-        encoded_template_id, current_limit = interaction.custom_id.split(" ")[2:]
         self.logger.info(
             "Sending modal for template max profile edit for template %s",
             utils.uuid.decode(encoded_template_id),
@@ -991,20 +1209,18 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
         )
         await interaction.response.send_modal(modal)
 
-    @vbu.Cog.listener("on_modal_submit")  # TEMPLATE_SET MAX_PROFILES [TID]
+    @utils.modal_listener("TEMPLATE_SET MAX_PROFILES")
     @vbu.i18n("profile")
     async def template_edit_max_profiles_modal_listener(
             self,
-            interaction: discord.ModalInteraction):
+            interaction: discord.ModalInteraction,
+            encoded_template_id: str):
         """
         Listens for edit template max profiles modal to be submitted.
         Sets template max profiles.
         """
 
         # Get the ID of the template
-        if not interaction.custom_id.startswith("TEMPLATE_SET MAX_PROFILES"):
-            return
-        encoded_template_id = interaction.custom_id.split(" ")[2]
         template_id = utils.uuid.decode(encoded_template_id)
 
         # Get the new name from the components
@@ -1067,24 +1283,23 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             max_profile_count=valid_new_profile_limit,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_SET USER_MANAGEABLE [TID] [NV]
+    @utils.component_listener("TEMPLATE_SET USER_MANAGEABLE")
     @vbu.i18n("profile")
     async def template_edit_user_manageable_component_listener(
             self,
-            interaction: discord.ModalInteraction):
+            interaction: discord.ModalInteraction,
+            encoded_template_id: str,
+            new_value_text: str):
         """
         Listens for edit template max profiles modal to be submitted.
         Sets template max profiles.
         """
 
         # Get the ID of the template
-        if not interaction.custom_id.startswith("TEMPLATE_SET USER_MANAGEABLE"):
-            return
-        encoded_template_id = interaction.custom_id.split(" ")[2]
         template_id = utils.uuid.decode(encoded_template_id)
 
         # Get the new name from the components
-        new_value = bool(int(interaction.custom_id.split(" ")[3]))
+        new_value = bool(int(new_value_text))
 
         # Check that the limit is valid
         await interaction.response.defer_update()
@@ -1118,21 +1333,20 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
                 ephemeral=True,
             )
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_EDIT SLASH [TID]
+    @utils.component_listener("TEMPLATE_EDIT SLASH")
     @vbu.i18n("profile")
     async def template_slash_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str,
+            current_command_id: str):
         """
         Listens for edit template slash button to be pressed.
         """
 
         # Get the ID of the template
-        if not interaction.custom_id.startswith("TEMPLATE_EDIT SLASH"):
-            return
-        encoded_template_id = interaction.custom_id.split(" ")[2]
         template_id = utils.uuid.decode(encoded_template_id)
-        application_command_id = int(interaction.custom_id.split(" ")[3])
+        application_command_id = int(current_command_id)
         self.logger.info(
             "Trying to update slash command for template %s",
             template_id,
@@ -1150,18 +1364,16 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
         # See if the command exists
         guild = interaction.guild
         assert isinstance(guild, discord.Guild)
-        application_commands = await guild.fetch_application_commands()
-        application_command = discord.utils.get(
-            application_commands,
-            id=application_command_id,
+        application_commands = await self.fetch_guild_commands(guild)
+        application_command = application_commands.get(application_command_id)
+        new_application_command = self.get_profile_application_command(
+            template.name,
+            include_edit=template.user_manageable,
         )
         if application_command is None:
             try:
                 application_command = await guild.create_application_command(
-                    self.get_profile_application_command(
-                        template.name,
-                        include_edit=template.user_manageable,
-                    )
+                    new_application_command,
                 )
             except Exception as e:
                 return await interaction.followup.send(
@@ -1169,16 +1381,28 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
                     ephemeral=True,
                 )
         else:
-            new_application_command = self.get_profile_application_command(
-                template.name,
-                include_edit=template.user_manageable,
-            )
-            await guild.edit_application_command(
-                application_command,
-                name=new_application_command.name,
-                description=new_application_command.description,
-                options=new_application_command.options,
-            )
+            try:
+                await guild.edit_application_command(
+                    application_command,
+                    name=new_application_command.name,
+                    description=new_application_command.description,
+                    options=new_application_command.options,
+                )
+            except discord.NotFound:
+
+                # Our registry was stale; the command was deleted elsewhere
+                self.command_registry.pop(guild.id)
+                return await interaction.followup.send(
+                    _("Failed to update slash command - please try again."),
+                    ephemeral=True,
+                )
+            new_application_command.id = application_command.id
+            application_command = new_application_command
+        self.cache_guild_command(
+            guild.id,
+            application_command.id,
+            application_command,
+        )
 
         # Get and update the template
         await self.update_template(
@@ -1202,19 +1426,17 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             ephemeral=True,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_EDIT CONTEXT [TID]
+    @utils.component_listener("TEMPLATE_EDIT CONTEXT")
     @vbu.i18n("profile")
     async def template_context_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str):
         """
         Listens for edit template context button to be pressed.
         """
 
         # Get the ID of the template
-        if not interaction.custom_id.startswith("TEMPLATE_EDIT CONTEXT "):
-            return
-        encoded_template_id = interaction.custom_id.split(" ")[2]
         template_id = utils.uuid.decode(encoded_template_id)
         self.logger.info(
             "Trying to update context command for template %s",
@@ -1240,6 +1462,7 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
                 )
             except discord.NotFound:
                 pass
+            self.cache_guild_command(guild.id, template.context_command_id, None)
 
         # If not, create one
         else:
@@ -1256,6 +1479,11 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
                 )
             else:
                 new_command_id = application_command.id
+                self.cache_guild_command(
+                    guild.id,
+                    new_command_id,
+                    application_command,
+                )
 
         # Get and update the template
         await self.update_template(
@@ -1264,7 +1492,7 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
             context_command_id=new_command_id,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_EDIT DONE
+    @utils.component_listener("TEMPLATE_EDIT DONE")
     @vbu.i18n("profile")
     async def template_edit_done_component_listener(
             self,
@@ -1274,8 +1502,6 @@ class TemplateEdit(vbu.Cog[vbu.Bot]):
         Deletes message.
         """
 
-        if not interaction.custom_id.startswith("TEMPLATE_EDIT DONE"):
-            return
         await interaction.response.defer_update()
         await interaction.delete_original_message()
 
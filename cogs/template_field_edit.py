@@ -178,20 +178,18 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
         }
         return kwargs
 
-    @vbu.Cog.listener("on_component_interaction")  # TEMPLATE_EDIT FIELDS [TID]
+    @utils.component_listener("TEMPLATE_EDIT FIELDS")
     @vbu.i18n("profile")
     async def template_edit_fields_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str):
         """
         Listens for edit template fields button to be pressed.
         Sends fields and edit buttons
         """
 
         # Get template ID
-        if not interaction.custom_id.startswith("TEMPLATE_EDIT FIELDS"):
-            return
-        encoded_template_id = interaction.custom_id.split(" ")[2]
         template_id = utils.uuid.decode(encoded_template_id)
         self.logger.info(
             "Sending field edit buttons for template %s",
@@ -272,20 +270,18 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
             components=components,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # FIELD_EDIT DONE [TID]
+    @utils.component_listener("FIELD_EDIT DONE")
     @vbu.i18n("profile")
     async def template_edit_fields_done_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str):
         """
         Listens for field select dropdown to be selected.
         Sends fields edit buttons
         """
 
         # Get field ID
-        if not interaction.custom_id.startswith("FIELD_EDIT DONE"):
-            return
-        encoded_template_id = interaction.custom_id.split(" ")[2]
         template_id = utils.uuid.decode(encoded_template_id)
 
         # Get field
@@ -311,19 +307,18 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
         del kwargs['ephemeral']
         return await interaction.response.edit_message(**kwargs)
 
-    @vbu.Cog.listener("on_component_interaction")  # FIELD_EDIT SELECT [TID]
+    @utils.component_listener("FIELD_EDIT SELECT")
     @vbu.i18n("profile")
     async def template_edit_fields_select_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str):
         """
         Listens for field select dropdown to be selected.
         Sends fields edit buttons
         """
 
         # Get field ID
-        if not interaction.custom_id.startswith("FIELD_EDIT SELECT"):
-            return
         field_id = interaction.values[0]
 
         # Get field
@@ -346,20 +341,18 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
         del kwargs['ephemeral']
         await interaction.response.edit_message(**kwargs)
 
-    @vbu.Cog.listener("on_component_interaction")  # FIELD_EDIT NEW [TID]
+    @utils.component_listener("FIELD_EDIT NEW")
     @vbu.i18n("profile")
     async def template_edit_fields_new_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_template_id: str):
         """
         Create an ID for a new field, then send them back to the field edit
         segment.
         """
 
         # Get field ID
-        if not interaction.custom_id.startswith("FIELD_EDIT NEW"):
-            return
-        encoded_template_id = interaction.custom_id.split(" ")[2]
         template_id = utils.uuid.decode(encoded_template_id)
 
         # Get current fields
@@ -427,20 +420,18 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
         del kwargs['ephemeral']
         await interaction.response.edit_message(**kwargs)
 
-    @vbu.Cog.listener("on_component_interaction")  # FIELD_EDIT DELETE [FID]
+    @utils.component_listener("FIELD_EDIT DELETE")
     @vbu.i18n("profile")
     async def template_edit_fields_delete_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_field_id: str):
         """
         Listens for field delete button to be selected.
         Sends fields delete confirm buttons
         """
 
         # Get field ID
-        if not interaction.custom_id.startswith("FIELD_EDIT DELETE"):
-            return
-        encoded_field_id = interaction.custom_id.split(" ")[2]
         field_id = utils.uuid.decode(encoded_field_id)
         self.logger.info("Asking to confirm deletion of field %s", field_id)
 
@@ -485,20 +476,19 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
             components=components,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # FIELD_DELETE [action] [TID]
+    @utils.component_listener("FIELD_DELETE")
     @vbu.i18n("profile")
     async def field_delete_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            action: str,
+            encoded_field_id: str,
+            encoded_template_id: str):
         """
         Listens for components being interacted with, and deals with the ones
         relating to deleting templates.
         """
 
-        # Make sure we should deal with it
-        if not interaction.custom_id.startswith("FIELD_DELETE"):
-            return
-
         # Check they still have permissions to press these buttons
         cog: Optional[TemplateEdit]
         cog = self.bot.get_cog("TemplateEdit")  # type: ignore
@@ -512,17 +502,11 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
             )
 
         # See if they said to delete or not
-        action, encoded_field_id, encoded_template_id = (
-            interaction.custom_id.split(" ")[1:]
-        )
         field_id = utils.uuid.decode(encoded_field_id)
         if action == "CANCEL":
-            interaction.custom_id = (
-                f"TEMPLATE_EDIT FIELDS "
-                f"{encoded_template_id}"
-            )
             return await self.template_edit_fields_component_listener(
                 interaction,
+                encoded_template_id,
             )
         self.logger.info("Deleting field %s", field_id)
 
@@ -535,12 +519,9 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
 
             # Make sure the template wasn't already deleted
             if field is None:
-                interaction.custom_id = (
-                    f"TEMPLATE_EDIT FIELDS "
-                    f"{encoded_template_id}"
-                )
                 return await self.template_edit_fields_component_listener(
                     interaction,
+                    encoded_template_id,
                 )
 
             # Mark the template as deleted
@@ -548,25 +529,25 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
                 db,
                 deleted=True,
             )
-        interaction.custom_id = f"TEMPLATE_EDIT FIELDS {encoded_template_id}"
         return await self.template_edit_fields_component_listener(
             interaction,
+            encoded_template_id,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # FIELD_EDIT NAME [FID] [CV]
+    @utils.component_listener("FIELD_EDIT NAME")
     @vbu.i18n("profile")
     async def field_edit_name_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_field_id: str,
+            *current_name_parts: str):
         """
         Listens for edit field name button to be pressed.
         Sends modal.
         """
 
         # Get current name and field ID
-        if not interaction.custom_id.startswith("FIELD_EDIT NAME "):
-            return
-        encoded_field_id, current_name = interaction.custom_id.split(" ", 3)[2:]
+        current_name = " ".join(current_name_parts)
         self.logger.info(
             "Sending modal for field name change for field %s",
             utils.uuid.decode(encoded_field_id),
@@ -594,20 +575,19 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
         )
         await interaction.response.send_modal(modal)
 
-    @vbu.Cog.listener("on_component_interaction")  # FIELD_EDIT INDEX [FID] [IDX]
+    @utils.component_listener("FIELD_EDIT INDEX")
     @vbu.i18n("profile")
     async def field_edit_index_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_field_id: str,
+            current_index: str):
         """
         Listens for edit field name button to be pressed.
         Sends modal.
         """
 
         # Get current name and field ID
-        if not interaction.custom_id.startswith("FIELD_EDIT INDEX "):
-            return
-        encoded_field_id, current_index = interaction.custom_id.split(" ")[2:]
         self.logger.info(
             "Sending modal for field index change for field %s",
             utils.uuid.decode(encoded_field_id),
@@ -635,20 +615,18 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
         )
         await interaction.response.send_modal(modal)
 
-    @vbu.Cog.listener("on_modal_submit")  # FIELD_SET INDEX [FID]
+    @utils.modal_listener("FIELD_SET INDEX")
     @vbu.i18n("profile")
     async def field_edit_index_modal_listener(
             self,
-            interaction: discord.ModalInteraction):
+            interaction: discord.ModalInteraction,
+            encoded_field_id: str):
         """
         Listens for edit field name modal to be submitted.
         Sets field name.
         """
 
         # Get the ID of the field
-        if not interaction.custom_id.startswith("FIELD_SET INDEX"):
-            return
-        encoded_field_id = interaction.custom_id.split(" ")[2]
         field_id = utils.uuid.decode(encoded_field_id)
 
         # Get the new name from the components
@@ -679,20 +657,18 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
             index=int(new_field_index_str),
         )
 
-    @vbu.Cog.listener("on_modal_submit")  # FIELD_SET NAME [FID]
+    @utils.modal_listener("FIELD_SET NAME")
     @vbu.i18n("profile")
     async def field_edit_name_modal_listener(
             self,
-            interaction: discord.ModalInteraction):
+            interaction: discord.ModalInteraction,
+            encoded_field_id: str):
         """
         Listens for edit field name modal to be submitted.
         Sets field name.
         """
 
         # Get the ID of the field
-        if not interaction.custom_id.startswith("FIELD_SET NAME"):
-            return
-        encoded_field_id = interaction.custom_id.split(" ")[2]
         field_id = utils.uuid.decode(encoded_field_id)
 
         # Get the new name from the components
@@ -726,20 +702,18 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
             name=new_field_name,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # FIELD_EDIT PROMPT [FID]
+    @utils.component_listener("FIELD_EDIT PROMPT")
     @vbu.i18n("profile")
     async def field_edit_prompt_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_field_id: str):
         """
         Listens for edit field name button to be pressed.
         Sends modal.
         """
 
         # Get current name and field ID
-        if not interaction.custom_id.startswith("FIELD_EDIT PROMPT"):
-            return
-        encoded_field_id = interaction.custom_id.split(" ")[2]
         field_id = utils.uuid.decode(encoded_field_id)
         self.logger.info(
             "Sending modal for prompt edit for field %s",
@@ -787,20 +761,18 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
         )
         await interaction.response.send_modal(modal)
 
-    @vbu.Cog.listener("on_modal_submit")  # FIELD_SET PROMPT [FID]
+    @utils.modal_listener("FIELD_SET PROMPT")
     @vbu.i18n("profile")
     async def field_edit_prompt_modal_listener(
             self,
-            interaction: discord.ModalInteraction):
+            interaction: discord.ModalInteraction,
+            encoded_field_id: str):
         """
         Listens for edit field name modal to be submitted.
         Sets field name.
         """
 
         # Get the ID of the field
-        if not interaction.custom_id.startswith("FIELD_SET PROMPT"):
-            return
-        encoded_field_id = interaction.custom_id.split(" ")[2]
         field_id = utils.uuid.decode(encoded_field_id)
 
         # Get the new name from the components
@@ -823,20 +795,18 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
             prompt=new_field_prompt,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # FIELD_EDIT OPTIONAL [FID]
+    @utils.component_listener("FIELD_EDIT OPTIONAL")
     @vbu.i18n("profile")
     async def field_edit_optional_component_listener(
             self,
-            interaction: discord.ModalInteraction):
+            interaction: discord.ModalInteraction,
+            encoded_field_id: str):
         """
         Listens for edit field name modal to be submitted.
         Flips field optionality
         """
 
         # Get the ID of the field
-        if not interaction.custom_id.startswith("FIELD_EDIT OPTIONAL"):
-            return
-        encoded_field_id = interaction.custom_id.split(" ")[2]
         field_id = utils.uuid.decode(encoded_field_id)
         self.logger.info(
             "Updating optional for field %s",
@@ -855,22 +825,19 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
             optional=not field.optional,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # FIELD_EDIT TYPE [FID]
+    @utils.component_listener("FIELD_EDIT TYPE")
     @vbu.i18n("profile")
     async def field_edit_type_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_field_id: str,
+            encoded_template_id: str):
         """
         Listens for edit field type buttom to be pressed.
         Sends dropdown
         """
 
         # Get the ID of the field
-        if not interaction.custom_id.startswith("FIELD_EDIT TYPE"):
-            return
-        encoded_field_id, encoded_template_id = (
-            interaction.custom_id.split(" ")[2:]
-        )
         template_id = utils.uuid.decode(encoded_template_id)
         self.logger.info(
             "Sending type dropdown for field field %s",
@@ -943,20 +910,18 @@ class TemplateFieldEdit(vbu.Cog[vbu.Bot]):
             components=components,
         )
 
-    @vbu.Cog.listener("on_component_interaction")  # FIELD_SET TYPE [FID]
+    @utils.component_listener("FIELD_SET TYPE")
     @vbu.i18n("profile")
     async def field_edit_type_dropdown_component_listener(
             self,
-            interaction: discord.ComponentInteraction):
+            interaction: discord.ComponentInteraction,
+            encoded_field_id: str):
         """
         Listens for edit field type dropdown to be submitted.
         Edits field type
         """
 
         # Get the ID of the field
-        if not interaction.custom_id.startswith("FIELD_SET TYPE"):
-            return
-        encoded_field_id = interaction.custom_id.split(" ")[2]
         field_id = utils.uuid.decode(encoded_field_id)
         self.logger.info(
             "Updating type for field field %s to %s",
@@ -1,4 +1,5 @@
 from . import checks, errors, types, uuid_ as uuid
+from .cache import TimedCache
 from .profiles.field import Field
 from .profiles.field_type import (
     FieldType,
@@ -7,12 +8,25 @@ from .profiles.field_type import (
     ImageField,
     FieldCheckFailure,
 )
-from .profiles.template import Template
+from .profiles.template import Template, TemplateProfileCount
 from .profiles.user_profile import UserProfile
 from .profiles.filled_field import FilledField
-from .profiles.command_processor import CommandProcessor
+from .profiles.command_processor import CommandProcessor, CompiledCommand
+from .profiles.export import EXPORT_WRITERS, export_template
 from .perks_handler import GuildPerks, NO_GUILD_PERKS, SUBSCRIBED_GUILD_PERKS
+from .guild_settings import (
+    GUILD_SETTINGS_NOTIFY_CHANNEL,
+    fetch_guild_settings,
+    invalidate_guild_settings,
+    notify_guild_settings,
+    handle_guild_settings_notification,
+)
+from .member_cache import resolve_member, cache_member, invalidate_member
+from .localization import get_localizations
+from .component_listener import ComponentRoute, component_listener, modal_listener
+from .edit_sessions import get_edit_session, start_edit_session, end_edit_sessions, end_template_edit_sessions
 from .utils import (
+    application_command_ids,
     mention_command,
     compare_embeds,
     get_animal_name,
@@ -26,21 +40,43 @@ __all__ = (
     'errors',
     'types',
     'uuid',
+    'TimedCache',
     'Field',
     'FieldType',
     'TextField',
     'NumberField',
     'ImageField',
     'Template',
+    'TemplateProfileCount',
     'UserProfile',
     'FilledField',
     'CommandProcessor',
+    'CompiledCommand',
+    'EXPORT_WRITERS',
+    'export_template',
     'GuildPerks',
     'FieldCheckFailure',
+    'application_command_ids',
     'mention_command',
     'compare_embeds',
     'get_animal_name',
     'is_guild_advanced',
+    'fetch_guild_settings',
+    'invalidate_guild_settings',
+    'GUILD_SETTINGS_NOTIFY_CHANNEL',
+    'notify_guild_settings',
+    'handle_guild_settings_notification',
+    'resolve_member',
+    'cache_member',
+    'invalidate_member',
+    'get_localizations',
+    'ComponentRoute',
+    'component_listener',
+    'modal_listener',
+    'get_edit_session',
+    'start_edit_session',
+    'end_edit_sessions',
+    'end_template_edit_sessions',
     'pad_field_prompt_value',
     'NO_GUILD_PERKS',
     'SUBSCRIBED_GUILD_PERKS',
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+from collections import OrderedDict
+import time
+
+
+__all__ = (
+    'TimedCache',
+)
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TimedCache(Generic[K, V]):
+    """
+    A bounded, least-recently-used cache where each of the items also
+    expires after a given number of seconds.
+
+    Parameters
+    -----------
+    max_size: :class:`int`
+        The maximum number of items that can be held in the cache. When the
+        cache is full, the least recently used item is removed.
+    ttl: :class:`float`
+        The number of seconds that an item is valid for after being set.
+
+    Attributes
+    -----------
+    max_size: :class:`int`
+        The maximum number of items that can be held in the cache.
+    ttl: :class:`float`
+        The number of seconds that an item is valid for after being set.
+    hits: :class:`int`
+        The number of lookups that returned a cached value.
+    misses: :class:`int`
+        The number of lookups that didn't return a cached value.
+    """
+
+    __slots__ = (
+        "max_size",
+        "ttl",
+        "hits",
+        "misses",
+        "_items",
+    )
+
+    def __init__(self, *, max_size: int = 1_000, ttl: float = 300):
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._items: OrderedDict[K, Tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: K) -> bool:
+        try:
+            expiry, _ = self._items[key]
+        except KeyError:
+            return False
+        return expiry >= time.monotonic()
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """
+        Get an item from the cache, returning the default if it isn't
+        present or it has expired.
+        """
+
+        try:
+            expiry, value = self._items[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if expiry < time.monotonic():
+            del self._items[key]
+            self.misses += 1
+            return default
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, *, ttl: Optional[float] = None) -> List[K]:
+        """
+        Add an item to the cache, removing the least recently used item if
+        the cache is full.
+
+        Returns
+        --------
+        List[K]
+            The keys of the items that were removed to make room.
+        """
+
+        expiry = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._items[key] = (expiry, value)
+        self._items.move_to_end(key)
+        evicted: List[K] = []
+        while len(self._items) > self.max_size:
+            evicted.append(self._items.popitem(last=False)[0])
+        return evicted
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """
+        Remove an item from the cache, returning it if it was present.
+        """
+
+        try:
+            _, value = self._items.pop(key)
+        except KeyError:
+            return default
+        return value
+
+    def expires_in(self, key: K) -> Optional[float]:
+        """
+        Get the number of seconds until an item in the cache expires, or
+        ``None`` if it isn't in the cache. This doesn't count as a lookup.
+        """
+
+        try:
+            expiry, _ = self._items[key]
+        except KeyError:
+            return None
+        remaining = expiry - time.monotonic()
+        if remaining < 0:
+            return None
+        return remaining
+
+    def clear(self) -> None:
+        """
+        Remove all items from the cache.
+        """
+
+        self._items.clear()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        The hit and miss counters for the cache, as well as its current size.
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._items),
+            "max_size": self.max_size,
+        }
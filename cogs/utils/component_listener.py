@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Literal, TypeVar
+
+
+__all__ = (
+    'ComponentRoute',
+    'component_listener',
+    'modal_listener',
+)
+
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+class ComponentRoute:
+    """
+    The route that a component or modal handler has been registered for.
+
+    Attributes
+    -----------
+    kind: :class:`str`
+        Either ``"component"`` or ``"modal"``.
+    head: :class:`str`
+        The start of the custom IDs that the handler is called for; either
+        one or two words, eg ``"TEMPLATE_EDIT NAME"`` or ``"FIELD_DELETE"``.
+    """
+
+    __slots__ = (
+        "kind",
+        "head",
+    )
+
+    def __init__(self, kind: Literal["component", "modal"], head: str):
+        self.kind = kind
+        self.head = head
+
+    def __repr__(self) -> str:
+        return f"<ComponentRoute kind={self.kind!r} head={self.head!r}>"
+
+
+def _route(kind: Literal["component", "modal"], head: str) -> Callable[[F], F]:
+    if not 1 <= len(head.split(" ")) <= 2:
+        raise ValueError("Route heads must be one or two words.")
+
+    def inner(func: F) -> F:
+        func.__component_route__ = ComponentRoute(kind, head)  # type: ignore
+        return func
+    return inner
+
+
+def component_listener(head: str) -> Callable[[F], F]:
+    """
+    Register a cog method as the handler for component interactions whose
+    custom ID starts with the given one or two words. The handler is given
+    the interaction, and then the rest of the words in the custom ID as
+    positional arguments.
+
+    Parameters
+    -----------
+    head: :class:`str`
+        The start of the custom ID, eg ``"TEMPLATE_EDIT NAME"``.
+    """
+
+    return _route("component", head)
+
+
+def modal_listener(head: str) -> Callable[[F], F]:
+    """
+    Register a cog method as the handler for modal submissions whose custom
+    ID starts with the given one or two words. The handler is given the
+    interaction, and then the rest of the words in the custom ID as
+    positional arguments.
+
+    Parameters
+    -----------
+    head: :class:`str`
+        The start of the custom ID, eg ``"TEMPLATE_SET NAME"``.
+    """
+
+    return _route("modal", head)
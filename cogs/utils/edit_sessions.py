@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple, Union
+import uuid
+
+from .cache import TimedCache
+
+if TYPE_CHECKING:
+    from .profiles.template import Template
+    from .profiles.user_profile import UserProfile
+
+
+__all__ = (
+    'get_edit_session',
+    'start_edit_session',
+    'end_edit_sessions',
+    'end_template_edit_sessions',
+)
+
+
+# (Profile ID, user ID) -> the hydrated profile that they're editing.
+# Interaction tokens last for 15 minutes, so sessions don't outlive them.
+edit_session_cache: TimedCache[Tuple[str, int], UserProfile[Template]] = TimedCache(
+    max_size=5_000,
+    ttl=60 * 15,
+)
+
+# Profile ID -> the users who may have a session open for it
+_session_users: Dict[str, Set[int]] = dict()
+
+# Template ID -> the profiles that may have a session open for it
+_template_profiles: Dict[str, Set[str]] = dict()
+
+# Profile ID -> the ID of its template
+_profile_templates: Dict[str, str] = dict()
+
+
+def _forget_session(profile_id: str, user_id: int) -> None:
+    """
+    Remove a session from the indexes, once it's no longer in the cache.
+    """
+
+    user_ids = _session_users.get(profile_id)
+    if user_ids is None:
+        return
+    user_ids.discard(user_id)
+    if user_ids:
+        return
+    del _session_users[profile_id]
+    template_id = _profile_templates.pop(profile_id, None)
+    if template_id is None:
+        return
+    profile_ids = _template_profiles.get(template_id)
+    if profile_ids is None:
+        return
+    profile_ids.discard(profile_id)
+    if not profile_ids:
+        del _template_profiles[template_id]
+
+
+def get_edit_session(profile_id: str, user_id: int) -> Optional[UserProfile[Template]]:
+    """
+    Get the profile that a user is part way through editing, if they have
+    a session open for it.
+
+    Parameters
+    -----------
+    profile_id: :class:`str`
+        The ID of the profile.
+    user_id: :class:`int`
+        The ID of the user editing the profile.
+
+    Returns
+    --------
+    Optional[:class:`cogs.utils.profiles.user_profile.UserProfile`]
+        The hydrated profile. Changes made during the session should be
+        applied to this object directly.
+    """
+
+    profile_id = str(profile_id)
+    profile = edit_session_cache.get((profile_id, user_id))
+    if profile is None:
+        _forget_session(profile_id, user_id)
+    return profile
+
+
+def start_edit_session(profile: UserProfile[Template], user_id: int) -> None:
+    """
+    Keep a hydrated profile in memory for the rest of a user's edit, so that
+    each step doesn't need to fetch it again.
+
+    Parameters
+    -----------
+    profile: :class:`cogs.utils.profiles.user_profile.UserProfile`
+        The profile being edited, with its template and filled fields.
+    user_id: :class:`int`
+        The ID of the user editing the profile.
+    """
+
+    profile_id = str(profile.id)
+    template_id = str(profile.template.id)
+    evicted = edit_session_cache.set((profile_id, user_id), profile)
+    for key in evicted:
+        _forget_session(*key)
+    _session_users.setdefault(profile_id, set()).add(user_id)
+    _profile_templates[profile_id] = template_id
+    _template_profiles.setdefault(template_id, set()).add(profile_id)
+
+
+def end_edit_sessions(profile_id: Union[str, uuid.UUID], *, keep_user_id: Optional[int] = None) -> None:
+    """
+    Close the edit sessions open for a profile; for example when it's been
+    submitted or deleted, or when someone else has changed it.
+
+    Parameters
+    -----------
+    profile_id: Union[:class:`str`, :class:`uuid.UUID`]
+        The ID of the profile.
+    keep_user_id: Optional[:class:`int`]
+        A user whose session should be left open.
+    """
+
+    profile_id = str(profile_id)
+    for user_id in list(_session_users.get(profile_id, ())):
+        if user_id == keep_user_id:
+            continue
+        edit_session_cache.pop((profile_id, user_id))
+        _forget_session(profile_id, user_id)
+
+
+def end_template_edit_sessions(template_id: Union[str, uuid.UUID]) -> None:
+    """
+    Close the edit sessions open for every profile using a template; for
+    example when the template or one of its fields has changed, so that the
+    sessions' copies of the template are out of date.
+
+    Parameters
+    -----------
+    template_id: Union[:class:`str`, :class:`uuid.UUID`]
+        The ID of the template.
+    """
+
+    for profile_id in list(_template_profiles.get(str(template_id), ())):
+        end_edit_sessions(profile_id)
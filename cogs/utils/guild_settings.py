@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import logging
+
+from .cache import TimedCache
+
+if TYPE_CHECKING:
+    from discord.ext import vbu
+
+
+__all__ = (
+    'GUILD_SETTINGS_NOTIFY_CHANNEL',
+    'fetch_guild_settings',
+    'invalidate_guild_settings',
+    'notify_guild_settings',
+    'handle_guild_settings_notification',
+)
+
+
+log = logging.getLogger("guild_settings")
+
+
+# The Postgres channel that settings changes are announced on, so that every
+# process (the bot and the website) can drop its cached copy of the guild
+GUILD_SETTINGS_NOTIFY_CHANNEL = "guild_settings"
+
+
+# The settings used if there's neither a row for the guild nor a defaults row
+DEFAULT_GUILD_SETTINGS: Dict[str, Any] = {
+    "guild_id": 0,
+    "prefix": None,
+    "max_template_count": 0,
+    "max_template_field_count": 0,
+    "max_template_profile_count": 0,
+    "advanced": False,
+}
+
+
+# Guild ID -> settings row; an empty dict means that the guild has no row.
+# The global defaults are stored under guild ID 0.
+guild_settings_cache: TimedCache[int, Dict[str, Any]] = TimedCache(
+    max_size=10_000,
+    ttl=60 * 5,
+)
+
+
+async def fetch_guild_settings(
+        db: vbu.Database,
+        guild_id: int,
+        *,
+        use_defaults: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Get the settings row for a given guild, served from the cache where
+    possible.
+
+    Parameters
+    -----------
+    db: :class:`vbu.Database`
+        An active connection to the database.
+    guild_id: :class:`int`
+        The ID of the guild whose settings you want to get.
+    use_defaults: :class:`bool`
+        Whether or not to fall back to the global defaults (the row with
+        guild ID ``0``) if the guild has no settings of its own.
+
+    Returns
+    --------
+    Optional[Dict[:class:`str`, Any]]
+        The guild's settings. This will only be ``None`` if the guild has no
+        settings and ``use_defaults`` is ``False``.
+    """
+
+    # Work out which rows we need
+    wanted: List[int] = [guild_id]
+    if use_defaults and guild_id != 0:
+        wanted.append(0)
+    rows: Dict[int, Dict[str, Any]] = dict()
+    missing: List[int] = list()
+    for i in wanted:
+        cached = guild_settings_cache.get(i)
+        if cached is None:
+            missing.append(i)
+        else:
+            rows[i] = cached
+
+    # Get the missing ones from the database
+    if missing:
+        fetched = await db.call(
+            """
+            SELECT
+                *
+            FROM
+                guild_settings
+            WHERE
+                guild_id = ANY($1::BIGINT[])
+            """,
+            missing,
+        )
+        for i in missing:
+            rows[i] = dict()
+        for r in fetched:
+            rows[r["guild_id"]] = dict(r)
+        for i in missing:
+            guild_settings_cache.set(i, rows[i])
+
+    # Return the guild's row or the defaults
+    if rows[guild_id]:
+        return dict(rows[guild_id])
+    if not use_defaults:
+        return None
+    return dict(rows.get(0) or DEFAULT_GUILD_SETTINGS)
+
+
+def invalidate_guild_settings(guild_id: Optional[int] = None) -> None:
+    """
+    Remove a guild's settings from the cache, or every guild's settings if
+    no ID is given.
+    """
+
+    if guild_id is None:
+        guild_settings_cache.clear()
+    else:
+        guild_settings_cache.pop(guild_id)
+
+
+async def notify_guild_settings(db: vbu.Database, guild_id: int) -> None:
+    """
+    Tell every process listening on :data:`GUILD_SETTINGS_NOTIFY_CHANNEL`
+    that a guild's settings have changed.
+
+    Parameters
+    -----------
+    db: :class:`vbu.Database`
+        An active connection to the database.
+    guild_id: :class:`int`
+        The ID of the guild whose settings changed.
+    """
+
+    await db("SELECT PG_NOTIFY($1, $2)", GUILD_SETTINGS_NOTIFY_CHANNEL, str(guild_id))
+
+
+def handle_guild_settings_notification(connection, pid, channel: str, payload: str) -> None:
+    """
+    An asyncpg listener for :data:`GUILD_SETTINGS_NOTIFY_CHANNEL`,
+    invalidating the guild given in the payload.
+    """
+
+    try:
+        guild_id = int(payload)
+    except ValueError:
+        log.warning("Invalid guild settings notification payload %r", payload)
+        return
+    invalidate_guild_settings(guild_id)
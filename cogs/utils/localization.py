@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Dict, Tuple
+import functools
+
+import discord
+from discord.ext import vbu
+
+
+__all__ = (
+    'get_localizations',
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_localization_table(text: str, casefold: bool) -> Tuple[Tuple[discord.Locale, str], ...]:
+    """
+    Translate a string into every locale, once per process.
+    """
+
+    output = []
+    for locale in discord.Locale:
+        translated = vbu.translation(locale, "profile").gettext(text)
+        if casefold:
+            translated = translated.casefold()
+        output.append((locale, translated))
+    return tuple(output)
+
+
+def get_localizations(text: str, *, casefold: bool = False) -> Dict[discord.Locale, str]:
+    """
+    Get the translations of a string for every locale, for use as the
+    localizations of an application command. Each string is only translated
+    once; later calls are served from a table.
+
+    Parameters
+    -----------
+    text: :class:`str`
+        The string to translate.
+    casefold: :class:`bool`
+        Whether or not the translations should be casefolded; used for
+        command and option names.
+
+    Returns
+    --------
+    Dict[:class:`discord.Locale`, :class:`str`]
+        A new dict of locale to translation.
+    """
+
+    return dict(_build_localization_table(text, casefold))
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import discord
+
+from .cache import TimedCache
+
+
+__all__ = (
+    'resolve_member',
+    'cache_member',
+    'invalidate_member',
+)
+
+
+# (Guild ID, user ID) -> member
+member_cache: TimedCache[Tuple[int, int], discord.Member] = TimedCache(
+    max_size=10_000,
+    ttl=60,
+)
+
+
+def cache_member(member: discord.Member) -> None:
+    """
+    Store a member (and so their roles) in the member cache.
+    """
+
+    member_cache.set((member.guild.id, member.id), member)
+
+
+def invalidate_member(guild_id: int, user_id: int) -> None:
+    """
+    Remove a member from the member cache; for example after their roles
+    have been changed.
+    """
+
+    member_cache.pop((guild_id, user_id))
+
+
+async def resolve_member(
+        guild: discord.Guild,
+        user_id: int,
+        interaction: Optional[discord.Interaction] = None) -> discord.Member:
+    """
+    Get a member from a guild, only going to the API if they aren't the
+    user from the interaction and they haven't been seen recently.
+
+    Parameters
+    -----------
+    guild: :class:`discord.Guild`
+        The guild that the member is in.
+    user_id: :class:`int`
+        The ID of the member.
+    interaction: Optional[:class:`discord.Interaction`]
+        The interaction being processed. If the interaction user is a member
+        then they're added to the cache.
+
+    Raises
+    -------
+    :class:`discord.HTTPException`
+        If the member couldn't be fetched.
+
+    Returns
+    --------
+    :class:`discord.Member`
+        The member.
+    """
+
+    # See if it's the interaction user
+    if interaction is not None and isinstance(interaction.user, discord.Member):
+        cache_member(interaction.user)
+        if interaction.user.id == user_id:
+            return interaction.user
+
+    # See if we have them cached
+    member = guild.get_member(user_id) or member_cache.get((guild.id, user_id))
+    if member is not None:
+        return member
+
+    # Fetch them
+    member = await guild.fetch_member(user_id)
+    cache_member(member)
+    return member
@@ -1,13 +1,245 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import ClassVar, Optional, Set
 from dataclasses import dataclass
+import asyncio
+import logging
+import time
 
 from typing_extensions import Self
 import aiohttp
+from discord.ext import vbu
 
-if TYPE_CHECKING:
-    from discord.ext import vbu
+from .cache import TimedCache
+from .guild_settings import fetch_guild_settings
+
+
+log = logging.getLogger("perks_handler")
+
+
+class SubscriptionCache:
+    """
+    Works out (and caches) whether or not guilds have a premium
+    subscription.
+
+    Subscriptions in the local ``guild_subscriptions`` table are used
+    first, falling back to the Voxel Fox portal. Cached values are refreshed
+    in the background shortly before they expire. If the portal keeps
+    failing then it stops being called for a while, and the last known
+    value for the guild is used instead.
+
+    Parameters
+    -----------
+    ttl: :class:`float`
+        How long (in seconds) a subscription check is cached for.
+    refresh_window: :class:`float`
+        How long (in seconds) before expiry a cached value is refreshed in
+        the background.
+    timeout: :class:`float`
+        The timeout (in seconds) for requests to the portal.
+    failure_threshold: :class:`int`
+        The number of consecutive portal failures before it stops being
+        called.
+    reset_after: :class:`float`
+        How long (in seconds) the portal stops being called for.
+    """
+
+    PORTAL_URL: ClassVar[str] = "https://voxelfox.co.uk/api/portal/check"
+    PRODUCT_ID: ClassVar[str] = "ff547b6b-731c-4c5d-aff9-672ee628936c"
+
+    # The Postgres channel that subscription changes are announced on, so
+    # that every process can drop its cached value for the guild
+    NOTIFY_CHANNEL: ClassVar[str] = "guild_subscriptions"
+
+    def __init__(
+            self,
+            *,
+            ttl: float = 60 * 10,
+            refresh_window: float = 60,
+            timeout: float = 1.5,
+            failure_threshold: int = 3,
+            reset_after: float = 30):
+        self.cache: TimedCache[int, bool] = TimedCache(max_size=10_000, ttl=ttl)
+        self.last_known: TimedCache[int, bool] = TimedCache(
+            max_size=10_000,
+            ttl=60 * 60 * 24,
+        )
+        self.refresh_window: float = refresh_window
+        self.timeout: float = timeout
+        self.failure_threshold: int = failure_threshold
+        self.reset_after: float = reset_after
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._refreshing: Set[int] = set()
+        self._failures: int = 0
+        self._circuit_open_until: float = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        A long-lived session used for all portal requests.
+        """
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Close the shared session.
+        """
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def invalidate(self, guild_id: int) -> None:
+        """
+        Remove a guild's cached subscription status, so that it's checked
+        again next time.
+        """
+
+        self.cache.pop(guild_id)
+
+    @classmethod
+    async def notify(cls, db: vbu.Database, guild_id: int) -> None:
+        """
+        Tell every process listening on :attr:`NOTIFY_CHANNEL` that a
+        guild's subscription has changed.
+
+        Parameters
+        -----------
+        db: :class:`vbu.Database`
+            An active connection to the database.
+        guild_id: :class:`int`
+            The ID of the guild whose subscription changed.
+        """
+
+        await db("SELECT PG_NOTIFY($1, $2)", cls.NOTIFY_CHANNEL, str(guild_id))
+
+    def handle_notification(self, connection, pid, channel: str, payload: str) -> None:
+        """
+        An asyncpg listener for :attr:`NOTIFY_CHANNEL`, invalidating the
+        guild given in the payload.
+        """
+
+        try:
+            guild_id = int(payload)
+        except ValueError:
+            log.warning("Invalid subscription notification payload %r", payload)
+            return
+        self.invalidate(guild_id)
+
+    async def is_subscribed(self, db: vbu.Database, guild_id: int) -> bool:
+        """
+        Get whether or not the given guild has a premium subscription.
+
+        Parameters
+        -----------
+        db: :class:`vbu.Database`
+            An active connection to the database.
+        guild_id: :class:`int`
+            The ID of the guild to check.
+        """
+
+        # See if it's cached
+        cached = self.cache.get(guild_id)
+        if cached is not None:
+            expires_in = self.cache.expires_in(guild_id)
+            if (
+                    expires_in is not None
+                    and expires_in < self.refresh_window
+                    and guild_id not in self._refreshing):
+                self._refreshing.add(guild_id)
+                asyncio.create_task(self._refresh(guild_id))
+            return cached
+
+        # It isn't, so check
+        return await self._check(db, guild_id)
+
+    async def _refresh(self, guild_id: int) -> None:
+        """
+        Re-check a guild's subscription in the background.
+        """
+
+        try:
+            async with vbu.Database() as db:
+                await self._check(db, guild_id)
+        except Exception as e:
+            log.warning("Failed to refresh subscription for guild %s - %s", guild_id, e)
+        finally:
+            self._refreshing.discard(guild_id)
+
+    async def _check(self, db: vbu.Database, guild_id: int) -> bool:
+        """
+        Check a guild's subscription, and cache the result.
+        """
+
+        # See if there's a local subscription
+        subscription_rows = await db.call(
+            """
+            SELECT
+                guild_id
+            FROM
+                guild_subscriptions
+            WHERE
+                guild_id = $1
+            AND
+                (
+                    expiry_time IS NULL
+                    OR
+                    expiry_time > TIMEZONE('UTC', NOW())
+                )
+            """,
+            guild_id,
+        )
+        subscribed: Optional[bool] = True if subscription_rows else None
+
+        # Ask the portal
+        if subscribed is None:
+            subscribed = await self._check_portal(guild_id)
+
+        # The portal failed, so use the last value we knew about for a
+        # short while
+        if subscribed is None:
+            subscribed = bool(self.last_known.get(guild_id))
+            self.cache.set(guild_id, subscribed, ttl=self.reset_after)
+            return subscribed
+
+        # Cache and return
+        self.cache.set(guild_id, subscribed)
+        self.last_known.set(guild_id, subscribed)
+        return subscribed
+
+    async def _check_portal(self, guild_id: int) -> Optional[bool]:
+        """
+        Ask the portal whether the guild has a subscription, returning
+        ``None`` if the portal couldn't give an answer.
+        """
+
+        # See if the circuit is open
+        if self._circuit_open_until > time.monotonic():
+            return None
+
+        # Make the request
+        try:
+            async with self.session.get(
+                    self.PORTAL_URL,
+                    params={
+                        "guild_id": guild_id,
+                        "product_id": self.PRODUCT_ID,
+                    }) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
+            result = bool(data['result'])
+        except Exception:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._circuit_open_until = time.monotonic() + self.reset_after
+            return None
+        self._failures = 0
+        return result
 
 
 @dataclass
@@ -22,6 +254,8 @@ class GuildPerks:
     max_profile_count: int
     is_premium: bool = False
 
+    subscriptions: ClassVar[SubscriptionCache] = SubscriptionCache()
+
     @classmethod
     async def fetch(cls, db: vbu.Database, guild_id: int) -> Self:
         """
@@ -29,39 +263,11 @@ class GuildPerks:
         """
 
         # Has overrides for settings
-        guild_settings = await db.call(
-            """
-            SELECT
-                *
-            FROM
-                guild_settings
-            WHERE
-                guild_id = $1
-            OR
-                guild_id = 0
-            ORDER BY
-                guild_id
-            DESC
-            """,
-            guild_id,
-        )
+        guild_settings = await fetch_guild_settings(db, guild_id)
+        assert guild_settings
 
         # Contains premium subscriptions
-        async with aiohttp.ClientSession() as session:
-            try:
-                resp = await session.get(
-                    "https://voxelfox.co.uk/api/portal/check",
-                    params={
-                        "guild_id": guild_id,
-                        "product_id": "ff547b6b-731c-4c5d-aff9-672ee628936c",
-                    },
-                    timeout=1.5,
-                )
-                data = await resp.json()
-            except Exception:
-                guild_subscription = False
-            else:
-                guild_subscription = data['result']
+        guild_subscription = await cls.subscriptions.is_subscribed(db, guild_id)
         perks = (
             SUBSCRIBED_GUILD_PERKS
             if guild_subscription
@@ -70,17 +276,17 @@ class GuildPerks:
         return cls(
             guild_id=guild_id,
             max_template_count=max(
-                guild_settings[0]['max_template_count'],
+                guild_settings['max_template_count'],
                 perks.max_template_count,
                 NO_GUILD_PERKS.max_template_count,
             ),
             max_field_count=max(
-                guild_settings[0]['max_template_field_count'],
+                guild_settings['max_template_field_count'],
                 perks.max_field_count,
                 NO_GUILD_PERKS.max_field_count,
             ),
             max_profile_count=max(
-                guild_settings[0]['max_template_profile_count'],
+                guild_settings['max_template_profile_count'],
                 perks.max_profile_count,
                 NO_GUILD_PERKS.max_profile_count,
             ),
@@ -1,4 +1,5 @@
 import typing
+import functools
 import re
 
 import discord
@@ -13,6 +14,130 @@ class InvalidCommandText(commands.BadArgument):
     pass
 
 
+class CompiledCommand:
+    """
+    A parsed command, ready to be evaluated for any number of members
+    without any more regex work.
+
+    Attributes
+    -----------
+    valid: :class:`bool`
+        Whether or not the text was a valid command.
+    default: :class:`str`
+        The value used when the member has none of the command's roles.
+    role_values: Dict[:class:`int`, Tuple[:class:`int`, :class:`str`]]
+        A map of role ID to the position of its ``HASROLE`` in the command
+        and the value that it gives. Earlier positions take priority.
+    role_ids: FrozenSet[:class:`int`]
+        All of the role IDs that the command checks for.
+    has_roles: :class:`bool`
+        Whether or not the command has any ``HASROLE`` entries, and so
+        requires a member to be evaluated.
+    invalid_role: :class:`bool`
+        Whether or not the command contains a role that isn't an ID. Roles
+        after that point are ignored, and evaluating for a member who has
+        none of the earlier roles raises a :class:`ValueError`.
+    """
+
+    __slots__ = (
+        "valid",
+        "default",
+        "role_values",
+        "role_ids",
+        "has_roles",
+        "invalid_role",
+    )
+
+    def __init__(
+            self,
+            *,
+            valid: bool = False,
+            default: str = "",
+            role_values: typing.Optional[typing.Dict[int, typing.Tuple[int, str]]] = None,
+            has_roles: bool = False,
+            invalid_role: bool = False):
+        self.valid: bool = valid
+        self.default: str = default
+        self.role_values: typing.Dict[int, typing.Tuple[int, str]] = role_values or dict()
+        self.role_ids: typing.FrozenSet[int] = frozenset(self.role_values)
+        self.has_roles: bool = has_roles
+        self.invalid_role: bool = invalid_role
+
+    def evaluate(self, role_ids: typing.Optional[typing.Iterable[int]]) -> str:
+        """
+        Get the value of the command for a member with the given role IDs.
+
+        Parameters
+        -----------
+        role_ids: Optional[Iterable[:class:`int`]]
+            The IDs of the member's roles, or ``None`` if there's no member.
+
+        Raises
+        -------
+        :class:`ValueError`
+            If the command requires a member to get a value.
+
+        Returns
+        --------
+        :class:`str`
+            The value for the member.
+        """
+
+        if not self.valid:
+            return ""
+        if not self.has_roles:
+            return self.default
+        return self._evaluate_roles(role_ids)
+
+    def _evaluate_roles(self, role_ids: typing.Optional[typing.Iterable[int]]) -> str:
+        """
+        Get the value of a valid command with ``HASROLE`` entries for a
+        member with the given role IDs.
+        """
+
+        if role_ids is None:
+            raise ValueError("Member is required for this command.")
+        best: typing.Optional[typing.Tuple[int, str]] = None
+        for role_id in role_ids:
+            found = self.role_values.get(role_id)
+            if found is not None and (best is None or found < best):
+                best = found
+        if best is not None:
+            return best[1]
+        if self.invalid_role:
+            raise ValueError("Invalid role ID in command.")
+        return self.default
+
+    def evaluate_many(
+            self,
+            role_id_sets: typing.Iterable[typing.Optional[typing.Iterable[int]]]) -> typing.List[str]:
+        """
+        Get the value of the command for many members at once, checking
+        whether the command is valid and has roles only once.
+
+        Parameters
+        -----------
+        role_id_sets: Iterable[Optional[Iterable[:class:`int`]]]
+            The role IDs for each of the members.
+
+        Raises
+        -------
+        :class:`ValueError`
+            If the command requires a member to get a value.
+
+        Returns
+        --------
+        List[:class:`str`]
+            The value for each of the members, in the order given.
+        """
+
+        if not self.valid:
+            return ["" for _ in role_id_sets]
+        if not self.has_roles:
+            return [self.default for _ in role_id_sets]
+        return [self._evaluate_roles(i) for i in role_id_sets]
+
+
 class CommandProcessor:
     """
     An object that processes commands for the user.
@@ -38,6 +163,7 @@ class CommandProcessor:
     )
 
     @classmethod
+    @functools.lru_cache(maxsize=4_096)
     def get_is_command(cls, text: str) -> typing.Tuple[bool, bool]:
         """
         Returns whether or not the given text is a command as well as whether or not it's
@@ -88,24 +214,89 @@ class CommandProcessor:
             The value for the field.
         """
 
+        return cls.compile(text).evaluate(
+            member.role_ids if member is not None else None,
+        )
+
+    @classmethod
+    def get_values(
+            cls,
+            text: str,
+            members: typing.Iterable[typing.Optional[discord.Member]]) -> typing.List[str]:
+        """
+        Return the value for a field after it's run through a command, for
+        each of the given members.
+
+        Parameters
+        -----------
+        text: :class:`str`
+            The command value that was assigned to the field.
+        members: Iterable[Optional[:class:`discord.Member`]]
+            The members for whom the text should be generated.
+
+        Raises
+        -------
+        :class:`ValueError`
+            If the command requires a member to get a value.
+
+        Returns
+        --------
+        List[:class:`str`]
+            The value for each of the members, in the order given.
+        """
+
+        return cls.compile(text).evaluate_many(
+            m.role_ids if m is not None else None
+            for m in members
+        )
+
+    @classmethod
+    @functools.lru_cache(maxsize=4_096)
+    def compile(cls, text: str) -> CompiledCommand:
+        """
+        Parse the given command text into a :class:`CompiledCommand`.
+        Results are cached, so this is cheap to call repeatedly with the
+        same text.
+
+        Parameters
+        -----------
+        text: :class:`str`
+            The command text.
+
+        Returns
+        --------
+        :class:`cogs.utils.profiles.command_processor.CompiledCommand`
+            The compiled command. If the text isn't a valid command then
+            the compiled command will always evaluate to an empty string.
+        """
+
         # See if it's a command
         valid_command_match = cls.VALID_COMMAND_REGEX.search(text)
         if valid_command_match is None:
-            return ""
+            return CompiledCommand()
 
-        # Get the command values
+        # Get the default value
         default_text_match = cls.ELSE_REGEX.search(text)
         if not default_text_match:
-            return ""
-        hasrole_match_iter = cls.HASROLE_REGEX.finditer(text)
-
-        # See if the member has the relevant role
-        for hasrole_match in hasrole_match_iter:
-            if member is None:
-                raise ValueError("Member is required for this command.")
-            role_id = int(hasrole_match.group(1))
-            if role_id in member.role_ids:
-                return hasrole_match.group(2)
-
-        # Otherwise return the default
-        return default_text_match.group(1)
+            return CompiledCommand()
+
+        # Build the role table, with the first mention of a role winning
+        role_values: typing.Dict[int, typing.Tuple[int, str]] = dict()
+        has_roles = False
+        invalid_role = False
+        for index, hasrole_match in enumerate(cls.HASROLE_REGEX.finditer(text)):
+            has_roles = True
+            try:
+                role_id = int(hasrole_match.group(1))
+            except ValueError:
+                invalid_role = True
+                break
+            role_values.setdefault(role_id, (index, hasrole_match.group(2)))
+
+        return CompiledCommand(
+            valid=True,
+            default=default_text_match.group(1),
+            role_values=role_values,
+            has_roles=has_roles,
+            invalid_role=invalid_role,
+        )
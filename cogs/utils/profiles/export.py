@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+from typing import IO, TYPE_CHECKING, Any, AsyncIterator, ClassVar, Dict, Iterator, List, Type
+import abc
+import collections
+import contextlib
+import csv
+import gzip
+import io
+import json
+import shutil
+import tempfile
+
+if TYPE_CHECKING:
+    from discord.ext import vbu
+
+    from .template import Template
+
+
+__all__ = (
+    'ExportWriter',
+    'JSONExportWriter',
+    'NDJSONExportWriter',
+    'CSVExportWriter',
+    'ColumnarJSONExportWriter',
+    'EXPORT_WRITERS',
+    'open_compressed_text',
+    'iter_export_rows',
+    'export_template',
+)
+
+
+class ExportWriter(abc.ABC):
+    """
+    The base class for something that writes exported profiles to a file.
+    Rows are given one at a time so that nothing needs to be held in memory.
+
+    Field names don't need to be unique within a template (and can be
+    empty), so filled fields are keyed by field ID, with a schema that maps
+    each ID to its field's name.
+
+    Parameters
+    -----------
+    fp: IO[:class:`str`]
+        The file that the export should be written to.
+    template: :class:`cogs.utils.profiles.template.Template`
+        The template whose profiles are being exported.
+
+    Attributes
+    -----------
+    extension: :class:`str`
+        The file extension for this format (excluding the compression
+        extension).
+    field_schema: List[Dict[:class:`str`, Any]]
+        The ID, name, and index of each of the template's fields, in order.
+    field_labels: Dict[:class:`str`, :class:`str`]
+        A unique label for each field ID; the field's name, or the name
+        followed by the ID where the name is empty or used more than once.
+    """
+
+    extension: ClassVar[str]
+
+    def __init__(self, fp: IO[str], template: Template):
+        self.fp = fp
+        self.template = template
+        self.fields = template.field_list
+        self.field_schema: List[Dict[str, Any]] = [
+            {
+                "id": f.id,
+                "name": f.name,
+                "index": f.index,
+            }
+            for f in self.fields
+        ]
+        name_counts = collections.Counter(f.name for f in self.fields)
+        self.field_labels: Dict[str, str] = {
+            f.id: (
+                f.name
+                if f.name and name_counts[f.name] == 1
+                else f"{f.name or ''} ({f.id})".lstrip()
+            )
+            for f in self.fields
+        }
+
+    def start(self) -> None:
+        """
+        Called before any rows are written.
+        """
+
+        pass
+
+    @abc.abstractmethod
+    def write_row(self, row: Dict[str, Any]) -> None:
+        """
+        Write a single profile to the file.
+        """
+
+    def finish(self) -> None:
+        """
+        Called after all of the rows have been written.
+        """
+
+        pass
+
+    def row_to_dict(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a profile row into a dict with its filled fields keyed by
+        field ID, in the template's field order.
+        """
+
+        filled_fields = row["filled_fields"]
+        return {
+            "id": row["id"],
+            "user_id": row["user_id"],
+            "name": row["name"],
+            "draft": row["draft"],
+            "verified": row["verified"],
+            "fields": {
+                f.id: filled_fields.get(f.id)
+                for f in self.fields
+            },
+        }
+
+
+class JSONExportWriter(ExportWriter):
+    """
+    Writes the profiles as a single JSON object, with the field schema
+    under ``"fields"`` and an array of profiles under ``"profiles"``.
+    """
+
+    extension = "json"
+
+    def start(self) -> None:
+        self.fp.write('{"fields":')
+        json.dump(self.field_schema, self.fp)
+        self.fp.write(',"profiles":[')
+        self._first = True
+
+    def write_row(self, row: Dict[str, Any]) -> None:
+        if not self._first:
+            self.fp.write(",")
+        self._first = False
+        self.fp.write("\n")
+        json.dump(self.row_to_dict(row), self.fp)
+
+    def finish(self) -> None:
+        self.fp.write("\n]}\n")
+
+
+class NDJSONExportWriter(ExportWriter):
+    """
+    Writes the profiles as newline delimited JSON, one object per line.
+    The first line is the field schema, as ``{"fields": [...]}``.
+    """
+
+    extension = "ndjson"
+
+    def start(self) -> None:
+        json.dump({"fields": self.field_schema}, self.fp)
+        self.fp.write("\n")
+
+    def write_row(self, row: Dict[str, Any]) -> None:
+        json.dump(self.row_to_dict(row), self.fp)
+        self.fp.write("\n")
+
+
+class CSVExportWriter(ExportWriter):
+    """
+    Writes the profiles as CSV, with one column per template field. Field
+    columns are headed with each field's unique label.
+    """
+
+    extension = "csv"
+
+    def start(self) -> None:
+        self._writer = csv.writer(self.fp)
+        self._writer.writerow([
+            "id",
+            "user_id",
+            "name",
+            "draft",
+            "verified",
+            *(self.field_labels[f.id] for f in self.fields),
+        ])
+
+    def write_row(self, row: Dict[str, Any]) -> None:
+        filled_fields = row["filled_fields"]
+        self._writer.writerow([
+            row["id"],
+            row["user_id"],
+            row["name"],
+            row["draft"],
+            row["verified"],
+            *(filled_fields.get(f.id) for f in self.fields),
+        ])
+
+
+class ColumnarJSONExportWriter(ExportWriter):
+    """
+    Writes the profiles as a single JSON object of columns, with one
+    array per attribute and per template field. Field columns are keyed
+    by field ID under ``"fields"``, alongside the field schema under
+    ``"field_schema"``. Each column is spooled to its own temporary file
+    while rows are written, and the columns are joined together at the
+    end.
+    """
+
+    extension = "columns.json"
+
+    def start(self) -> None:
+        self._columns: Dict[str, IO[str]] = {
+            i: tempfile.TemporaryFile("w+", encoding="utf-8")
+            for i in ("id", "user_id", "name", "draft", "verified")
+        }
+        self._field_columns: Dict[str, IO[str]] = {
+            f.id: tempfile.TemporaryFile("w+", encoding="utf-8")
+            for f in self.fields
+        }
+        self._first = True
+
+    def write_row(self, row: Dict[str, Any]) -> None:
+        separator = "" if self._first else ","
+        self._first = False
+        for key, column in self._columns.items():
+            column.write(separator + json.dumps(row[key]))
+        filled_fields = row["filled_fields"]
+        for field_id, column in self._field_columns.items():
+            column.write(separator + json.dumps(filled_fields.get(field_id)))
+
+    def _write_column(self, name: str, column: IO[str]) -> None:
+        self.fp.write(json.dumps(name) + ":[")
+        column.seek(0)
+        shutil.copyfileobj(column, self.fp)
+        self.fp.write("]")
+        column.close()
+
+    def finish(self) -> None:
+        self.fp.write("{")
+        for key, column in self._columns.items():
+            self._write_column(key, column)
+            self.fp.write(",")
+        self.fp.write('"field_schema":')
+        json.dump(self.field_schema, self.fp)
+        self.fp.write(',"fields":{')
+        for index, f in enumerate(self.fields):
+            if index:
+                self.fp.write(",")
+            self._write_column(f.id, self._field_columns[f.id])
+        self.fp.write("}}\n")
+
+
+EXPORT_WRITERS: Dict[str, Type[ExportWriter]] = {
+    "JSON": JSONExportWriter,
+    "NDJSON": NDJSONExportWriter,
+    "CSV": CSVExportWriter,
+    "COLUMNAR": ColumnarJSONExportWriter,
+}
+
+
+@contextlib.contextmanager
+def open_compressed_text(output: IO[bytes]) -> Iterator[IO[str]]:
+    """
+    Open a text stream that writes gzipped UTF-8 to the given binary file.
+    The gzip stream is finished when the context manager exits, but the
+    file itself is left open.
+    """
+
+    with gzip.GzipFile(fileobj=output, mode="wb") as compressed:
+        with io.TextIOWrapper(compressed, encoding="utf-8", newline="") as text:
+            yield text
+
+
+async def iter_export_rows(
+        db: vbu.Database,
+        template: Template,
+        *,
+        chunk_size: int = 500) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream all of the non-deleted profiles for a template out of the
+    database in chunks, using a server-side cursor. Each row has its
+    filled fields as a dict of field ID to value.
+
+    The cursor's transaction is held open until the generator finishes, so
+    consumers that may stop early should wrap it in
+    :func:`contextlib.aclosing`.
+
+    Parameters
+    -----------
+    db: :class:`vbu.Database`
+        An active connection to the database.
+    template: :class:`cogs.utils.profiles.template.Template`
+        The template whose profiles should be fetched.
+    chunk_size: :class:`int`
+        The number of rows to fetch from the cursor at once.
+    """
+
+    async with db.transaction():
+        cursor = await db.conn.cursor(
+            """
+            SELECT
+                created_profiles.id,
+                created_profiles.user_id,
+                created_profiles.name,
+                created_profiles.draft,
+                created_profiles.verified,
+                COALESCE(
+                    (
+                        SELECT
+                            JSON_OBJECT_AGG(filled_fields.field_id, filled_fields.value)
+                        FROM
+                            filled_fields
+                        WHERE
+                            filled_fields.profile_id = created_profiles.id
+                    ),
+                    '{}'
+                )::TEXT AS filled_fields
+            FROM
+                created_profiles
+            WHERE
+                created_profiles.template_id = $1
+            AND
+                created_profiles.deleted = false
+            """,
+            template.id,
+        )
+        while True:
+            rows = await cursor.fetch(chunk_size)
+            if not rows:
+                break
+            yield [
+                {
+                    "id": str(r["id"]),
+                    "user_id": str(r["user_id"]),
+                    "name": r["name"],
+                    "draft": r["draft"],
+                    "verified": r["verified"],
+                    "filled_fields": json.loads(r["filled_fields"]),
+                }
+                for r in rows
+            ]
+
+
+async def export_template(
+        db: vbu.Database,
+        template: Template,
+        format: str = "JSON",
+        *,
+        chunk_size: int = 500) -> IO[bytes]:
+    """
+    Export all of the profiles for a template into a gzipped temporary
+    file. The template must have its fields fetched.
+
+    Parameters
+    -----------
+    db: :class:`vbu.Database`
+        An active connection to the database.
+    template: :class:`cogs.utils.profiles.template.Template`
+        The template whose profiles should be exported.
+    format: :class:`str`
+        The format to export in. Must be a key of ``EXPORT_WRITERS``.
+    chunk_size: :class:`int`
+        The number of rows to fetch from the database at once.
+
+    Returns
+    --------
+    IO[:class:`bytes`]
+        The compressed export, seeked to the start. The caller is
+        responsible for closing it.
+    """
+
+    writer_cls = EXPORT_WRITERS[format]
+    output = tempfile.TemporaryFile()
+    try:
+        with open_compressed_text(output) as text:
+            writer = writer_cls(text, template)
+            writer.start()
+            export_rows = iter_export_rows(db, template, chunk_size=chunk_size)
+            async with contextlib.aclosing(export_rows):
+                async for rows in export_rows:
+                    for r in rows:
+                        writer.write_row(r)
+            writer.finish()
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    return output
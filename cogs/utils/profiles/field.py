@@ -152,40 +152,52 @@ class Field:
             setattr(self, i, o)
         await db.call(
             """
-            INSERT INTO
-                fields
-                (
-                    id,
-                    name,
-                    index,
-                    prompt,
-                    field_type,
-                    optional,
-                    deleted,
+            WITH saved_field AS (
+                INSERT INTO
+                    fields
+                    (
+                        id,
+                        name,
+                        index,
+                        prompt,
+                        field_type,
+                        optional,
+                        deleted,
+                        template_id
+                    )
+                VALUES
+                    (
+                        $1,
+                        $2,
+                        $3,
+                        $4,
+                        $5,
+                        $6,
+                        $7,
+                        $8
+                    )
+                ON CONFLICT
+                    (id)
+                DO UPDATE
+                SET
+                    name = $2,
+                    index = $3,
+                    prompt = $4,
+                    field_type = $5,
+                    optional = $6,
+                    deleted = $7,
+                    template_id = $8
+                RETURNING
                     template_id
-                )
-            VALUES
-                (
-                    $1,
-                    $2,
-                    $3,
-                    $4,
-                    $5,
-                    $6,
-                    $7,
-                    $8
-                )
-            ON CONFLICT
-                (id)
-            DO UPDATE
+            )
+            UPDATE
+                templates
             SET
-                name = $2,
-                index = $3,
-                prompt = $4,
-                field_type = $5,
-                optional = $6,
-                deleted = $7,
-                template_id = $8
+                version = templates.version + 1
+            FROM
+                saved_field
+            WHERE
+                templates.id = saved_field.template_id
             """,
             self.id,
             self.name,
@@ -196,6 +208,10 @@ class Field:
             self.deleted,
             self.template_id,
         )
+
+        # Grab our imports here to avoid circular importing
+        from .template import Template
+        Template.invalidate_cache(self.template_id)
         return self
 
     @classmethod
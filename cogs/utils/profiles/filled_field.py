@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, TypeVar, Union, Optional, Generic, overload
+from typing import TYPE_CHECKING, Tuple, TypeVar, Union, Optional, Generic, overload
 import uuid
 
 from .field import Field
@@ -89,7 +89,7 @@ class FilledField(Generic[F]):
             db: vbu.Database,
             profile_id: any_id,
             field_id: any_id,
-            new_value: None) -> None:
+            new_value: None) -> Tuple[None, int]:
         ...
 
     @overload
@@ -99,7 +99,7 @@ class FilledField(Generic[F]):
             db: vbu.Database,
             profile_id: any_id,
             field_id: any_id,
-            new_value: str) -> FilledField[None]:
+            new_value: str) -> Tuple[FilledField[None], int]:
         ...
 
     @classmethod
@@ -108,51 +108,78 @@ class FilledField(Generic[F]):
             db: vbu.Database,
             profile_id: any_id,
             field_id: any_id,
-            new_value: Optional[str]) -> FilledField | None:
+            new_value: Optional[str]) -> Tuple[FilledField | None, int]:
         """
         Update a filled field value in the database, creating if one does not
-        exist.
+        exist. The content version of the profile is incremented.
+
+        Returns
+        --------
+        Tuple[Optional[:class:`cogs.utils.profiles.filled_field.FilledField`], :class:`int`]
+            The filled field (or ``None`` if it was cleared), and the
+            profile's new content version as set by the database.
         """
 
         if new_value is None:
-            await db.call(
+            rows = await db.call(
                 """
-                DELETE FROM
-                    filled_fields
+                WITH deleted AS (
+                    DELETE FROM
+                        filled_fields
+                    WHERE
+                        profile_id = $1
+                    AND
+                        field_id = $2
+                )
+                UPDATE
+                    created_profiles
+                SET
+                    content_version = content_version + 1
                 WHERE
-                    profile_id = $1
-                AND
-                    field_id = $2
+                    id = $1
+                RETURNING
+                    content_version
                 """,
                 profile_id, field_id,
             )
-            return
+            return None, rows[0]["content_version"]
 
-        await db.call(
+        rows = await db.call(
             """
-            INSERT INTO
-                filled_fields
-                (
-                    profile_id,
-                    field_id,
-                    value
-                )
-            VALUES
-                (
-                    $1,
-                    $2,
-                    $3
-                )
-            ON CONFLICT
-                (profile_id, field_id)
-            DO UPDATE
+            WITH upserted AS (
+                INSERT INTO
+                    filled_fields
+                    (
+                        profile_id,
+                        field_id,
+                        value
+                    )
+                VALUES
+                    (
+                        $1,
+                        $2,
+                        $3
+                    )
+                ON CONFLICT
+                    (profile_id, field_id)
+                DO UPDATE
+                SET
+                    value = $3
+            )
+            UPDATE
+                created_profiles
             SET
-                value = $3
+                content_version = content_version + 1
+            WHERE
+                id = $1
+            RETURNING
+                content_version
             """,
             profile_id, field_id, new_value,
         )
-        return cls(
+        filled_field = cls(
             profile_id=profile_id,
             field_id=field_id,
             value=new_value,
         )
+        return filled_field, rows[0]["content_version"]
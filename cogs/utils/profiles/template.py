@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Union, Optional, List, Dict, Type
+from typing import TYPE_CHECKING, Any, ClassVar, Union, Optional, List, Dict, Tuple, Type
 from typing_extensions import Self
+from dataclasses import dataclass
 import uuid
 import operator
 
 import discord
 from discord.ext import vbu
 
+from cogs.utils.cache import TimedCache
+from cogs.utils.edit_sessions import end_template_edit_sessions
 from cogs.utils.profiles.field import Field
 from cogs.utils.profiles.command_processor import CommandProcessor
 
@@ -19,6 +22,19 @@ def _(a: str) -> str:
     return a
 
 
+@dataclass
+class TemplateProfileCount:
+    """
+    The number of (non-deleted) profiles that have been created for a
+    given template.
+    """
+
+    template: Template
+    total: int
+    draft: int
+    verified: int
+
+
 class Template:
     """
     A class for an abstract template object that's saved to guild.
@@ -81,8 +97,35 @@ class Template:
         The ID of the application command associated with this template.
     user_manageable: :class:`bool`
         Whether or not this profile is user manageable.
+    version: :class:`int`
+        Incremented in the database whenever the template or one of its
+        fields changes.
+    cache: :class:`cogs.utils.cache.TimedCache`
+        A class-level cache of non-deleted template rows (and their field
+        rows), keyed by template ID. Its ``hits`` and ``misses`` counters
+        can be used to see how effective the cache is.
+    command_index: Dict[:class:`int`, Tuple[:class:`str`, :class:`bool`]]
+        A class-level map of application command IDs to the ID of the template
+        that they belong to, and whether or not the command is a context
+        command.
     """
 
+    cache: ClassVar[TimedCache[str, Tuple[Dict[str, Any], List[Dict[str, Any]]]]] = TimedCache(
+        max_size=5_000,
+        ttl=60 * 10,
+    )
+    name_cache: ClassVar[TimedCache[Tuple[int, str], str]] = TimedCache(
+        max_size=5_000,
+        ttl=60 * 10,
+    )
+
+    command_index: ClassVar[Dict[int, Tuple[str, bool]]] = dict()
+    _commands_by_template: ClassVar[Dict[str, Tuple[Optional[int], Optional[int]]]] = dict()
+    unknown_command_cache: ClassVar[TimedCache[int, bool]] = TimedCache(
+        max_size=10_000,
+        ttl=60 * 5,
+    )
+
     __slots__ = (
         "_id",
         "colour",
@@ -98,6 +141,7 @@ class Template:
         "deleted",
         "archive_is_forum",
         "user_manageable",
+        "version",
     )
 
     def __init__(
@@ -114,7 +158,8 @@ class Template:
             max_profile_count: int = 5,
             deleted: bool = False,
             archive_is_forum: bool = False,
-            user_manageable: bool = True):
+            user_manageable: bool = True,
+            version: int = 0):
         self._id: Optional[uuid.UUID] = id
         self.name: str = name
         self.guild_id: int = guild_id
@@ -128,6 +173,7 @@ class Template:
         self.deleted: bool = deleted
         self.archive_is_forum: bool = archive_is_forum
         self.user_manageable: bool = user_manageable
+        self.version: int = version
 
         self.all_fields: Dict[str, Field] = dict()
 
@@ -397,12 +443,49 @@ class Template:
             for i in profile_rows
         ]
         if fetch_filled_fields:
-            [
-                await i.fetch_filled_fields(db)
-                for i in profiles
-            ]
+            await UserProfile.fetch_filled_fields_bulk(db, profiles)
         return profiles  # pyright: ignore  # Weird return types with generic and self
 
+    async def fetch_profile_count_for_user(
+            self,
+            db: vbu.Database,
+            user_id: int) -> Tuple[int, int]:
+        """
+        Count the (non-deleted) profiles that a given user has for this
+        template, without fetching any of them.
+
+        Parameters
+        -----------
+        db: :class:`vbu.Database`
+            An active connection to the database.
+        user_id: :class:`int`
+            The ID of the user whose profiles you want to count.
+
+        Returns
+        --------
+        Tuple[:class:`int`, :class:`int`]
+            The total number of profiles, and the number of those profiles
+            that have been submitted (ie are not drafts).
+        """
+
+        rows = await db.call(
+            """
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE draft = false) AS submitted
+            FROM
+                created_profiles
+            WHERE
+                template_id = $1
+            AND
+                user_id = $2
+            AND
+                deleted = false
+            """,
+            self.id, user_id,
+        )
+        return rows[0]["total"], rows[0]["submitted"]
+
     async def fetch_all_profiles(
             self,
             db: vbu.Database,
@@ -447,10 +530,7 @@ class Template:
             for i in profile_rows
         ]
         if fetch_filled_fields:
-            [
-                await i.fetch_filled_fields(db)
-                for i in profiles
-            ]
+            await UserProfile.fetch_filled_fields_bulk(db, profiles)
         return profiles
 
     @classmethod
@@ -465,6 +545,11 @@ class Template:
         Get a template from the database via its ID.
         """
 
+        # See if it's cached
+        template = cls._get_from_cache(template_id, fetch_fields=fetch_fields)
+        if template is not None:
+            return template
+
         # Grab the template
         extra = "" if allow_deleted else "AND deleted = false"
         template_rows = await db.call(
@@ -481,10 +566,11 @@ class Template:
         )
         if not template_rows:
             return None
-        template = cls(**template_rows[0])
-        if fetch_fields:
-            await template.fetch_fields(db)
-        return template
+        return await cls._create_from_row(
+            db,
+            template_rows[0],
+            fetch_fields=fetch_fields,
+        )
 
     @classmethod
     async def fetch_template_by_name(
@@ -499,6 +585,16 @@ class Template:
         Get a template from the database via its name.
         """
 
+        # See if it's cached
+        cached_id = cls.name_cache.get((guild_id, template_name.lower()))
+        if cached_id is not None:
+            template = cls._get_from_cache(cached_id, fetch_fields=fetch_fields)
+            if (
+                    template is not None
+                    and template.guild_id == guild_id
+                    and template.name.lower() == template_name.lower()):
+                return template
+
         # Grab the template
         extra = "" if allow_deleted else "AND deleted = false"
         template_rows = await db.call(
@@ -517,11 +613,243 @@ class Template:
         )
         if not template_rows:
             return None
-        template = cls(**template_rows[0])
+        return await cls._create_from_row(
+            db,
+            template_rows[0],
+            fetch_fields=fetch_fields,
+        )
+
+    @classmethod
+    async def _create_from_row(
+            cls,
+            db: vbu.Database,
+            template_row: Any,
+            *,
+            fetch_fields: bool = True) -> Template:
+        """
+        Create a template from a database row, fetching its fields and adding
+        it to the cache if required.
+        """
+
+        template = cls(**template_row)
+        if not fetch_fields:
+            return template
+        field_rows = await cls._fetch_field_rows(db, template.id)
+        template._add_field_rows(field_rows)
+        if not template.deleted:
+            cls._add_to_cache(template_row, field_rows)
+        return template
+
+    @classmethod
+    def _get_from_cache(
+            cls,
+            template_id: str,
+            *,
+            fetch_fields: bool = True) -> Optional[Template]:
+        """
+        Build a template from the cached rows for the given ID, if there
+        are any.
+        """
+
+        cached = cls.cache.get(str(template_id))
+        if cached is None:
+            return None
+        template_row, field_rows = cached
+        template = cls(**template_row)
         if fetch_fields:
-            await template.fetch_fields(db)
+            template._add_field_rows(field_rows)
         return template
 
+    @classmethod
+    def _add_to_cache(cls, template_row: Any, field_rows: List[Any]) -> None:
+        """
+        Store the given template and field rows in the cache.
+        """
+
+        template_row = dict(template_row)
+        template_id = str(template_row["id"])
+        cls.cache.set(
+            template_id,
+            (template_row, [dict(i) for i in field_rows]),
+        )
+        cls.name_cache.set(
+            (template_row["guild_id"], template_row["name"].lower()),
+            template_id,
+        )
+
+    @classmethod
+    def invalidate_cache(cls, template_id: str) -> None:
+        """
+        Remove a template from the cache, so that the next fetch goes to
+        the database. Edit sessions holding the old template are closed.
+        """
+
+        end_template_edit_sessions(template_id)
+        cached = cls.cache.pop(str(template_id))
+        if cached is None:
+            return
+        template_row, _ = cached
+        cls.name_cache.pop(
+            (template_row["guild_id"], template_row["name"].lower()),
+        )
+
+    @classmethod
+    def _index_commands(
+            cls,
+            template_id: str,
+            application_command_id: Optional[int],
+            context_command_id: Optional[int]) -> None:
+        """
+        Point the given command IDs at the given template in the command
+        index, removing any commands that were previously stored for it.
+        """
+
+        template_id = str(template_id)
+        old_command_ids = cls._commands_by_template.pop(template_id, ())
+        for command_id in old_command_ids:
+            if command_id is None:
+                continue
+            indexed = cls.command_index.get(command_id)
+            if indexed and indexed[0] == template_id:
+                del cls.command_index[command_id]
+        if context_command_id:
+            cls.command_index[context_command_id] = (template_id, True)
+            cls.unknown_command_cache.pop(context_command_id)
+        if application_command_id:
+            cls.command_index[application_command_id] = (template_id, False)
+            cls.unknown_command_cache.pop(application_command_id)
+        cls._commands_by_template[template_id] = (
+            application_command_id,
+            context_command_id,
+        )
+
+    @classmethod
+    async def load_command_index(cls, db: vbu.Database) -> None:
+        """
+        Load the command IDs for every template into the command index.
+        """
+
+        rows = await db.call(
+            """
+            SELECT
+                id,
+                application_command_id,
+                context_command_id
+            FROM
+                templates
+            WHERE
+                application_command_id IS NOT NULL
+            OR
+                context_command_id IS NOT NULL
+            """,
+        )
+        cls.command_index.clear()
+        cls._commands_by_template.clear()
+        cls.unknown_command_cache.clear()
+        for r in rows:
+            cls._index_commands(
+                r["id"],
+                r["application_command_id"],
+                r["context_command_id"],
+            )
+
+    @classmethod
+    async def fetch_template_id_by_command_id(
+            cls,
+            db: vbu.Database,
+            command_id: int) -> Optional[Tuple[str, bool]]:
+        """
+        Get the ID of the template that a given application command belongs
+        to, as well as whether or not the command is a context command.
+        Deleted templates are included.
+
+        Parameters
+        -----------
+        db: :class:`vbu.Database`
+            An active connection to the database.
+        command_id: :class:`int`
+            The ID of the application command.
+
+        Returns
+        --------
+        Optional[Tuple[:class:`str`, :class:`bool`]]
+            The template ID and whether the command is a context command,
+            or ``None`` if the command doesn't belong to any template.
+        """
+
+        # See if it's indexed
+        indexed = cls.command_index.get(command_id)
+        if indexed is not None:
+            return indexed
+        if command_id in cls.unknown_command_cache:
+            return None
+
+        # Look in the database
+        rows = await db.call(
+            """
+            SELECT
+                id,
+                application_command_id,
+                context_command_id
+            FROM
+                templates
+            WHERE
+                application_command_id = $1
+            OR
+                context_command_id = $1
+            """,
+            command_id,
+        )
+        for r in rows:
+            cls._index_commands(
+                r["id"],
+                r["application_command_id"],
+                r["context_command_id"],
+            )
+        indexed = cls.command_index.get(command_id)
+        if indexed is None:
+            cls.unknown_command_cache.set(command_id, True)
+        return indexed
+
+    @classmethod
+    def get_cached_template_by_command_id(
+            cls,
+            command_id: int) -> Optional[Tuple[Template, bool]]:
+        """
+        Get the template that a given application command belongs to, as
+        well as whether or not the command is a context command, without
+        going to the database.
+
+        Parameters
+        -----------
+        command_id: :class:`int`
+            The ID of the application command.
+
+        Returns
+        --------
+        Optional[Tuple[:class:`cogs.utils.profiles.template.Template`, :class:`bool`]]
+            The template and whether the command is a context command, or
+            ``None`` if either the command or its template aren't cached.
+        """
+
+        indexed = cls.command_index.get(command_id)
+        if indexed is None:
+            return None
+        template_id, is_context_command = indexed
+        template = cls._get_from_cache(template_id)
+        if template is None:
+            return None
+        return template, is_context_command
+
+    @classmethod
+    def is_unknown_command(cls, command_id: int) -> bool:
+        """
+        Whether or not a given application command has recently been looked
+        up and found not to belong to any template.
+        """
+
+        return command_id in cls.unknown_command_cache
+
     @classmethod
     async def fetch_all_templates_for_guild(
             cls: Type[Template],
@@ -557,12 +885,85 @@ class Template:
                 await t.fetch_fields(db)
         return template_list
 
+    @classmethod
+    async def fetch_profile_counts(
+            cls,
+            db: vbu.Database,
+            guild_id: int,
+            *,
+            allow_deleted: bool = False) -> List[TemplateProfileCount]:
+        """
+        Get all the templates for a given guild alongside the number of
+        profiles that have been created for each of them. Fields are not
+        fetched.
+
+        Parameters
+        -----------
+        db: :class:`vbu.Database`
+            An active connection to the database.
+        guild_id: :class:`int`
+            The ID of the guild whose templates you want to count.
+
+        Returns
+        --------
+        List[:class:`cogs.utils.profiles.template.TemplateProfileCount`]
+            The templates and their profile counts.
+        """
+
+        extra = "" if allow_deleted else "AND templates.deleted = false"
+        rows = await db.call(
+            """
+            SELECT
+                templates.*,
+                COUNT(created_profiles.id) AS profile_count,
+                COUNT(created_profiles.id) FILTER (WHERE created_profiles.draft) AS draft_count,
+                COUNT(created_profiles.id) FILTER (WHERE created_profiles.verified) AS verified_count
+            FROM
+                templates
+            LEFT JOIN
+                created_profiles
+            ON
+                created_profiles.template_id = templates.id
+            AND
+                created_profiles.deleted = false
+            WHERE
+                templates.guild_id = $1
+            {0}
+            GROUP BY
+                templates.id
+            """.format(extra),
+            guild_id,
+        )
+        counts: List[TemplateProfileCount] = list()
+        for r in rows:
+            row = dict(r)
+            total = row.pop("profile_count")
+            draft = row.pop("draft_count")
+            verified = row.pop("verified_count")
+            counts.append(TemplateProfileCount(
+                template=cls(**row),
+                total=total,
+                draft=draft,
+                verified=verified,
+            ))
+        return counts
+
     async def fetch_fields(self, db: vbu.Database) -> Dict[str, Field]:
         """
         Fetch the fields for this template and store them in .all_fields.
         """
 
-        field_rows = await db.call(
+        field_rows = await self._fetch_field_rows(db, self.id)
+        self._add_field_rows(field_rows)
+        return self.all_fields
+
+    @staticmethod
+    async def _fetch_field_rows(db: vbu.Database, template_id: str) -> List[Any]:
+        """
+        Fetch the field rows for a given template ID.
+        """
+
+        return await db.call(
             """
             SELECT
                 *
@@ -571,13 +972,18 @@ class Template:
             WHERE
                 template_id = $1
             """,
-            self.id,
+            template_id,
         )
+
+    def _add_field_rows(self, field_rows: List[Any]) -> None:
+        """
+        Replace the template's fields with ones built from the given rows.
+        """
+
         self.all_fields.clear()
         for f in field_rows:
             field = Field(**f)
             self.all_fields[field.id] = field
-        return self.all_fields
 
     async def update(self, db: vbu.Database, **kwargs) -> Self:
         """
@@ -588,7 +994,7 @@ class Template:
 
         for i, o in kwargs.items():
             setattr(self, i, o)
-        await db.call(
+        rows = await db.call(
             """
             INSERT INTO
                 templates
@@ -638,7 +1044,10 @@ class Template:
                 context_command_id = $10,
                 deleted = $11,
                 archive_is_forum = $12,
-                user_manageable = $13
+                user_manageable = $13,
+                version = templates.version + 1
+            RETURNING
+                version
             """,
             self.id,
             self.name,
@@ -654,6 +1063,14 @@ class Template:
             self.archive_is_forum,
             self.user_manageable,
         )
+        if rows:
+            self.version = rows[0]["version"]
+        self.invalidate_cache(self.id)
+        self._index_commands(
+            self.id,
+            self.application_command_id,
+            self.context_command_id,
+        )
         return self
 
     @vbu.i18n("profile", 2, use_guild=True)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Generic, TypeVar, Union, Optional, Dict, List
+from typing import Any, ClassVar, Generic, TypeVar, Union, Optional, Dict, List, Iterable, Tuple
 from typing_extensions import Self
 import uuid
 import operator
+import json
 import re
 
 import discord
@@ -14,6 +15,7 @@ from .filled_field import FilledField
 from .field import Field
 from .field_type import ImageField
 from .command_processor import CommandProcessor
+from ..cache import TimedCache
 from ..utils import pad_field_prompt_value
 
 
@@ -51,6 +53,9 @@ class UserProfile(Generic[T]):
         archive or verification channel.
     template: Optional[:class:`cogs.utils.profiles.template.Template`]
         The template object associated with this profile.
+    content_version: :class:`int`
+        The version of the profile's content. This is incremented whenever
+        the profile's name or filled fields change.
 
     Attributes
     -----------
@@ -72,8 +77,20 @@ class UserProfile(Generic[T]):
         The template object associated with this profile.
     all_filled_fields: Dict[:class:`str`, :class:`cogs.utils.profiles.filled_field.FilledField`]
         The filled fields that are associated with this profile.
+    content_version: :class:`int`
+        The version of the profile's content. This is incremented whenever
+        the profile's name or filled fields change.
+    embed_cache: :class:`cogs.utils.cache.TimedCache`
+        A class-level cache of rendered profile embeds, keyed by the
+        profile's ID and content version, its template's ID and version,
+        the member's roles (where the template uses them), and the locale.
     """
 
+    embed_cache: ClassVar[TimedCache[Tuple[Any, ...], vbu.Embed]] = TimedCache(
+        max_size=1_000,
+        ttl=60 * 10,
+    )
+
     __slots__ = (
         "_id",
         "user_id",
@@ -86,6 +103,7 @@ class UserProfile(Generic[T]):
         "posted_channel_id",
         "deleted",
         "draft",
+        "content_version",
     )
 
     def __init__(
@@ -100,7 +118,8 @@ class UserProfile(Generic[T]):
             posted_channel_id: Optional[int] = None,
             template: T = None,
             deleted: bool = False,
-            draft: bool = True):
+            draft: bool = True,
+            content_version: int = 0):
         self._id = id
         self.user_id: int = user_id  # pyright: ignore
         self.name: Optional[str] = name
@@ -110,6 +129,7 @@ class UserProfile(Generic[T]):
         self.posted_channel_id = posted_channel_id
         self.deleted: bool = deleted
         self.draft: bool = draft  # Whether or not the profile has left the editing stage
+        self.content_version: int = content_version
         self.all_filled_fields: Dict[str, FilledField] = dict()
         self.template: T = template
 
@@ -186,6 +206,112 @@ class UserProfile(Generic[T]):
             return None
         return cls(**profile_rows[0])
 
+    @classmethod
+    async def fetch_hydrated(
+            cls,
+            db: vbu.Database,
+            profile_id: str,
+            *,
+            allow_deleted_template: bool = False) -> Optional[UserProfile]:
+        """
+        Fetch a profile alongside its template, the template's fields, and
+        the profile's filled fields, all in a single query.
+
+        Parameters
+        -----------
+        db: :class:`vbu.Database`
+            An active connection to the database.
+        profile_id: :class:`str`
+            The ID of the profile that you want to fetch.
+        allow_deleted_template: :class:`bool`
+            Whether or not a deleted template should still be attached to
+            the profile.
+
+        Returns
+        --------
+        Optional[:class:`cogs.utils.profiles.user_profile.UserProfile`]
+            The profile, or ``None`` if it does not exist. If the template
+            could not be found then ``.template`` will be ``None``.
+        """
+
+        # Get the profile with everything attached to it
+        extra = "" if allow_deleted_template else "AND templates.deleted = false"
+        rows = await db(
+            """
+            SELECT
+                created_profiles.*,
+                (
+                    SELECT
+                        ROW_TO_JSON(templates.*)::TEXT
+                    FROM
+                        templates
+                    WHERE
+                        templates.id = created_profiles.template_id
+                    {0}
+                ) AS hydrated_template,
+                (
+                    SELECT
+                        COALESCE(JSON_AGG(fields.*), '[]')::TEXT
+                    FROM
+                        fields
+                    WHERE
+                        fields.template_id = created_profiles.template_id
+                ) AS hydrated_fields,
+                (
+                    SELECT
+                        COALESCE(JSON_AGG(filled_fields.*), '[]')::TEXT
+                    FROM
+                        filled_fields
+                    WHERE
+                        filled_fields.profile_id = created_profiles.id
+                ) AS hydrated_filled_fields
+            FROM
+                created_profiles
+            WHERE
+                created_profiles.id = $1
+            """.format(extra),
+            profile_id,
+        )
+        if not rows:
+            return None
+        profile_row = dict(rows[0])
+        template_json = profile_row.pop("hydrated_template")
+        field_json = profile_row.pop("hydrated_fields")
+        filled_field_json = profile_row.pop("hydrated_filled_fields")
+        profile = cls(**profile_row)
+
+        # See if there's a template to attach
+        if template_json is None:
+            return profile
+        template = Template(**json.loads(template_json))
+        for f in json.loads(field_json or "[]"):
+            field = Field(**f)
+            template.all_fields[field.id] = field
+        profile.template = template  # pyright: ignore
+
+        # And add the filled fields
+        profile._add_filled_field_rows(json.loads(filled_field_json or "[]"))
+        return profile
+
+    def _add_filled_field_rows(self, field_rows) -> Dict[str, FilledField]:
+        """
+        Replace the filled fields for this profile with the given rows,
+        attaching the template's field object to each of them. Rows for
+        fields that aren't part of the template are ignored.
+        """
+
+        self.all_filled_fields.clear()
+        if self.template is None:
+            return self.all_filled_fields
+        for f in field_rows:
+            filled = FilledField(**f)
+            field = self.template.all_fields.get(filled.field_id)
+            if field is None:
+                continue
+            filled.field = field
+            self.all_filled_fields[filled.field_id] = filled
+        return self.all_filled_fields
+
     async def fetch_filled_fields(self, db) -> Dict[str, FilledField]:
         """
         Fetch the fields for this profile and store them in .all_filled_fields.
@@ -213,16 +339,69 @@ class UserProfile(Generic[T]):
             """,
             self.id, self.template.all_fields.keys(),
         )
-        self.all_filled_fields.clear()
 
-        # Add them to the cache
-        for f in field_rows:
-            filled = FilledField(**f)
-            filled.field = self.template.all_fields[filled.field_id]
-            self.all_filled_fields[filled.field_id] = filled
+        # Add them to the cache and return
+        return self._add_filled_field_rows(field_rows)
 
-        # And return
-        return self.all_filled_fields
+    @classmethod
+    async def fetch_filled_fields_bulk(
+            cls,
+            db: vbu.Database,
+            profiles: Iterable[UserProfile]) -> None:
+        """
+        Fetch the filled fields for multiple profiles at once and store them
+        in each profile's .all_filled_fields.
+
+        This runs one query for all of the profiles given, rather than one
+        per profile. Templates that are missing their fields will have them
+        fetched once per template object.
+
+        Parameters
+        -----------
+        db: :class:`vbu.Database`
+            An active connection to the database.
+        profiles: Iterable[:class:`cogs.utils.profiles.user_profile.UserProfile`]
+            The profiles that you want to populate.
+        """
+
+        # Make sure each of the templates has its fields
+        profiles = list(profiles)
+        checked_templates: set[int] = set()
+        for profile in profiles:
+            if profile.template is None:
+                await profile.fetch_template(db, fetch_fields=True)
+            if profile.template is None:
+                continue
+            if id(profile.template) in checked_templates:
+                continue
+            checked_templates.add(id(profile.template))
+            if len(profile.template.all_fields) == 0:
+                await profile.template.fetch_fields(db)
+
+        # Get all of the filled fields
+        if not profiles:
+            return
+        field_rows = await db(
+            """
+            SELECT
+                *
+            FROM
+                filled_fields
+            WHERE
+                profile_id = ANY($1::UUID[])
+            """,
+            [i.id for i in profiles],
+        )
+
+        # Group them by profile and add them to the cache
+        rows_by_profile: Dict[str, list] = {
+            i.id: []
+            for i in profiles
+        }
+        for row in field_rows:
+            rows_by_profile[str(row["profile_id"])].append(row)
+        for profile in profiles:
+            profile._add_filled_field_rows(rows_by_profile[profile.id])
 
     async def fetch_template(
             self,
@@ -309,14 +488,16 @@ class UserProfile(Generic[T]):
                 o.value is not None
         }
 
-    @vbu.i18n(__name__, 2, use_guild=True)
     def build_embed(
             self,
             bot: vbu.Bot,
             ctx: discord.Interaction | commands.Context | str,
             member: discord.Member | None = None) -> vbu.Embed:
         """
-        Converts the filled profile into an embed.
+        Converts the filled profile into an embed, reusing a previously
+        rendered embed if nothing that goes into it has changed. The random
+        colour (for templates without one) and the footer are picked again
+        each time.
         """
 
         # See if they're the right person
@@ -325,8 +506,75 @@ class UserProfile(Generic[T]):
         if member and not isinstance(member, discord.Member):
             raise ValueError("Invalid member object passed to build embed - not a guild member")
 
-        # Create the initial embed
-        embed = vbu.Embed(use_random_colour=True)
+        # See if we've already rendered it
+        key = self._get_embed_cache_key(ctx, member)
+        embed = None
+        if key is not None:
+            cached = self.embed_cache.get(key)
+            if cached is not None:
+                embed = cached.copy()
+
+        # Render and cache the embed
+        if embed is None:
+            embed = self._render_embed(bot, ctx, member)
+            if key is not None:
+                self.embed_cache.set(key, embed.copy())  # pyright: ignore
+
+        # Add the parts that change between renders
+        assert self.template
+        if not self.template.colour:
+            embed.use_random_colour()
+        bot.set_footer_from_config(embed)
+        return embed  # pyright: ignore
+
+    def _get_embed_cache_key(
+            self,
+            ctx: discord.Interaction | commands.Context | str,
+            member: discord.Member | None) -> Optional[Tuple[Any, ...]]:
+        """
+        Get the key that a rendered embed for this profile is cached under,
+        or ``None`` if it shouldn't be cached.
+        """
+
+        # Work out the locale that the embed will be rendered in
+        locale: Any
+        if isinstance(ctx, str):
+            locale = ctx
+        elif isinstance(ctx, discord.Interaction):
+            locale = (ctx.guild_locale, ctx.locale)
+        else:
+            return None
+
+        # Roles only matter if the template has command fields
+        template = self.template
+        if template is None:
+            return None
+        role_ids = None
+        if member is not None and any(f.is_command for f in template.field_list):
+            role_ids = frozenset(r.id for r in member.roles)
+
+        return (
+            self.id,
+            self.content_version,
+            template.id,
+            template.version,
+            role_ids,
+            locale,
+        )
+
+    @vbu.i18n(__name__, 2, use_guild=True)
+    def _render_embed(
+            self,
+            bot: vbu.Bot,
+            ctx: discord.Interaction | commands.Context | str,
+            member: discord.Member | None = None) -> vbu.Embed:
+        """
+        Render the filled profile into an embed.
+        """
+
+        # Create the initial embed; the random colour and footer are added
+        # by build_embed
+        embed = vbu.Embed()
         if self.template is None:
             raise AttributeError("Missing template field for user profile")
         embed.title = f"{self.template.display_name} | {self.display_name}"
@@ -395,9 +643,6 @@ class UserProfile(Generic[T]):
                     inline=len(field_value) <= 100,
                 )
 
-        # Add a footer to our embed
-        bot.set_footer_from_config(embed)
-
         # Return embed
         return embed
 
@@ -409,7 +654,7 @@ class UserProfile(Generic[T]):
 
         for i, o in kwargs.items():
             setattr(self, i, o)
-        await db.call(
+        rows = await db.call(
             """
             INSERT INTO
                 created_profiles
@@ -422,7 +667,8 @@ class UserProfile(Generic[T]):
                     posted_message_id,
                     posted_channel_id,
                     deleted,
-                    draft
+                    draft,
+                    content_version
                 )
             VALUES
                 (
@@ -434,7 +680,8 @@ class UserProfile(Generic[T]):
                     $6,
                     $7,
                     $8,
-                    $9
+                    $9,
+                    $10
                 )
             ON CONFLICT
                 (id)
@@ -447,7 +694,14 @@ class UserProfile(Generic[T]):
                 posted_message_id = $6,
                 posted_channel_id = $7,
                 deleted = $8,
-                draft = $9
+                draft = $9,
+                content_version = CASE
+                    WHEN created_profiles.name IS DISTINCT FROM $3
+                    THEN created_profiles.content_version + 1
+                    ELSE created_profiles.content_version
+                END
+            RETURNING
+                content_version
             """,
             self.id,
             self.user_id,
@@ -458,5 +712,98 @@ class UserProfile(Generic[T]):
             self.posted_channel_id,
             self.deleted,
             self.draft,
+            self.content_version,
         )
+        if rows:
+            self.content_version = rows[0]["content_version"]
         return self
+
+    async def insert_if_under_quota(
+            self,
+            db: vbu.Database,
+            max_profile_count: int) -> bool:
+        """
+        Insert the profile into the database as long as its user has fewer
+        than the given number of (non-deleted) profiles for its template.
+        The check and the insert are done atomically, so concurrent creates
+        can't go over the limit.
+
+        Parameters
+        -----------
+        db: :class:`vbu.Database`
+            An active connection to the database.
+        max_profile_count: :class:`int`
+            The maximum number of profiles that the user is allowed to have.
+
+        Returns
+        --------
+        :class:`bool`
+            Whether or not the profile was inserted.
+        """
+
+        async with db.transaction() as transaction:
+
+            # Lock on the user/template pair so that concurrent inserts
+            # wait for each other's counts
+            await transaction.call(
+                """
+                SELECT
+                    PG_ADVISORY_XACT_LOCK(HASHTEXT($1::TEXT || ' ' || $2::TEXT))
+                """,
+                self.template_id, self.user_id,
+            )
+
+            # Insert the profile if they're under the limit
+            rows = await transaction.call(
+                """
+                INSERT INTO
+                    created_profiles
+                    (
+                        id,
+                        user_id,
+                        name,
+                        template_id,
+                        verified,
+                        posted_message_id,
+                        posted_channel_id,
+                        deleted,
+                        draft
+                    )
+                SELECT
+                    $1,
+                    $2,
+                    $3,
+                    $4,
+                    $5,
+                    $6,
+                    $7,
+                    $8,
+                    $9
+                WHERE
+                    (
+                        SELECT
+                            COUNT(*)
+                        FROM
+                            created_profiles
+                        WHERE
+                            template_id = $4
+                        AND
+                            user_id = $2
+                        AND
+                            deleted = false
+                    ) < $10
+                RETURNING
+                    id
+                """,
+                self.id,
+                self.user_id,
+                self.name,
+                self.template_id,
+                self.verified,
+                self.posted_message_id,
+                self.posted_channel_id,
+                self.deleted,
+                self.draft,
+                max_profile_count,
+            )
+        return bool(rows)
@@ -1,4 +1,4 @@
-from typing import Any, Tuple
+from typing import Any, Dict, Tuple
 import random
 from urllib.parse import urlparse, parse_qs, urlencode
 import logging
@@ -6,8 +6,11 @@ import logging
 import discord
 from discord.ext import commands, vbu
 
+from .guild_settings import fetch_guild_settings
+
 
 __all__ = (
+    'application_command_ids',
     'mention_command',
     'compare_embeds',
     'get_animal_name',
@@ -19,6 +22,10 @@ __all__ = (
 log = logging.getLogger("embed_utils")
 
 
+# Top level command name -> global application command ID
+application_command_ids: Dict[str, int] = dict()
+
+
 def mention_command(command: commands.Command) -> str:
     """
     A function that returns a string that mentions a command.
@@ -26,6 +33,9 @@ def mention_command(command: commands.Command) -> str:
 
     command_id: int | None
     if (command_id := getattr(command, "id", None)) is None:
+        root_name = command.qualified_name.split(" ")[0]
+        command_id = application_command_ids.get(root_name)
+    if command_id is None:
         return f"/{command.qualified_name}"
     return f"</{command.qualified_name}:{command_id}>"
 
@@ -130,18 +140,8 @@ async def is_guild_advanced(db: vbu.Database, guild_id: int | None) -> bool:
 
     if guild_id is None:
         return False
-    rows = await db.call(
-        """
-        SELECT
-            advanced
-        FROM
-            guild_settings
-        WHERE
-            guild_id = $1
-        """,
-        guild_id,
-    )
-    return bool(rows[0]["advanced"]) if rows else False
+    settings = await fetch_guild_settings(db, guild_id, use_defaults=False)
+    return bool(settings["advanced"]) if settings else False
 
 
 def pad_field_prompt_value(
@@ -1,16 +1,63 @@
 import uuid
 
 import string
+import struct
 
 
 __all__ = (
     'encode',
     'decode',
     'check',
+    'pack',
+    'unpack',
 )
 
 
 ALPHABET = string.digits + string.ascii_letters
+BASE = len(ALPHABET)
+
+# The number of characters in an encoded UUID; 62 ** 22 > 2 ** 128
+WIDTH = 22
+
+# Lookup tables for pairs of characters, least significant first
+_PAIR_BASE = BASE * BASE
+_ENCODE_PAIRS = tuple(
+    ALPHABET[i % BASE] + ALPHABET[i // BASE]
+    for i in range(_PAIR_BASE)
+)
+_DECODE_PAIRS = {
+    pair: index
+    for index, pair in enumerate(_ENCODE_PAIRS)
+}
+
+# Lookup tables for encoding a UUID a byte at a time, most significant byte
+# first. Each entry holds the base 3844 digits of that byte's value at that
+# position, one digit to each 16 bit lane, so that adding together the
+# entries for every byte adds up every digit at once. Each lane then holds
+# less than 16 * 3844, which _CARRY splits into a carry and a pair of
+# characters.
+_LANES = struct.Struct(f"<{WIDTH // 2}H")
+
+
+def _to_lanes(value: int) -> int:
+    lanes = 0
+    for shift in range(0, 16 * _LANES.size // 2, 16):
+        value, rem = divmod(value, _PAIR_BASE)
+        lanes |= rem << shift
+    return lanes
+
+
+_BYTE_LANES = tuple(
+    tuple(
+        _to_lanes(byte << (8 * position))
+        for byte in range(256)
+    )
+    for position in reversed(range(16))
+)
+_CARRY = tuple(
+    (total // _PAIR_BASE, _ENCODE_PAIRS[total % _PAIR_BASE])
+    for total in range(16 * _PAIR_BASE)
+)
 
 
 def check(possible_uuid: str) -> bool:
@@ -26,22 +73,103 @@ def check(possible_uuid: str) -> bool:
         return True
 
 
+def _decode_int(encoded: str) -> int:
+    if len(encoded) % 2:
+        encoded += ALPHABET[0]
+    working = 0
+    try:
+        for idx in range(len(encoded) - 2, -1, -2):
+            working = working * _PAIR_BASE + _DECODE_PAIRS[encoded[idx:idx + 2]]
+    except KeyError:
+        raise ValueError("Invalid character in encoded string.")
+    return working
+
+
 def encode(decoded: uuid.UUID | str) -> str:
+    """
+    Encode a UUID into a fixed width base 62 string, least significant digit
+    first. Strings from older, unpadded versions of this function still
+    decode to the same UUID.
+    """
+
     if isinstance(decoded, str):
         decoded = uuid.UUID(decoded)
-    working = decoded.int
-    encoded = ""
-    while working:
-        working, rem = divmod(working, len(ALPHABET))
-        encoded += ALPHABET[rem]
-    return encoded
+    total = 0
+    for table, byte in zip(_BYTE_LANES, decoded.bytes):
+        total += table[byte]
+    parts = []
+    carry = 0
+    for lane in _LANES.unpack(total.to_bytes(_LANES.size, "little")):
+        carry, pair = _CARRY[lane + carry]
+        parts.append(pair)
+    return "".join(parts)
 
 
 def decode(encoded: str) -> str:
-    working = 0
-    for idx, i in enumerate(encoded):
-        working += ALPHABET.index(i) * (len(ALPHABET) ** idx)
-    return str(uuid.UUID(int=working))
+    """
+    Decode a string made by :func:`encode` back into a UUID string.
+    """
+
+    return str(uuid.UUID(int=_decode_int(encoded)))
+
+
+def pack(*values: uuid.UUID | str | int) -> str:
+    """
+    Pack any number of UUIDs and non-negative integers into a single string
+    with no spaces, for use in custom IDs. UUIDs take 22 characters each,
+    and integers take one character more than their number of digits.
+    """
+
+    output = []
+    for value in values:
+        if isinstance(value, int):
+            if value < 0:
+                raise ValueError("Only non-negative integers can be packed.")
+            digits = ""
+            while value:
+                value, rem = divmod(value, BASE)
+                digits += ALPHABET[rem]
+            output.append(ALPHABET[len(digits)] + digits)
+        else:
+            output.append(encode(value))
+    return "".join(output)
+
+
+def unpack(packed: str, layout: str) -> list[str | int]:
+    """
+    Unpack a string made by :func:`pack`. The layout gives the type of each
+    packed value in order; ``u`` for a UUID and ``i`` for an integer.
+
+    Examples
+    ---------
+    >>> unpack(pack(profile.id, profile.content_version), "ui")
+    ['...', 3]
+    """
+
+    output: list[str | int] = []
+    position = 0
+    try:
+        for kind in layout:
+            if kind == "u":
+                encoded = packed[position:position + WIDTH]
+                if len(encoded) != WIDTH:
+                    raise ValueError("Packed string is too short.")
+                output.append(decode(encoded))
+                position += WIDTH
+            elif kind == "i":
+                length = ALPHABET.index(packed[position])
+                encoded = packed[position + 1:position + 1 + length]
+                if len(encoded) != length:
+                    raise ValueError("Packed string is too short.")
+                output.append(_decode_int(encoded))
+                position += 1 + length
+            else:
+                raise ValueError(f"Invalid layout character {kind!r}.")
+    except IndexError:
+        raise ValueError("Packed string is too short.")
+    if position != len(packed):
+        raise ValueError("Packed string is too long.")
+    return output
 
 
 if __name__ == "__main__":
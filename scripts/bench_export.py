@@ -0,0 +1,140 @@
+"""
+Benchmarks each of the profile export formats in
+``cogs/utils/profiles/export.py`` on a large synthetic template, reporting
+the size of each export (before and after gzip) and how many rows per second
+are written.
+
+Usage::
+
+    python scripts/bench_export.py [--profiles N] [--fields N]
+"""
+
+from typing import Any, Dict, List
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cogs import utils  # noqa: E402
+from cogs.utils.profiles import export  # noqa: E402
+
+
+def make_template(field_count: int) -> utils.Template:
+    """
+    Make a template with the given number of fields. Some of the field names
+    are shared and one is empty, as they can be in real templates.
+    """
+
+    template = utils.Template(id=uuid.uuid4(), name="bench", guild_id=1)
+    for index in range(field_count):
+        name = ["Name", "Age", "Bio", ""][index] if index < 4 else f"Field {index % 6}"
+        field = utils.Field(
+            id=uuid.uuid4(),
+            name=name,
+            index=index,
+            prompt=name,
+            template_id=template.id,
+        )
+        template.all_fields[field.id] = field
+    return template
+
+
+def make_rows(template: utils.Template, count: int) -> List[Dict[str, Any]]:
+    """
+    Make synthetic profile rows in the shape given by
+    :func:`cogs.utils.profiles.export.iter_export_rows`.
+    """
+
+    rng = random.Random(2024)
+    words = [
+        "dragon", "knight", "forest", "tavern", "silver", "shadow", "river",
+        "storm", "ember", "crown", "wolf", "lantern", "ğüş", "星", "🐉",
+    ]
+    fields = template.field_list
+    rows = []
+    for index in range(count):
+        filled_fields = {}
+        for f in fields:
+            if rng.random() < 0.1:
+                continue  # Not filled in
+            if f.index % 3 == 1:
+                filled_fields[f.id] = str(rng.randint(1, 1_000))
+            else:
+                filled_fields[f.id] = " ".join(
+                    rng.choice(words)
+                    for _ in range(rng.randint(1, 40))
+                )
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "user_id": str(rng.randint(10 ** 17, 10 ** 18)),
+            "name": f"profile {index}",
+            "draft": False,
+            "verified": rng.random() < 0.5,
+            "filled_fields": filled_fields,
+        })
+    return rows
+
+
+def write(writer_cls, template, rows, text: io.TextIOBase) -> float:
+    """
+    Write every row with the given writer, returning the time taken.
+    """
+
+    start = time.perf_counter()
+    writer = writer_cls(text, template)
+    writer.start()
+    for r in rows:
+        writer.write_row(r)
+    writer.finish()
+    text.flush()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=50_000, help="The number of profiles to export.")
+    parser.add_argument("--fields", type=int, default=10, help="The number of fields in the template.")
+    args = parser.parse_args()
+
+    template = make_template(args.fields)
+    rows = make_rows(template, args.profiles)
+
+    print(f"{args.profiles} profiles, {args.fields} fields")
+    print(f"{'':<10}{'raw':>12}{'gzipped':>12}{'ratio':>8}{'raw rows/s':>14}{'gzip rows/s':>14}")
+    for name, writer_cls in export.EXPORT_WRITERS.items():
+
+        # Uncompressed
+        with tempfile.TemporaryFile() as output:
+            text = io.TextIOWrapper(output, encoding="utf-8", newline="")
+            raw_time = write(writer_cls, template, rows, text)
+            raw_size = output.seek(0, io.SEEK_END)
+            text.detach()
+
+        # Through the same gzip wrapper as export_template
+        with tempfile.TemporaryFile() as output:
+            start = time.perf_counter()
+            with export.open_compressed_text(output) as text:
+                write(writer_cls, template, rows, text)
+            gzip_time = time.perf_counter() - start
+            gzip_size = output.seek(0, io.SEEK_END)
+
+        print(
+            f"{name:<10}"
+            f"{raw_size / 1_000_000:>9.2f} MB"
+            f"{gzip_size / 1_000_000:>9.2f} MB"
+            f"{raw_size / gzip_size:>7.1f}x"
+            f"{len(rows) / raw_time:>14,.0f}"
+            f"{len(rows) / gzip_time:>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
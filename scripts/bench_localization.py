@@ -0,0 +1,165 @@
+"""
+Benchmarks how long it takes to build command localizations, comparing the
+working tree against an older revision (by default, the parent of the commit
+that added ``cogs/utils/localization.py``, before command localizations were
+built from a table).
+
+Two things are measured for each tree, each in a fresh interpreter:
+
+* The time taken to import every cog, which builds the localizations in the
+  ``ApplicationCommandMeta`` blocks.
+* The time taken by ``TemplateEdit.get_profile_application_command``, which is
+  called for every template command that's made or synced.
+
+Usage::
+
+    python scripts/bench_localization.py [--before REVISION] [--repeat N]
+"""
+
+from typing import Dict
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOCALIZATION_MODULE = "cogs/utils/localization.py"
+
+# Run inside the tree being measured; prints its timings as JSON
+MEASURE = """
+import glob
+import importlib
+import json
+import os
+import sys
+import time
+
+repeat = int(sys.argv[1])
+
+start = time.perf_counter()
+import discord
+from discord.ext import vbu
+dependencies = time.perf_counter() - start
+
+start = time.perf_counter()
+for path in sorted(glob.glob("cogs/[!_]*.py")):
+    importlib.import_module("cogs." + os.path.basename(path)[:-3])
+cog_import = time.perf_counter() - start
+
+from cogs.template_edit import TemplateEdit
+
+start = time.perf_counter()
+TemplateEdit.get_profile_application_command("character")
+first_build = time.perf_counter() - start
+
+start = time.perf_counter()
+for i in range(repeat):
+    TemplateEdit.get_profile_application_command(f"character{i}")
+build = (time.perf_counter() - start) / repeat
+
+print(json.dumps({
+    "cog_import": cog_import,
+    "first_build": first_build,
+    "build": build,
+}))
+"""
+
+
+def get_default_before() -> str:
+    """
+    Get the revision before the localization table was added, looked up by
+    the commit that added its module so that it survives a rebase.
+    """
+
+    result = subprocess.run(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--", LOCALIZATION_MODULE],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    commits = result.stdout.split()
+    if not commits:
+        raise SystemExit(
+            f"Couldn't find the commit that added {LOCALIZATION_MODULE}; "
+            "pass --before instead."
+        )
+    return commits[-1] + "^"
+
+
+def export_revision(revision: str, directory: str) -> None:
+    """
+    Write the files of a git revision into a directory.
+    """
+
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", revision],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+    ).stdout
+    with tempfile.TemporaryFile() as fp:
+        fp.write(archive)
+        fp.seek(0)
+        with tarfile.open(fileobj=fp) as tar:
+            tar.extractall(directory)
+
+
+def measure(directory: str, repeat: int) -> Dict[str, float]:
+    """
+    Time the imports and command builds for the tree in a directory.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE, str(repeat)],
+        cwd=directory,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--before",
+        help=(
+            "The git revision to compare against. Defaults to the parent "
+            f"of the commit that added {LOCALIZATION_MODULE}."
+        ),
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=200,
+        help="The number of commands to build.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        export_revision(args.before or get_default_before(), directory)
+        before = measure(directory, args.repeat)
+    after = measure(ROOT, args.repeat)
+
+    rows = [
+        ("cog import", "cog_import", 1_000, "ms"),
+        ("first command build", "first_build", 1_000, "ms"),
+        ("command build", "build", 1_000_000, "us"),
+    ]
+    print(f"{'':<22}{'before':>12}{'after':>12}{'speedup':>10}")
+    for label, key, scale, unit in rows:
+        print(
+            f"{label:<22}"
+            f"{before[key] * scale:>9.2f} {unit}"
+            f"{after[key] * scale:>9.2f} {unit}"
+            f"{before[key] / after[key]:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
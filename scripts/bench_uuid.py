@@ -0,0 +1,97 @@
+"""
+Micro-benchmarks the custom ID codec in ``cogs/utils/uuid_.py`` against the
+unpadded encoder that it replaced.
+
+Usage::
+
+    python scripts/bench_uuid.py [--count N] [--repeat N]
+"""
+
+from typing import Callable, List
+import argparse
+import importlib.util
+import os
+import string
+import timeit
+import uuid
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OLD_ALPHABET = string.digits + string.ascii_letters
+
+
+def old_encode(decoded: uuid.UUID | str) -> str:
+    if isinstance(decoded, str):
+        decoded = uuid.UUID(decoded)
+    working = decoded.int
+    encoded = ""
+    while working:
+        working, rem = divmod(working, len(OLD_ALPHABET))
+        encoded += OLD_ALPHABET[rem]
+    return encoded
+
+
+def old_decode(encoded: str) -> str:
+    working = 0
+    for idx, i in enumerate(encoded):
+        working += OLD_ALPHABET.index(i) * (len(OLD_ALPHABET) ** idx)
+    return str(uuid.UUID(int=working))
+
+
+def load_codec():
+    """
+    Load the codec straight from its file, so that the bot's dependencies
+    don't need to be importable.
+    """
+
+    path = os.path.join(ROOT, "cogs", "utils", "uuid_.py")
+    spec = importlib.util.spec_from_file_location("uuid_", path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_per_call(func: Callable, values: List, repeat: int) -> float:
+    """
+    The best time (in microseconds) for one call of a function.
+    """
+
+    timer = timeit.Timer(lambda: [func(i) for i in values])
+    return min(timer.repeat(repeat=repeat, number=1)) / len(values) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000, help="The number of UUIDs to use.")
+    parser.add_argument("--repeat", type=int, default=20, help="The number of timing runs.")
+    args = parser.parse_args()
+
+    codec = load_codec()
+    values = [uuid.uuid4() for _ in range(args.count)]
+    old_encoded = [old_encode(i) for i in values]
+    new_encoded = [codec.encode(i) for i in values]
+    versions = [(i, i.int % 1_000) for i in values]
+    packed = [codec.pack(*i) for i in versions]
+
+    rows = [
+        ("encode", time_per_call(old_encode, values, args.repeat), time_per_call(codec.encode, values, args.repeat)),
+        ("decode", time_per_call(old_decode, old_encoded, args.repeat), time_per_call(codec.decode, new_encoded, args.repeat)),
+        (
+            "id + version",
+            time_per_call(lambda i: f"{old_encode(i[0])} {i[1]}", versions, args.repeat),
+            time_per_call(lambda i: codec.pack(*i), versions, args.repeat),
+        ),
+        (
+            "unpack id + version",
+            time_per_call(lambda i: (old_decode(i[0]), int(i[1])), [(e, v) for e, (_, v) in zip(old_encoded, versions)], args.repeat),
+            time_per_call(lambda i: codec.unpack(i, "ui"), packed, args.repeat),
+        ),
+    ]
+    print(f"{'':<22}{'old':>12}{'new':>12}{'speedup':>10}")
+    for label, old, new in rows:
+        print(f"{label:<22}{old:>9.2f} us{new:>9.2f} us{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
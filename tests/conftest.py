@@ -0,0 +1,187 @@
+"""
+Shared fixtures for the test suite.
+
+Tests that need a database run against a real Postgres server, given as a DSN
+in the ``PROFILE_TEST_DATABASE`` environment variable, eg
+``postgresql://postgres@127.0.0.1:5432/postgres``. A throwaway database is
+made on that server for the test session, loaded with
+``config/database.pgsql``, and dropped again afterwards. Database tests are
+skipped if the variable isn't set.
+"""
+
+from typing import Any, AsyncIterator, Dict, List
+from urllib.parse import urlparse
+import asyncio
+import contextlib
+import os
+import random
+import uuid
+
+import pytest
+
+
+DATABASE_ENV = "PROFILE_TEST_DATABASE"
+SCHEMA_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "config",
+    "database.pgsql",
+)
+
+
+async def _create_database(dsn: str, name: str) -> None:
+    import asyncpg
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute(f'CREATE DATABASE "{name}"')
+    finally:
+        await conn.close()
+    conn = await asyncpg.connect(dsn, database=name)
+    try:
+        schema = open(SCHEMA_FILE).read()
+        try:
+            await conn.execute(schema)
+        except asyncpg.FeatureNotSupportedError:
+            # Some Postgres builds don't ship uuid-ossp; gen_random_uuid does
+            # the same job and is built in from Postgres 13
+            await conn.execute(
+                """
+                CREATE FUNCTION uuid_generate_v4() RETURNS UUID
+                AS 'SELECT gen_random_uuid()' LANGUAGE SQL
+                """
+            )
+            await conn.execute(schema.replace(
+                'CREATE EXTENSION IF NOT EXISTS "uuid-ossp";',
+                '',
+            ))
+    finally:
+        await conn.close()
+
+
+async def _drop_database(dsn: str, name: str) -> None:
+    import asyncpg
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+    finally:
+        await conn.close()
+
+
+@pytest.fixture(scope="session")
+def database_dsn():
+    """
+    The DSN of a freshly made database with the bot's schema loaded.
+    """
+
+    dsn = os.environ.get(DATABASE_ENV)
+    if not dsn:
+        pytest.skip(f"Set {DATABASE_ENV} to a Postgres DSN to run database tests.")
+    pytest.importorskip("asyncpg")
+    name = f"profile_test_{uuid.uuid4().hex[:12]}"
+    asyncio.run(_create_database(dsn, name))
+    parsed = urlparse(dsn)
+    try:
+        yield parsed._replace(path=f"/{name}").geturl()
+    finally:
+        asyncio.run(_drop_database(dsn, name))
+
+
+@pytest.fixture(scope="session")
+def database_config(database_dsn) -> Dict[str, Any]:
+    """
+    The test database as a ``vbu.Database.create_pool`` config.
+    """
+
+    parsed = urlparse(database_dsn)
+    return {
+        "type": "postgres",
+        "host": parsed.hostname or "127.0.0.1",
+        "port": parsed.port or 5432,
+        "database": parsed.path.lstrip("/"),
+        "user": parsed.username or "postgres",
+        "password": parsed.password or "",
+    }
+
+
+@contextlib.asynccontextmanager
+async def database_pool(config: Dict[str, Any]) -> AsyncIterator[None]:
+    """
+    Open the ``vbu.Database`` pool for the running event loop, closing it
+    again on exit.
+    """
+
+    from discord.ext import vbu
+    await vbu.Database.create_pool(config)  # pyright: ignore
+    try:
+        yield
+    finally:
+        await vbu.Database.pool.close()  # pyright: ignore
+
+
+async def seed_template(
+        conn,
+        *,
+        guild_id: int,
+        profile_count: int,
+        field_count: int = 3) -> Dict[str, Any]:
+    """
+    Add a template to the database with the given number of fields, and the
+    given number of profiles with every field filled in.
+
+    Returns
+    --------
+    Dict[:class:`str`, Any]
+        The template ID, field IDs, and profile IDs that were made.
+    """
+
+    template_id = await conn.fetchval(
+        """
+        INSERT INTO templates (name, guild_id, application_command_id)
+        VALUES ($1, $2, $3)
+        RETURNING id
+        """,
+        f"template {uuid.uuid4().hex[:8]}",
+        guild_id,
+        random.randint(10 ** 17, 10 ** 18),
+    )
+    field_ids: List[uuid.UUID] = [
+        await conn.fetchval(
+            """
+            INSERT INTO fields (name, index, prompt, template_id)
+            VALUES ($1, $2, $3, $4)
+            RETURNING id
+            """,
+            f"field {i}", i, f"prompt {i}", template_id,
+        )
+        for i in range(field_count)
+    ]
+    profile_rows = await conn.fetch(
+        """
+        INSERT INTO created_profiles (user_id, name, template_id)
+        SELECT
+            (1000 + i)::BIGINT,
+            'profile ' || i,
+            $1
+        FROM
+            GENERATE_SERIES(1, $2) AS i
+        RETURNING id
+        """,
+        template_id, profile_count,
+    )
+    profile_ids = [i["id"] for i in profile_rows]
+    await conn.execute(
+        """
+        INSERT INTO filled_fields (profile_id, field_id, value)
+        SELECT
+            p, f, 'value'
+        FROM
+            UNNEST($1::UUID[]) AS p
+        CROSS JOIN
+            UNNEST($2::UUID[]) AS f
+        """,
+        profile_ids, field_ids,
+    )
+    return {
+        "template_id": template_id,
+        "field_ids": field_ids,
+        "profile_ids": profile_ids,
+    }
@@ -0,0 +1,78 @@
+"""
+Checks that loading every profile for a template costs the same number of
+queries however many profiles there are.
+"""
+
+import asyncio
+
+import pytest
+
+from conftest import database_pool, seed_template
+
+pytest.importorskip("discord.ext.vbu")
+pytest.importorskip("asyncpg")
+
+from discord.ext import vbu  # noqa: E402
+import asyncpg  # noqa: E402
+
+from cogs import utils  # noqa: E402
+
+
+PROFILE_COUNTS = (1, 10, 250)
+
+
+async def _count_queries(config, monkeypatch, template_id) -> int:
+    calls = []
+    original_call = vbu.Database.call
+
+    async def counting_call(self, sql, *args, **kwargs):
+        calls.append(sql)
+        return await original_call(self, sql, *args, **kwargs)
+
+    monkeypatch.setattr(vbu.Database, "call", counting_call)
+    try:
+        async with database_pool(config):
+            async with vbu.Database() as db:
+                utils.Template.invalidate_cache(str(template_id))
+                template = await utils.Template.fetch_template_by_id(
+                    db,
+                    template_id,
+                )
+                assert template
+                calls.clear()
+                profiles = await template.fetch_all_profiles(db)
+    finally:
+        monkeypatch.setattr(vbu.Database, "call", original_call)
+    for profile in profiles:
+        assert len(profile.all_filled_fields) == len(template.all_fields)
+    return len(calls)
+
+
+def test_fetch_all_profiles_query_count_is_constant(
+        database_dsn,
+        database_config,
+        monkeypatch):
+    """
+    The number of queries for ``Template.fetch_all_profiles`` shouldn't grow
+    with the number of profiles on the template.
+    """
+
+    async def seed():
+        conn = await asyncpg.connect(database_dsn)
+        try:
+            return [
+                await seed_template(conn, guild_id=1, profile_count=count)
+                for count in PROFILE_COUNTS
+            ]
+        finally:
+            await conn.close()
+
+    seeded = asyncio.run(seed())
+    query_counts = [
+        asyncio.run(_count_queries(database_config, monkeypatch, i["template_id"]))
+        for i in seeded
+    ]
+    for count, queries in zip(PROFILE_COUNTS, query_counts):
+        print(f"{count} profiles: {queries} queries")
+    assert len(set(query_counts)) == 1, query_counts
+    assert query_counts[0] <= 2, query_counts
@@ -0,0 +1,68 @@
+"""
+Checks that getting command values for many members at once gives the same
+results as getting them one member at a time.
+"""
+
+import types
+
+import pytest
+
+pytest.importorskip("discord.ext.vbu")
+
+from cogs import utils  # noqa: E402
+
+
+def member(*role_ids: int) -> types.SimpleNamespace:
+    return types.SimpleNamespace(role_ids=list(role_ids))
+
+
+MEMBERS = [
+    member(),
+    member(1),
+    member(2),
+    member(2, 1),
+    member(3, 4),
+]
+
+
+def get_value(text, m):
+    try:
+        return utils.CommandProcessor.get_value(text, m)
+    except ValueError:
+        return ValueError
+
+
+@pytest.mark.parametrize("text", [
+    "not a command",
+    "{{ invalid }}",
+    '{{ DEFAULT "default" }}',
+    '{{ HASROLE "1" "one" HASROLE "2" "two" DEFAULT "default" }}',
+    '{{ HASROLE "2" "two" HASROLE "1" "one" HASROLE "2" "again" DEFAULT "default" }}',
+])
+def test_values_match(text):
+    expected = [get_value(text, m) for m in MEMBERS]
+    assert ValueError not in expected
+    assert utils.CommandProcessor.get_values(text, MEMBERS) == expected
+
+
+def test_invalid_role():
+    text = '{{ HASROLE "1" "one" HASROLE "abc" "x" DEFAULT "default" }}'
+    matched = [member(1), member(1, 2)]
+    expected = [get_value(text, m) for m in matched]
+    assert expected == ["one", "one"]
+    assert utils.CommandProcessor.get_values(text, matched) == expected
+
+    assert get_value(text, member(2)) is ValueError
+    with pytest.raises(ValueError):
+        utils.CommandProcessor.get_values(text, [*matched, member(2)])
+
+
+def test_missing_member():
+    text = '{{ HASROLE "1" "one" DEFAULT "default" }}'
+    assert get_value(text, None) is ValueError
+    with pytest.raises(ValueError):
+        utils.CommandProcessor.get_values(text, [member(1), None])
+
+    text = '{{ DEFAULT "default" }}'
+    assert get_value(text, None) == "default"
+    assert utils.CommandProcessor.get_values(text, [None, member(1)]) == ["default", "default"]
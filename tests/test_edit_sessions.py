@@ -0,0 +1,103 @@
+"""
+Checks that profile edit sessions are closed when their template changes,
+and that the session indexes don't hold on to sessions that have left the
+cache.
+"""
+
+import time
+import uuid
+
+import pytest
+
+pytest.importorskip("discord.ext.vbu")
+
+from cogs import utils  # noqa: E402
+from cogs.utils import edit_sessions  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clear_sessions(monkeypatch):
+    monkeypatch.setattr(
+        edit_sessions,
+        "edit_session_cache",
+        utils.TimedCache(max_size=3, ttl=60),
+    )
+    monkeypatch.setattr(edit_sessions, "_session_users", dict())
+    monkeypatch.setattr(edit_sessions, "_template_profiles", dict())
+    monkeypatch.setattr(edit_sessions, "_profile_templates", dict())
+
+
+def make_profile(template: utils.Template) -> utils.UserProfile:
+    return utils.UserProfile(
+        id=uuid.uuid4(),
+        user_id=1,
+        template_id=template.id,
+        template=template,
+    )
+
+
+def make_template() -> utils.Template:
+    return utils.Template(id=uuid.uuid4(), name="test", guild_id=1)
+
+
+def assert_indexes_empty():
+    assert not edit_sessions._session_users
+    assert not edit_sessions._template_profiles
+    assert not edit_sessions._profile_templates
+
+
+def test_template_invalidation_ends_sessions():
+    template = make_template()
+    other_template = make_template()
+    profiles = [make_profile(template) for _ in range(2)]
+    other = make_profile(other_template)
+    for profile in profiles:
+        utils.start_edit_session(profile, 1)
+        utils.start_edit_session(profile, 2)
+    utils.start_edit_session(other, 1)
+
+    utils.Template.invalidate_cache(template.id)
+    for profile in profiles:
+        assert utils.get_edit_session(profile.id, 1) is None
+        assert utils.get_edit_session(profile.id, 2) is None
+    assert utils.get_edit_session(other.id, 1) is other
+
+    utils.end_edit_sessions(other.id)
+    assert_indexes_empty()
+
+
+def test_end_keeps_one_user():
+    template = make_template()
+    profile = make_profile(template)
+    utils.start_edit_session(profile, 1)
+    utils.start_edit_session(profile, 2)
+    utils.end_edit_sessions(profile.id, keep_user_id=1)
+    assert utils.get_edit_session(profile.id, 1) is profile
+    assert utils.get_edit_session(profile.id, 2) is None
+    assert edit_sessions._session_users == {profile.id: {1}}
+
+    utils.end_template_edit_sessions(template.id)
+    assert utils.get_edit_session(profile.id, 1) is None
+    assert_indexes_empty()
+
+
+def test_evicted_sessions_are_forgotten():
+    template = make_template()
+    profiles = [make_profile(template) for _ in range(10)]
+    for profile in profiles:
+        utils.start_edit_session(profile, 1)
+    assert set(edit_sessions._session_users) == {i.id for i in profiles[-3:]}
+    assert edit_sessions._template_profiles[template.id] == {i.id for i in profiles[-3:]}
+
+    utils.end_template_edit_sessions(template.id)
+    assert_indexes_empty()
+
+
+def test_expired_sessions_are_forgotten(monkeypatch):
+    template = make_template()
+    profile = make_profile(template)
+    utils.start_edit_session(profile, 1)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 120)
+    assert utils.get_edit_session(profile.id, 1) is None
+    assert_indexes_empty()
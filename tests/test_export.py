@@ -0,0 +1,111 @@
+"""
+Checks that every export format keeps the data for fields that share a name
+(or have no name) separate.
+"""
+
+import csv
+import io
+import json
+import uuid
+
+import pytest
+
+pytest.importorskip("discord.ext.vbu")
+
+from cogs import utils  # noqa: E402
+from cogs.utils.profiles import export  # noqa: E402
+
+
+def make_template() -> utils.Template:
+    template = utils.Template(
+        id=uuid.uuid4(),
+        name="test",
+        guild_id=1,
+    )
+    for index, name in enumerate(["Name", "Name", "", "Age"]):
+        field = utils.Field(
+            id=uuid.uuid4(),
+            name=name,
+            index=index,
+            prompt=name,
+            template_id=template.id,
+        )
+        template.all_fields[field.id] = field
+    return template
+
+
+def make_rows(template: utils.Template):
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": str(1000 + i),
+            "name": f"profile {i}",
+            "draft": False,
+            "verified": True,
+            "filled_fields": {
+                f.id: f"{i} {f.index}"
+                for f in template.field_list
+            },
+        }
+        for i in range(3)
+    ]
+
+
+def write(writer_cls, template, rows) -> str:
+    fp = io.StringIO()
+    writer = writer_cls(fp, template)
+    writer.start()
+    for r in rows:
+        writer.write_row(r)
+    writer.finish()
+    return fp.getvalue()
+
+
+def test_field_labels_are_unique():
+    template = make_template()
+    writer = export.CSVExportWriter(io.StringIO(), template)
+    labels = list(writer.field_labels.values())
+    assert len(set(labels)) == len(labels)
+    assert "Age" in labels
+    assert all(i for i in labels)
+
+
+def test_json_keeps_every_field():
+    template = make_template()
+    rows = make_rows(template)
+    data = json.loads(write(export.JSONExportWriter, template, rows))
+    assert [i["id"] for i in data["fields"]] == [f.id for f in template.field_list]
+    assert [i["name"] for i in data["fields"]] == ["Name", "Name", "", "Age"]
+    for row, profile in zip(rows, data["profiles"]):
+        assert profile["fields"] == row["filled_fields"]
+
+
+def test_ndjson_keeps_every_field():
+    template = make_template()
+    rows = make_rows(template)
+    lines = write(export.NDJSONExportWriter, template, rows).splitlines()
+    schema = json.loads(lines[0])
+    assert [i["id"] for i in schema["fields"]] == [f.id for f in template.field_list]
+    for row, line in zip(rows, lines[1:]):
+        assert json.loads(line)["fields"] == row["filled_fields"]
+
+
+def test_csv_keeps_every_field():
+    template = make_template()
+    rows = make_rows(template)
+    reader = csv.reader(io.StringIO(write(export.CSVExportWriter, template, rows)))
+    header, *body = list(reader)
+    field_headers = header[5:]
+    assert len(set(field_headers)) == len(template.field_list)
+    for row, line in zip(rows, body):
+        assert line[5:] == [row["filled_fields"][f.id] for f in template.field_list]
+
+
+def test_columnar_keeps_every_field():
+    template = make_template()
+    rows = make_rows(template)
+    data = json.loads(write(export.ColumnarJSONExportWriter, template, rows))
+    assert [i["id"] for i in data["field_schema"]] == [f.id for f in template.field_list]
+    assert list(data["fields"]) == [f.id for f in template.field_list]
+    for f in template.field_list:
+        assert data["fields"][f.id] == [r["filled_fields"][f.id] for r in rows]
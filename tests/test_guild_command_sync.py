@@ -0,0 +1,255 @@
+"""
+Checks that syncing a guild's template commands doesn't touch the commands
+in the guild that don't belong to templates.
+"""
+
+from typing import Dict, List, Optional
+import asyncio
+import itertools
+
+import pytest
+
+from conftest import database_pool
+
+pytest.importorskip("discord.ext.vbu")
+asyncpg = pytest.importorskip("asyncpg")
+
+import discord  # noqa: E402
+from discord.ext import commands, vbu  # noqa: E402
+
+from cogs.template_edit import TemplateEdit  # noqa: E402
+
+
+COMMAND_IDS = itertools.count(10 ** 17)
+
+
+def with_id(command: discord.ApplicationCommand) -> discord.ApplicationCommand:
+    command.id = next(COMMAND_IDS)
+    return command
+
+
+class FakeGuild:
+    """
+    A guild that keeps its application commands in memory.
+    """
+
+    def __init__(self, guild_id: int, existing: List[discord.ApplicationCommand]):
+        self.id = guild_id
+        self.commands: Dict[int, discord.ApplicationCommand] = {
+            i.id: i
+            for i in existing
+        }
+        self.created: List[discord.ApplicationCommand] = []
+        self.edited: List[int] = []
+
+    async def create_application_command(
+            self,
+            command: discord.ApplicationCommand) -> discord.ApplicationCommand:
+        for i in list(self.commands.values()):
+            if (i.type, i.name) == (command.type, command.name):
+                del self.commands[i.id]
+        command = with_id(command)
+        self.commands[command.id] = command
+        self.created.append(command)
+        return command
+
+    async def edit_application_command(
+            self,
+            command: discord.abc.Snowflake,
+            **kwargs) -> discord.ApplicationCommand:
+        self.edited.append(command.id)
+        current = self.commands[command.id]
+        options = kwargs.pop("options", None)
+        data = {**current.to_json(), **kwargs, "id": command.id}
+        if options:
+            data["options"] = [i.to_json() for i in options]
+        self.commands[command.id] = discord.ApplicationCommand.from_data(data)
+        return self.commands[command.id]
+
+
+class FakeBot:
+    """
+    Just enough of a bot for the template cog to sync commands with.
+    """
+
+    application_id = 1
+
+    def __init__(self, guild: FakeGuild, bot_commands: Optional[list] = None):
+        self.guild = guild
+        self.http = self
+        self.commands = bot_commands or []
+        self.overwrites: List[List[discord.ApplicationCommand]] = []
+
+    async def request(self, route: discord.http.Route) -> List[dict]:
+        assert route.method == "GET"
+        assert "with_localizations=true" in route.url
+        return [
+            {**i.to_json(), "id": str(i.id)}
+            for i in self.guild.commands.values()
+        ]
+
+    async def register_application_commands(
+            self,
+            new_commands: List[discord.ApplicationCommand],
+            *,
+            guild: FakeGuild) -> List[discord.ApplicationCommand]:
+        self.overwrites.append(new_commands)
+        guild.commands = {}
+        for i in new_commands:
+            i = with_id(i)
+            guild.commands[i.id] = i
+        return list(guild.commands.values())
+
+
+def support_command(guild_id: int) -> commands.Command:
+    async def routetimings(ctx):
+        pass
+    return commands.Command(
+        routetimings,
+        name="routetimings",
+        application_command_meta=commands.ApplicationCommandMeta(
+            guild_ids=[guild_id],
+        ),
+    )
+
+
+async def add_template(db: vbu.Database, guild_id: int, name: str, command_id: int):
+    await db(
+        """
+        INSERT INTO templates (name, guild_id, application_command_id)
+        VALUES ($1, $2, $3)
+        """,
+        name, guild_id, command_id,
+    )
+
+
+async def fetch_command_ids(db: vbu.Database, guild_id: int) -> Dict[str, int]:
+    rows = await db.call(
+        "SELECT name, application_command_id FROM templates WHERE guild_id = $1",
+        guild_id,
+    )
+    return {r["name"]: r["application_command_id"] for r in rows}
+
+
+def template_command(name: str) -> discord.ApplicationCommand:
+    return with_id(TemplateEdit.get_profile_application_command(name))
+
+
+def test_unmanaged_commands_are_kept(database_config):
+    async def run():
+        guild_id = 1801
+        character = template_command("character")
+        other = with_id(discord.ApplicationCommand(
+            name="other",
+            description="Not ours.",
+            type=discord.ApplicationCommandType.chat_input,
+        ))
+        guild = FakeGuild(guild_id, [character, other])
+        bot = FakeBot(guild)
+        cog = TemplateEdit(bot)  # pyright: ignore
+        async with database_pool(database_config):
+            async with vbu.Database() as db:
+                await add_template(db, guild_id, "character", character.id)
+                await add_template(db, guild_id, "pet", next(COMMAND_IDS))
+
+            # The missing template command is made on its own
+            assert await cog.sync_guild_commands(guild) is True  # pyright: ignore
+            assert not bot.overwrites
+            assert [i.name for i in guild.created] == ["pet"]
+            assert other.id in guild.commands
+            async with vbu.Database() as db:
+                command_ids = await fetch_command_ids(db, guild_id)
+            assert command_ids["pet"] == guild.created[0].id
+
+            # Nothing changes once it's in sync
+            assert await cog.sync_guild_commands(guild) is False  # pyright: ignore
+            assert len(guild.created) == 1
+            assert not guild.edited
+
+    asyncio.run(run())
+
+
+def test_bot_guild_commands_are_kept(database_config):
+    async def run():
+        guild_id = 1802
+        routetimings = support_command(guild_id)
+        character = template_command("character")
+        existing_support = with_id(routetimings.to_application_command())
+        guild = FakeGuild(guild_id, [character, existing_support])
+        bot = FakeBot(guild, [routetimings])
+        cog = TemplateEdit(bot)  # pyright: ignore
+        async with database_pool(database_config):
+            async with vbu.Database() as db:
+                await add_template(db, guild_id, "character", character.id)
+
+            # In sync with the bot's own command there
+            assert await cog.sync_guild_commands(guild) is False  # pyright: ignore
+            assert not bot.overwrites
+
+            # A forced overwrite keeps the bot's own command
+            assert await cog.sync_guild_commands(guild, force=True) is True  # pyright: ignore
+            assert len(bot.overwrites) == 1
+            assert {i.name for i in bot.overwrites[0]} == {"character", "routetimings"}
+            assert await cog.sync_guild_commands(guild) is False  # pyright: ignore
+            assert len(bot.overwrites) == 1
+
+    asyncio.run(run())
+
+
+def test_duplicate_commands_get_one_id(database_config):
+    async def run():
+        guild_id = 1803
+        character = template_command("character")
+        guild = FakeGuild(guild_id, [character])
+        bot = FakeBot(guild)
+        cog = TemplateEdit(bot)  # pyright: ignore
+        async with database_pool(database_config):
+            async with vbu.Database() as db:
+                await add_template(db, guild_id, "character", character.id)
+                await add_template(db, guild_id, "Character", next(COMMAND_IDS))
+            assert await cog.sync_guild_commands(guild) is True  # pyright: ignore
+            async with vbu.Database() as db:
+                command_ids = await fetch_command_ids(db, guild_id)
+            assert len([i for i in command_ids.values() if i]) == 1
+
+    asyncio.run(run())
+
+
+def test_nested_option_drift_is_fixed(database_config):
+    async def run():
+        guild_id = 1804
+        character = template_command("character")
+        edit_subcommand = character.options[-1]
+        edit_subcommand.options = [
+            discord.ApplicationCommandOption(
+                name="name",
+                description="An old description.",
+                type=discord.ApplicationCommandOptionType.string,
+            ),
+        ]
+        other = with_id(discord.ApplicationCommand(
+            name="other",
+            description="Not ours.",
+            type=discord.ApplicationCommandType.chat_input,
+        ))
+        guild = FakeGuild(guild_id, [character, other])
+        bot = FakeBot(guild)
+        cog = TemplateEdit(bot)  # pyright: ignore
+        async with database_pool(database_config):
+            async with vbu.Database() as db:
+                await add_template(db, guild_id, "character", character.id)
+
+            # Only the nested option differs, and it's edited in place
+            assert await cog.sync_guild_commands(guild) is True  # pyright: ignore
+            assert guild.edited == [character.id]
+            assert not guild.created
+            assert TemplateEdit.command_matches(
+                guild.commands[character.id],
+                TemplateEdit.get_profile_application_command("character"),
+            )
+
+            # Nothing changes once it's in sync
+            assert await cog.sync_guild_commands(guild) is False  # pyright: ignore
+            assert guild.edited == [character.id]
+
+    asyncio.run(run())
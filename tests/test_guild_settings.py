@@ -0,0 +1,155 @@
+"""
+Checks the guild settings cache; falling back to the defaults row, caching
+guilds that have no row, and dropping cached guilds when another process
+announces a change.
+"""
+
+import asyncio
+
+import pytest
+
+from conftest import database_pool
+
+pytest.importorskip("discord.ext.vbu")
+asyncpg = pytest.importorskip("asyncpg")
+
+from discord.ext import vbu  # noqa: E402
+
+from cogs import utils  # noqa: E402
+from cogs.advanced_settings import AdvancedSettings  # noqa: E402
+from cogs.utils import guild_settings  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    utils.invalidate_guild_settings()
+    yield
+    utils.invalidate_guild_settings()
+
+
+async def set_max_template_count(db: vbu.Database, guild_id: int, count: int) -> None:
+    await db(
+        """
+        INSERT INTO guild_settings (guild_id, max_template_count)
+        VALUES ($1, $2)
+        ON CONFLICT (guild_id) DO UPDATE
+        SET max_template_count = excluded.max_template_count
+        """,
+        guild_id, count,
+    )
+
+
+def test_defaults_fallback(database_config):
+    async def run():
+        async with database_pool(database_config):
+            async with vbu.Database() as db:
+
+                # No defaults row, so the built in defaults are used
+                settings = await utils.fetch_guild_settings(db, 2201)
+                assert settings == guild_settings.DEFAULT_GUILD_SETTINGS
+
+                # With a defaults row
+                await set_max_template_count(db, 0, 7)
+                try:
+                    utils.invalidate_guild_settings(0)
+                    settings = await utils.fetch_guild_settings(db, 2201)
+                    assert settings
+                    assert settings["max_template_count"] == 7
+
+                    # The guild's own row wins
+                    await set_max_template_count(db, 2201, 3)
+                    utils.invalidate_guild_settings(2201)
+                    settings = await utils.fetch_guild_settings(db, 2201)
+                    assert settings
+                    assert settings["guild_id"] == 2201
+                    assert settings["max_template_count"] == 3
+                finally:
+                    await db("DELETE FROM guild_settings WHERE guild_id = ANY($1::BIGINT[])", [0, 2201])
+
+    asyncio.run(run())
+
+
+def test_missing_rows_are_cached(database_config):
+    async def run():
+        async with database_pool(database_config):
+            async with vbu.Database() as db:
+                assert await utils.fetch_guild_settings(db, 2202, use_defaults=False) is None
+
+                # A new row isn't seen until the guild is invalidated
+                await set_max_template_count(db, 2202, 4)
+                assert await utils.fetch_guild_settings(db, 2202, use_defaults=False) is None
+                utils.invalidate_guild_settings(2202)
+                settings = await utils.fetch_guild_settings(db, 2202, use_defaults=False)
+                assert settings
+                assert settings["max_template_count"] == 4
+
+                # Changing the returned settings doesn't change the cache
+                settings["max_template_count"] = 100
+                settings = await utils.fetch_guild_settings(db, 2202, use_defaults=False)
+                assert settings
+                assert settings["max_template_count"] == 4
+
+    asyncio.run(run())
+
+
+def test_use_defaults_false(database_config):
+    async def run():
+        async with database_pool(database_config):
+            async with vbu.Database() as db:
+                await set_max_template_count(db, 0, 7)
+                try:
+                    assert await utils.fetch_guild_settings(db, 2203, use_defaults=False) is None
+                    settings = await utils.fetch_guild_settings(db, 2203)
+                    assert settings
+                    assert settings["max_template_count"] == 7
+                    assert await utils.fetch_guild_settings(db, 2203, use_defaults=False) is None
+                finally:
+                    await db("DELETE FROM guild_settings WHERE guild_id = 0")
+
+    asyncio.run(run())
+
+
+def test_notifications_invalidate(database_dsn, database_config):
+    async def run():
+        async with database_pool(database_config):
+            listener = await asyncpg.connect(database_dsn)
+            try:
+                await listener.add_listener(
+                    utils.GUILD_SETTINGS_NOTIFY_CHANNEL,
+                    utils.handle_guild_settings_notification,
+                )
+                async with vbu.Database() as db:
+                    assert await utils.fetch_guild_settings(db, 2204, use_defaults=False) is None
+
+                    # Another process saves the guild's settings
+                    await set_max_template_count(db, 2204, 5)
+                    await utils.notify_guild_settings(db, 2204)
+                    for _ in range(50):
+                        if guild_settings.guild_settings_cache.get(2204) is None:
+                            break
+                        await asyncio.sleep(0.05)
+                    settings = await utils.fetch_guild_settings(db, 2204, use_defaults=False)
+                    assert settings
+                    assert settings["max_template_count"] == 5
+            finally:
+                await listener.close()
+
+    asyncio.run(run())
+
+
+def test_set_advanced_notifies(database_dsn, database_config):
+    async def run():
+        async with database_pool(database_config):
+            listener = await asyncpg.connect(database_dsn)
+            payloads = asyncio.Queue()
+            try:
+                await listener.add_listener(
+                    utils.GUILD_SETTINGS_NOTIFY_CHANNEL,
+                    lambda *args: payloads.put_nowait(args[3]),
+                )
+                await AdvancedSettings.set_advanced(2205, True)
+                assert await asyncio.wait_for(payloads.get(), 2.5) == "2205"
+            finally:
+                await listener.close()
+
+    asyncio.run(run())
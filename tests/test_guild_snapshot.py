@@ -0,0 +1,67 @@
+"""
+Checks that the website's guild snapshots are fetched again when a template
+uses a channel or role that they don't have.
+"""
+
+import asyncio
+import types
+
+import pytest
+
+pytest.importorskip("voxelbotutils")
+
+from website.utils import guild_snapshot  # noqa: E402
+
+
+class FakeGuild:
+
+    def __init__(self, id: int, channel_ids, role_ids):
+        self.id = id
+        self.channel_ids = set(channel_ids)
+        self.role_ids = set(role_ids)
+
+    def get_channel(self, id: int):
+        return id if id in self.channel_ids else None
+
+    def get_role(self, id: int):
+        return id if id in self.role_ids else None
+
+
+def test_refresh_on_missing(monkeypatch):
+    fetched = []
+
+    async def fetch_guild_snapshot(bot, guild_id):
+        fetched.append(guild_id)
+        guild = FakeGuild(guild_id, {1, 2}, {3})
+        guild_snapshot.guild_snapshot_cache.set(guild_id, guild)
+        return guild
+
+    monkeypatch.setattr(guild_snapshot, "fetch_guild_snapshot", fetch_guild_snapshot)
+    bot = types.SimpleNamespace()
+    stale = FakeGuild(2101, {1}, set())
+    guild_snapshot.guild_snapshot_cache.set(stale.id, stale)
+
+    async def run():
+        refresh = guild_snapshot.refresh_guild_snapshot
+
+        # Nothing missing, or nothing that's a plain ID
+        guild = await refresh(bot, stale, channel_ids=["1", None, "{{ DEFAULT \"2\" }}"], role_ids=[""])
+        assert guild is stale
+        assert not fetched
+
+        # A missing channel
+        guild = await refresh(bot, stale, channel_ids=["1", "2"])
+        assert guild is not stale
+        assert guild.get_channel(2)
+        assert fetched == [2101]
+
+        # A missing role
+        fetched.clear()
+        guild = await refresh(bot, stale, role_ids=["3"])
+        assert guild.get_role(3)
+        assert fetched == [2101]
+
+    try:
+        asyncio.run(run())
+    finally:
+        guild_snapshot.invalidate_guild_snapshot(2101)
@@ -0,0 +1,216 @@
+"""
+Checks the premium subscription cache against a local stand-in for the Voxel
+Fox portal.
+"""
+
+from typing import AsyncIterator
+import asyncio
+import contextlib
+
+import pytest
+
+from conftest import database_pool
+
+pytest.importorskip("discord.ext.vbu")
+aiohttp = pytest.importorskip("aiohttp")
+
+from aiohttp import web  # noqa: E402
+from discord.ext import vbu  # noqa: E402
+import asyncpg  # noqa: E402
+
+from cogs.utils.perks_handler import SubscriptionCache  # noqa: E402
+
+
+class PortalStandIn:
+    """
+    A local HTTP server that answers portal checks.
+
+    Attributes
+    -----------
+    mode: :class:`str`
+        How the portal responds; ``"ok"`` with JSON, ``"error"`` with a 500,
+        ``"html"`` with a 200 that isn't JSON, or ``"slow"`` with JSON after
+        longer than the cache's timeout.
+    result: :class:`bool`
+        The subscription status given by the portal.
+    hits: :class:`int`
+        The number of requests that have been made to the portal.
+    """
+
+    def __init__(self):
+        self.mode = "ok"
+        self.result = True
+        self.hits = 0
+        self.url = ""
+
+    async def check(self, request: web.Request) -> web.StreamResponse:
+        self.hits += 1
+        if self.mode == "error":
+            return web.Response(status=500, text="oh no")
+        if self.mode == "html":
+            return web.Response(text="<html></html>", content_type="text/html")
+        if self.mode == "slow":
+            await asyncio.sleep(1)
+        return web.json_response({"result": self.result})
+
+
+@contextlib.asynccontextmanager
+async def portal_stand_in() -> AsyncIterator[PortalStandIn]:
+    portal = PortalStandIn()
+    app = web.Application()
+    app.router.add_get("/api/portal/check", portal.check)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # pyright: ignore
+    portal.url = f"http://127.0.0.1:{port}/api/portal/check"
+    try:
+        yield portal
+    finally:
+        await runner.cleanup()
+
+
+def make_cache(portal: PortalStandIn, **kwargs) -> SubscriptionCache:
+    kwargs.setdefault("timeout", 0.2)
+    cache = SubscriptionCache(**kwargs)
+    cache.PORTAL_URL = portal.url  # pyright: ignore
+    return cache
+
+
+def test_portal_result():
+    async def run():
+        async with portal_stand_in() as portal:
+            cache = make_cache(portal)
+            try:
+                assert await cache._check_portal(1) is True
+                portal.result = False
+                assert await cache._check_portal(1) is False
+            finally:
+                await cache.close()
+            assert portal.hits == 2
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("mode", ["error", "html"])
+def test_failed_responses_are_released(mode):
+    """
+    Failed responses should go back to the pool, so that a single pooled
+    connection is enough for repeated failures.
+    """
+
+    async def run():
+        async with portal_stand_in() as portal:
+            portal.mode = mode
+            cache = make_cache(portal, failure_threshold=100, timeout=5)
+            cache._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=1),
+                timeout=aiohttp.ClientTimeout(total=5),
+            )
+            try:
+                for _ in range(5):
+                    result = await asyncio.wait_for(cache._check_portal(1), 1)
+                    assert result is None
+            finally:
+                await cache.close()
+            assert portal.hits == 5
+
+    asyncio.run(run())
+
+
+def test_circuit_breaker_opens_and_resets():
+    async def run():
+        async with portal_stand_in() as portal:
+            portal.mode = "slow"
+            cache = make_cache(portal, failure_threshold=3, reset_after=0.5)
+            try:
+                for _ in range(6):
+                    assert await cache._check_portal(1) is None
+                assert portal.hits == 3
+
+                # The portal isn't called again until the circuit resets
+                portal.mode = "ok"
+                assert await cache._check_portal(1) is None
+                assert portal.hits == 3
+                await asyncio.sleep(0.6)
+                assert await cache._check_portal(1) is True
+                assert portal.hits == 4
+            finally:
+                await cache.close()
+
+    asyncio.run(run())
+
+
+def test_last_known_value_is_served(database_config):
+    async def run():
+        async with portal_stand_in() as portal, database_pool(database_config):
+            cache = make_cache(portal, failure_threshold=1, reset_after=60)
+            try:
+                async with vbu.Database() as db:
+                    assert await cache.is_subscribed(db, 1) is True
+                    cache.invalidate(1)
+                    portal.mode = "error"
+                    assert await cache.is_subscribed(db, 1) is True
+                    assert await cache.is_subscribed(db, 2) is False
+            finally:
+                await cache.close()
+
+    asyncio.run(run())
+
+
+def test_background_refresh(database_config):
+    async def run():
+        async with portal_stand_in() as portal, database_pool(database_config):
+            cache = make_cache(portal, ttl=5, refresh_window=5)
+            try:
+                async with vbu.Database() as db:
+                    assert await cache.is_subscribed(db, 1) is True
+                    portal.result = False
+
+                    # The cached value is given straight away, and updated
+                    # in the background
+                    assert await cache.is_subscribed(db, 1) is True
+                    for _ in range(50):
+                        if not cache._refreshing:
+                            break
+                        await asyncio.sleep(0.05)
+                    assert portal.hits == 2
+                    assert cache.cache.get(1) is False
+            finally:
+                await cache.close()
+
+    asyncio.run(run())
+
+
+def test_notifications_invalidate(database_dsn, database_config):
+    async def run():
+        async with portal_stand_in() as portal, database_pool(database_config):
+            cache = make_cache(portal)
+            listener = await asyncpg.connect(database_dsn)
+            try:
+                await listener.add_listener(
+                    cache.NOTIFY_CHANNEL,
+                    cache.handle_notification,
+                )
+                async with vbu.Database() as db:
+                    portal.result = False
+                    assert await cache.is_subscribed(db, 1) is False
+
+                    # Another process records a purchase
+                    await db(
+                        "INSERT INTO guild_subscriptions (guild_id) VALUES ($1)",
+                        1,
+                    )
+                    await SubscriptionCache.notify(db, 1)
+                    for _ in range(50):
+                        if cache.cache.get(1) is None:
+                            break
+                        await asyncio.sleep(0.05)
+                    assert await cache.is_subscribed(db, 1) is True
+                    await db("DELETE FROM guild_subscriptions WHERE guild_id = $1", 1)
+            finally:
+                await listener.close()
+                await cache.close()
+
+    asyncio.run(run())
@@ -0,0 +1,222 @@
+"""
+Runs EXPLAIN on every query in ``cogs/utils/profiles/*.py`` against a seeded
+database, failing if any of them need a sequential scan (or a scan of a whole
+index, which is no better).
+
+Queries are pulled out of the source rather than run through the models, so
+that new queries are checked without the test needing to know about them.
+Queries that are built with ``str.format`` are checked once for each of the
+values that their format arguments can take.
+"""
+
+from typing import Dict, Iterator, List, Tuple
+import ast
+import asyncio
+import glob
+import itertools
+import json
+import os
+import re
+
+import pytest
+
+from conftest import seed_template
+
+asyncpg = pytest.importorskip("asyncpg")
+
+
+PROFILES_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "cogs",
+    "utils",
+    "profiles",
+)
+SQL_START = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b")
+
+
+def _string_options(node: ast.expr, names: Dict[str, List[str]]) -> List[str]:
+    """
+    Get the values that an expression used as a format argument can take.
+    """
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, ast.IfExp):
+        return (
+            _string_options(node.body, names)
+            + _string_options(node.orelse, names)
+        )
+    if isinstance(node, ast.Name) and node.id in names:
+        return names[node.id]
+    raise ValueError(f"Can't work out the value of {ast.dump(node)}")
+
+
+def _iter_function_queries(
+        function: ast.AST) -> Iterator[Tuple[int, str]]:
+    """
+    Yield each query in a function with every combination of format
+    arguments filled in.
+    """
+
+    names: Dict[str, List[str]] = {}
+    for node in ast.walk(function):
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Name):
+                try:
+                    names[target.id] = _string_options(node.value, names)
+                except ValueError:
+                    pass
+    formatted = set()
+    for node in ast.walk(function):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        if not (
+                isinstance(func, ast.Attribute)
+                and func.attr == "format"
+                and isinstance(func.value, ast.Constant)
+                and isinstance(func.value.value, str)
+                and SQL_START.match(func.value.value)):
+            continue
+        formatted.add(id(func.value))
+        options = [_string_options(i, names) for i in node.args]
+        for args in itertools.product(*options):
+            yield node.lineno, func.value.value.format(*args)
+    for node in ast.walk(function):
+        if id(node) in formatted:
+            continue
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            if SQL_START.match(node.value):
+                yield node.lineno, node.value
+
+
+def collect_queries() -> List[Tuple[str, str]]:
+    """
+    Get every query from the profile modules, alongside where it's from.
+    """
+
+    queries: List[Tuple[str, str]] = []
+    for path in sorted(glob.glob(os.path.join(PROFILES_DIRECTORY, "*.py"))):
+        tree = ast.parse(open(path).read())
+        functions = [
+            i for i in ast.walk(tree)
+            if isinstance(i, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ]
+        for function in functions:
+            for lineno, sql in _iter_function_queries(function):
+                where = f"{os.path.basename(path)}:{lineno}"
+                queries.append((where, sql))
+    return queries
+
+
+QUERIES = collect_queries()
+
+
+def _find_full_scans(plan: dict, leading_columns: Dict[str, str]) -> List[str]:
+    """
+    Find the nodes in a plan that read a whole table; either sequential
+    scans, or index scans that don't constrain the index's first column.
+    """
+
+    found = []
+    node_type = plan.get("Node Type")
+    if node_type == "Seq Scan":
+        found.append(f"sequential scan on {plan.get('Relation Name', '?')}")
+    elif node_type in ("Index Scan", "Index Only Scan", "Bitmap Index Scan"):
+        index_name = plan.get("Index Name", "?")
+        leading_column = leading_columns.get(index_name)
+        condition = plan.get("Index Cond", "")
+        if leading_column and not re.search(rf"\b{leading_column}\b", condition):
+            found.append(f"full scan of index {index_name}")
+    for child in plan.get("Plans", []):
+        found.extend(_find_full_scans(child, leading_columns))
+    return found
+
+
+@pytest.fixture(scope="module")
+def seeded_dsn(database_dsn):
+    """
+    The test database with enough data in it for the planner to have some
+    real statistics to work with.
+    """
+
+    async def seed():
+        conn = await asyncpg.connect(database_dsn)
+        try:
+            for guild_id in range(1, 21):
+                await seed_template(
+                    conn,
+                    guild_id=guild_id,
+                    profile_count=100,
+                    field_count=5,
+                )
+            await conn.execute("ANALYZE")
+        finally:
+            await conn.close()
+
+    asyncio.run(seed())
+    return database_dsn
+
+
+def test_queries_were_found():
+    assert len(QUERIES) > 10
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [pytest.param(sql, id=where) for where, sql in QUERIES],
+)
+def test_query_has_no_full_scans(seeded_dsn, sql):
+    """
+    Check that a query can be run without scanning a whole table or index.
+    Sequential scans are disabled so that the planner picks an index wherever
+    one can be used; any that are left have no index to fall back on. A
+    generic plan is used so that the check doesn't depend on the parameters.
+    """
+
+    async def explain():
+        conn = await asyncpg.connect(seeded_dsn)
+        try:
+            await conn.execute("SET enable_seqscan = off")
+            await conn.execute("SET plan_cache_mode = force_generic_plan")
+            await conn.execute(f"PREPARE checked_query AS {sql}")
+            parameter_count = max(
+                (int(i) for i in re.findall(r"\$(\d+)", sql)),
+                default=0,
+            )
+            parameters = ", ".join(["NULL"] * parameter_count)
+            execute = "EXECUTE checked_query"
+            if parameters:
+                execute += f"({parameters})"
+            rows = await conn.fetch(f"EXPLAIN (FORMAT JSON) {execute}")
+            index_rows = await conn.fetch(
+                """
+                SELECT
+                    index_class.relname AS index_name,
+                    pg_attribute.attname AS column_name
+                FROM
+                    pg_index
+                JOIN
+                    pg_class index_class
+                ON
+                    index_class.oid = pg_index.indexrelid
+                JOIN
+                    pg_attribute
+                ON
+                    pg_attribute.attrelid = pg_index.indrelid
+                AND
+                    pg_attribute.attnum = pg_index.indkey[0]
+                """
+            )
+            leading_columns = {
+                i["index_name"]: i["column_name"]
+                for i in index_rows
+            }
+            return json.loads(rows[0][0])[0]["Plan"], leading_columns
+        finally:
+            await conn.close()
+
+    plan, leading_columns = asyncio.run(explain())
+    scans = _find_full_scans(plan, leading_columns)
+    assert not scans, ", ".join(scans)
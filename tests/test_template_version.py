@@ -0,0 +1,44 @@
+"""
+Checks that a template's version changes whenever it or one of its fields
+is saved, since rendered profile embeds are cached against it.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from conftest import database_pool
+
+pytest.importorskip("discord.ext.vbu")
+
+from discord.ext import vbu  # noqa: E402
+
+from cogs import utils  # noqa: E402
+
+
+def test_saves_increment_version(database_config):
+    async def run():
+        async with database_pool(database_config):
+            async with vbu.Database() as db:
+                template = utils.Template(id=uuid.uuid4(), name="versioned", guild_id=1901)
+                await template.update(db)
+                first_version = template.version
+
+                await template.update(db, colour=0xff0000)
+                assert template.version == first_version + 1
+
+                field = utils.Field(
+                    id=uuid.uuid4(),
+                    name="Name",
+                    index=0,
+                    prompt="Name",
+                    template_id=template.id,
+                )
+                await field.update(db)
+                await field.update(db, name="New name")
+                fetched = await utils.Template.fetch_template_by_id(db, template.id)
+                assert fetched
+                assert fetched.version == first_version + 3
+
+    asyncio.run(run())
@@ -0,0 +1,117 @@
+"""
+Round trip checks for the custom ID codec, against the unpadded encoder that
+it replaced; IDs made by that one are still in posted components.
+"""
+
+import random
+import string
+import uuid
+
+import pytest
+
+pytest.importorskip("discord.ext.vbu")
+
+from cogs.utils import uuid_  # noqa: E402
+
+
+OLD_ALPHABET = string.digits + string.ascii_letters
+
+
+def old_encode(decoded: uuid.UUID) -> str:
+    working = decoded.int
+    encoded = ""
+    while working:
+        working, rem = divmod(working, len(OLD_ALPHABET))
+        encoded += OLD_ALPHABET[rem]
+    return encoded
+
+
+def old_decode(encoded: str) -> str:
+    working = 0
+    for idx, i in enumerate(encoded):
+        working += OLD_ALPHABET.index(i) * (len(OLD_ALPHABET) ** idx)
+    return str(uuid.UUID(int=working))
+
+
+def sample_uuids():
+    rng = random.Random(2024)
+    edges = [
+        0,
+        1,
+        61,
+        62,
+        uuid_._PAIR_BASE - 1,
+        uuid_._PAIR_BASE,
+        2 ** 64 - 1,
+        2 ** 64,
+        2 ** 128 - 1,
+        62 ** 21 - 1,
+        62 ** 21,
+    ]
+    values = edges + [rng.getrandbits(128) for _ in range(500)]
+
+    # Leading zeros; a random UUID whose top bytes are all zero
+    for zero_bytes in range(1, 16):
+        values.append(rng.getrandbits(128 - 8 * zero_bytes))
+
+    # One byte set at a time, to hit every lookup table
+    for position in range(16):
+        for byte in (1, 127, 255):
+            values.append(byte << (8 * position))
+    return [uuid.UUID(int=i) for i in values] + [uuid.uuid4() for _ in range(100)]
+
+
+UUIDS = sample_uuids()
+
+
+def test_encode_round_trip():
+    for value in UUIDS:
+        encoded = uuid_.encode(value)
+        assert len(encoded) == uuid_.WIDTH, value
+        assert uuid_.decode(encoded) == str(value)
+        assert uuid_.encode(str(value)) == encoded
+
+
+def test_matches_old_encoding():
+    """
+    The new encoding is the old one padded with high zero digits, so each
+    codec can decode the other's output.
+    """
+
+    for value in UUIDS:
+        old = old_encode(value)
+        new = uuid_.encode(value)
+        assert new == old.ljust(uuid_.WIDTH, OLD_ALPHABET[0]), value
+        assert uuid_.decode(old) == str(value)
+        assert old_decode(new) == str(value)
+
+
+def test_pack_round_trip():
+    rng = random.Random(2024)
+    for _ in range(500):
+        layout = "".join(rng.choice("ui") for _ in range(rng.randint(0, 4)))
+        values = []
+        for kind in layout:
+            if kind == "u":
+                values.append(str(rng.choice(UUIDS)))
+            else:
+                values.append(rng.choice([0, 1, 61, 62, rng.getrandbits(rng.randint(1, 64))]))
+        packed = uuid_.pack(*values)
+        assert " " not in packed
+        assert uuid_.unpack(packed, layout) == values
+
+
+@pytest.mark.parametrize(
+    "packed, layout",
+    [
+        ("", "u"),
+        ("0" * (uuid_.WIDTH - 1), "u"),
+        ("0" * (uuid_.WIDTH + 1), "u"),
+        ("3ab", "i"),
+        ("!" * uuid_.WIDTH, "u"),
+        ("0", "x"),
+    ],
+)
+def test_unpack_rejects_bad_input(packed: str, layout: str):
+    with pytest.raises(ValueError):
+        uuid_.unpack(packed, layout)
@@ -5,6 +5,8 @@ from aiohttp.web import HTTPFound, Request, Response, RouteTableDef
 from voxelbotutils import web as webutils
 import aiohttp_session
 
+from cogs import utils
+
 
 routes = RouteTableDef()
 
@@ -125,6 +127,8 @@ async def purchase_complete(request: Request):
                 cancel_url=excluded.cancel_url, expiry_time=excluded.expiry_time""",
                 guild_id, user_id, premium_subscription_delete_url, expiry_time,
             )
+            await utils.GuildPerks.subscriptions.notify(db, guild_id)
+        utils.GuildPerks.subscriptions.invalidate(guild_id)
 
         # Work out what to send to Discord
         if data['refund']:
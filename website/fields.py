@@ -4,6 +4,7 @@ import aiohttp_session
 import discord
 
 from cogs import utils as localutils
+from website.utils import fetch_guild_snapshot
 
 
 routes = RouteTableDef()
@@ -51,7 +52,7 @@ async def update_template(request: Request):
         except AssertionError:
             return json_response({"error": "Failed to get template for whatever reason."}, status=401)
         try:
-            guild = await request.app['bots']['bot'].fetch_guild(template.guild_id)
+            guild = await fetch_guild_snapshot(request.app['bots']['bot'], template.guild_id)
         except discord.HTTPException:
             return json_response({"error": "Bot not in guild."}, status=401)
         try:
@@ -122,7 +123,7 @@ async def update_template_field(request: Request):
 
         # Make sure the user is editing a template that they have permission to edit
         try:
-            guild = await request.app['bots']['bot'].fetch_guild(template.guild_id)
+            guild = await fetch_guild_snapshot(request.app['bots']['bot'], template.guild_id)
         except discord.HTTPException:
             return json_response({"error": "Bot not in guild."}, status=401)
         try:
@@ -187,7 +188,7 @@ async def update_template_delete(request: Request):
 
         # Make sure the user is editing a template that they have permission to edit
         try:
-            guild = await request.app['bots']['bot'].fetch_guild(template.guild_id)
+            guild = await fetch_guild_snapshot(request.app['bots']['bot'], template.guild_id)
         except discord.HTTPException:
             return json_response({"error": "Bot not in guild."}, status=401)
         try:
@@ -238,7 +239,7 @@ async def update_template_field_delete(request: Request):
 
         # Make sure the user is editing a template that they have permission to edit
         try:
-            guild = await request.app['bots']['bot'].fetch_guild(template.guild_id)
+            guild = await fetch_guild_snapshot(request.app['bots']['bot'], template.guild_id)
         except discord.HTTPException:
             return json_response({"error": "Bot not in guild."}, status=401)
         try:
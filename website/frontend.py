@@ -42,7 +42,7 @@ async def premium(request: Request):
 
     # Grab their current settings
     async with request.app['database']() as db:
-        guild_rows = await db("SELECT * FROM guild_settings WHERE guild_id=$1", guild_id)
+        guild_rows = await utils.fetch_guild_settings(db, guild_id, use_defaults=False)
         guild_subscriptions = await db(
             """SELECT * FROM guild_subscriptions WHERE guild_id=$1 AND
             (expiry_time IS NULL OR expiry_time > TIMEZONE('UTC', NOW()))""",
@@ -51,7 +51,6 @@ async def premium(request: Request):
 
     # Upgrade the guild so we can see if the bot's in it
     upgraded_guild = await guild.fetch_guild()
-    guild_rows = None if not guild_rows else guild_rows[0]
     guild_subscriptions = None if not guild_subscriptions else guild_subscriptions[0]
     currently_expiring = None
     if guild_subscriptions:
@@ -83,8 +82,12 @@ async def guilds(request: Request):
     The guild picker page for the bot.
     """
 
-    all_guilds = await vbu.web.get_user_guilds_from_session(request)
-    valid_guilds = [i.guild for i in all_guilds if i.guild_permissions.manage_guild or i.guild.owner_id == i.id]
+    session_guilds = await webutils.get_session_guilds(request)
+    valid_guilds = [
+        i.guild
+        for i in session_guilds.members
+        if session_guilds.can_moderate[i.guild.id]
+    ]
     async with request.app['database']() as db:
         rows = await db(
             """SELECT * FROM guild_subscriptions WHERE guild_id=ANY($1::BIGINT[])""",
@@ -123,7 +126,7 @@ async def guild_settings(request: Request):
 
     # Grab their current settings
     async with request.app['database']() as db:
-        guild_rows = await db("SELECT * FROM guild_settings WHERE guild_id=$1 OR guild_id=0 ORDER BY guild_id DESC", guild_id)
+        guild_rows = await utils.fetch_guild_settings(db, guild_id)
         guild_subscriptions = await db("SELECT * FROM guild_subscriptions WHERE guild_id=$1", guild_id)
         guild_templates = await utils.Template.fetch_all_templates_for_guild(db, guild_id, fetch_fields=True)
 
@@ -141,7 +144,7 @@ async def guild_settings(request: Request):
     return {
         "guild": guild,
         "bot_in_guild": upgraded_guild,
-        "guild_settings": guild_rows[0],
+        "guild_settings": guild_rows,
         "templates": guild_templates,
         "has_premium": guild_subscriptions,
         "CommandProcessor": utils.CommandProcessor,  # Throw in this whole class so we can use it in the template
@@ -179,7 +182,7 @@ async def get_template_data(request: Request):
     async with request.app['database']() as db:
         template = await utils.Template.fetch_template_by_id(db, template_id, fetch_fields=True)
         if template:
-            guild_rows = await db("SELECT * FROM guild_settings WHERE guild_id=$1 OR guild_id=0 ORDER BY guild_id DESC", template.guild_id)
+            guild_rows = await utils.fetch_guild_settings(db, template.guild_id)
     if not template:
         raise HTTPFound(location="/guilds")
 
@@ -192,18 +195,23 @@ async def get_template_data(request: Request):
 
     # Grab the guild object
     try:
-        guild_object = await bot.fetch_guild(guild_id)
+        guild_object = await webutils.fetch_guild_snapshot(bot, guild_id)
+
+        # Fetch it again if the template uses channels or roles that were
+        # made after the snapshot was taken
+        guild_object = await webutils.refresh_guild_snapshot(
+            bot,
+            guild_object,
+            channel_ids=[template.verification_channel_id, template.archive_channel_id],
+            role_ids=[template.role_id],
+        )
     except discord.HTTPException:
         raise HTTPFound(location=bot.get_invite_link(guild_id=guild_id))
-    channels = await guild_object.fetch_channels()
-    guild_object._channels = {i.id: i for i in channels}
-    roles = await guild_object.fetch_roles()
-    guild_object._roles = {i.id: i for i in roles}
 
     # Return the guild data
     return {
         "template": template,
         "guild": guild_object,
-        "guild_settings": guild_rows[0],
+        "guild_settings": guild_rows,
         "CommandProcessor": utils.CommandProcessor,  # Throw in this whole class so we can use it in the template
     }
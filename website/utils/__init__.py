@@ -1 +1,2 @@
-from .user_can_moderate_guild import user_can_moderate_guild
+from .user_can_moderate_guild import user_can_moderate_guild, get_session_guilds
+from .guild_snapshot import fetch_guild_snapshot, invalidate_guild_snapshot, refresh_guild_snapshot
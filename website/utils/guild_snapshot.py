@@ -0,0 +1,118 @@
+from typing import Iterable, Optional
+import asyncio
+import weakref
+
+import discord
+import voxelbotutils as botutils
+
+from cogs.utils import TimedCache
+
+
+# Guild ID -> guild with its channels and roles filled in
+guild_snapshot_cache: TimedCache[int, discord.Guild] = TimedCache(
+    max_size=1_000,
+    ttl=60,
+)
+
+# Guild ID -> the lock held while that guild is being fetched
+_guild_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+async def fetch_guild_snapshot(bot: botutils.Bot, guild_id: int) -> discord.Guild:
+    """
+    Get a guild object with its channels and roles populated. Snapshots are
+    shared between requests and are only fetched again over REST once
+    they've expired; concurrent requests for the same guild wait on a single
+    fetch.
+
+    Args:
+        bot (botutils.Bot): The bot to fetch the guild with.
+        guild_id (int): The ID of the guild.
+
+    Raises:
+        discord.HTTPException: If the guild couldn't be fetched.
+
+    Returns:
+        discord.Guild: The guild.
+    """
+
+    # See if we have it already
+    guild = guild_snapshot_cache.get(guild_id)
+    if guild is not None:
+        return guild
+
+    # Only let one request fetch the guild at a time
+    lock = _guild_locks.get(guild_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _guild_locks[guild_id] = lock
+    async with lock:
+
+        # Someone else may have fetched it while we were waiting
+        guild = guild_snapshot_cache.get(guild_id)
+        if guild is not None:
+            return guild
+
+        # Fetch the guild
+        guild = await bot.fetch_guild(guild_id)
+        channels, roles = await asyncio.gather(
+            guild.fetch_channels(),
+            guild.fetch_roles(),
+        )
+        guild._channels = {i.id: i for i in channels}
+        guild._roles = {i.id: i for i in roles}
+        guild_snapshot_cache.set(guild_id, guild)
+        return guild
+
+
+def invalidate_guild_snapshot(guild_id: int) -> None:
+    """
+    Remove a guild's snapshot so that the next request fetches it again.
+
+    Args:
+        guild_id (int): The ID of the guild.
+    """
+
+    guild_snapshot_cache.pop(guild_id)
+
+
+async def refresh_guild_snapshot(
+        bot: botutils.Bot,
+        guild: discord.Guild,
+        *,
+        channel_ids: Iterable[Optional[str]] = (),
+        role_ids: Iterable[Optional[str]] = ()) -> discord.Guild:
+    """
+    Make sure that a guild snapshot has the given channels and roles in it,
+    fetching the guild again if any of them are missing; they may have been
+    made since the snapshot was taken. Values that aren't plain IDs (such as
+    empty values or commands) are ignored.
+
+    Args:
+        bot (botutils.Bot): The bot to fetch the guild with.
+        guild (discord.Guild): The snapshot that's already been fetched.
+        channel_ids (Iterable[Optional[str]]): The IDs of the channels that
+            should be in the guild.
+        role_ids (Iterable[Optional[str]]): The IDs of the roles that should
+            be in the guild.
+
+    Raises:
+        discord.HTTPException: If the guild couldn't be fetched.
+
+    Returns:
+        discord.Guild: The guild, fetched again if anything was missing.
+    """
+
+    missing_channel = any(
+        i and i.isdigit() and guild.get_channel(int(i)) is None
+        for i in channel_ids
+    )
+    missing_role = any(
+        i and i.isdigit() and guild.get_role(int(i)) is None
+        for i in role_ids
+    )
+    if not (missing_channel or missing_role):
+        return guild
+    if guild_snapshot_cache.get(guild.id) is guild:
+        invalidate_guild_snapshot(guild.id)
+    return await fetch_guild_snapshot(bot, guild.id)
@@ -1,9 +1,78 @@
+from typing import Dict, List, Optional
+
 from aiohttp.web import Request
 import voxelbotutils as botutils
 from voxelbotutils import web as webutils
 import aiohttp_session
+import discord
 from discord.ext import commands
 
+from cogs.utils import TimedCache
+
+
+class SessionGuilds:
+    """
+    The OAuth guild list for a logged in user, indexed by guild ID, alongside
+    the permissions that we've worked out for it.
+    """
+
+    __slots__ = (
+        "user_id",
+        "members",
+        "members_by_guild_id",
+        "can_moderate",
+        "is_bot_support",
+    )
+
+    def __init__(self, user_id: int, members: List[discord.Member]):
+        self.user_id: int = user_id
+        self.members: List[discord.Member] = members
+        self.members_by_guild_id: Dict[int, discord.Member] = {
+            i.guild.id: i
+            for i in members
+        }
+        self.can_moderate: Dict[int, bool] = {
+            i.guild.id: i.guild.owner_id == i.id or i.guild_permissions.manage_guild
+            for i in members
+        }
+        self.is_bot_support: Optional[bool] = None
+
+
+# User ID -> their guilds
+session_guild_cache: TimedCache[int, SessionGuilds] = TimedCache(
+    max_size=10_000,
+    ttl=60,
+)
+
+
+async def get_session_guilds(request: Request) -> SessionGuilds:
+    """
+    Get the OAuth guilds for the logged in user, only going to Discord if we
+    haven't got them cached.
+
+    Args:
+        request (Request): The request being handled.
+
+    Returns:
+        SessionGuilds: The user's guilds.
+    """
+
+    session = await aiohttp_session.get_session(request)
+    user_id = session.get('user_id')
+    if user_id is not None:
+        cached = session_guild_cache.get(user_id)
+        if cached is not None:
+            return cached
+    oauth_members = await webutils.get_user_guilds_from_session(request)
+    if user_id is None:
+        try:
+            user_id = oauth_members[0].id
+        except IndexError:
+            user_id = session['user_id']
+    guilds = SessionGuilds(user_id, oauth_members)
+    session_guild_cache.set(user_id, guilds)
+    return guilds
+
 
 async def user_can_moderate_guild(request: Request, guild_id: int):
     """
@@ -22,27 +91,21 @@ async def user_can_moderate_guild(request: Request, guild_id: int):
     bot: botutils.Bot = request.app['bots']['bot']
 
     # Fetch the guild they're trying to access
-    oauth_members = await webutils.get_user_guilds_from_session(request)
-    try:
-        member = [i for i in oauth_members if i.guild.id == guild_id][0]
-        guild = member.guild
-    except IndexError:
-        member = None
-        guild = None
+    session_guilds = await get_session_guilds(request)
+    member = session_guilds.members_by_guild_id.get(guild_id)
+    guild = member.guild if member else None
 
     # Check the member has permissions to manage this guild
-    if member and guild and (guild.owner_id == member.id or member.guild_permissions.manage_guild):
-        pass
-    else:
-        # See if they're bot support
-        try:
-            user_id = oauth_members[0].id
-        except IndexError:
-            session = await aiohttp_session.get_session(request)
-            user_id = session['user_id']
-        ctx = webutils.WebContext(bot, user_id)
+    if session_guilds.can_moderate.get(guild_id, False):
+        return True, guild, member
+
+    # See if they're bot support
+    if session_guilds.is_bot_support is None:
+        ctx = webutils.WebContext(bot, session_guilds.user_id)
         try:
             await botutils.checks.is_bot_support().predicate(ctx)
-        except commands.CheckFailure as e:
-            return False, guild, member
-    return True, guild, member
+        except commands.CheckFailure:
+            session_guilds.is_bot_support = False
+        else:
+            session_guilds.is_bot_support = True
+    return session_guilds.is_bot_support, guild, member